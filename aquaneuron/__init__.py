@@ -0,0 +1,7 @@
+"""
+AquaNeuron  —  Simulation & Visualization Suite
+Stockholm Junior Water Prize India 2026
+Prateek Tiwari, Raghav Khandelia, Aroush Muglikar, Shreyas Roy
+"""
+
+__version__ ="1.0.0"
@@ -0,0 +1,313 @@
+"""
+AquaNeuron  —  Benchmarks
+Parametrized timings of the numerical hot paths, stored as JSON
+baselines and compared run-to-run with a regression threshold and
+absolute budgets (e.g. single-reading inference well under 2 s).
+
+    python -m aquaneuron.bench run [--filter PATTERN] [--quick] [--out benchmarks/NAME.json]
+    python -m aquaneuron.bench compare BASELINE.json CURRENT.json [--threshold 0.2]
+"""
+
+import argparse 
+import atexit 
+import fnmatch 
+import functools 
+import json 
+import os 
+import platform 
+import sys 
+import tempfile 
+import time 
+from pathlib import Path 
+import numpy as np 
+
+BENCH_DIR =Path ("benchmarks")
+THRESHOLD =0.20 
+MIN_TIME =0.2 
+MAX_REPEAT =20 
+
+BUDGETS ={
+"predict_single[1]":2.0 ,
+"predict_batch[10000]":2.0 ,
+}
+
+CASES ={}
+
+
+def case (*sizes ,quick =None ):
+    def register (fn ):
+        CASES [fn .__name__ ]=(fn ,sizes ,sizes [:1 ]if quick is None else quick )
+        return fn 
+    return register 
+
+
+@functools .lru_cache (maxsize =None )
+def _readings (n_per ):
+    from .model import synthetic_readings 
+    return synthetic_readings (n_per ,np .random .SeedSequence (0 ))
+
+
+@functools .lru_cache (maxsize =None )
+def _artifact (n_estimators ):
+    from .model import save ,train 
+    X ,y =_readings (300 )
+    tmp =tempfile .TemporaryDirectory (prefix ="aquaneuron-bench-")
+    try :
+        path =Path (tmp .name )/"rf"
+        save (train (X ,y ,n_estimators =n_estimators ),path )
+    except BaseException :
+        tmp .cleanup ()
+        raise 
+    atexit .register (tmp .cleanup )
+    return path 
+
+
+def _edge_model (n_estimators ,engine ="auto"):
+    from .model import load 
+    return load (_artifact (n_estimators ),engine =engine )
+
+
+@case (1000 ,10000 ,100000 )
+def isotherm_bootstrap (n ):
+    from .fitting import fit_langmuir_batch 
+    from .physics import ARSENIC ,langmuir 
+    C =np .array ([0.5 ,1 ,2 ,5 ,10 ,20 ,40 ,60 ,80 ,100 ,150 ,200.0 ])
+    g =np .random .default_rng (0 )
+    Q =langmuir (C ,ARSENIC .Qmax ,ARSENIC .Kd )+g .normal (0 ,3.5 ,(n ,len (C )))
+    return lambda :fit_langmuir_batch (C ,Q )
+
+
+@case (10 **6 ,10 **7 )
+def monte_carlo_lod (n ):
+    from .montecarlo import run 
+    from .physics import LOD_MODELS 
+    return lambda :run (LOD_MODELS ["As"],rtol =0.0 ,max_samples =n ,seed =np .random .SeedSequence (0 ))
+
+
+@case (10 **4 ,10 **6 )
+def dataset_synthesis (n_per ):
+    from .dataset import sample 
+    return lambda :sample (n_per ,seed =np .random .SeedSequence (0 ))
+
+
+@case (100 ,500 ,quick =(100 ,))
+def forest_training (n_estimators ):
+    from .model import train 
+    X ,y =_readings (300 )
+    return lambda :train (X ,y ,n_estimators =n_estimators )
+
+
+@case (1 )
+def predict_single (n ):
+    model =_edge_model (500 )
+    x =_readings (300 )[0 ][:n ]
+    return lambda :model .predict_proba (x [0 ])
+
+
+@case (100 ,10000 ,quick =(100 ,))
+def predict_batch (n ):
+    model =_edge_model (500 )
+    X =np .resize (_readings (300 )[0 ],(n ,6 ))
+    return lambda :model .predict_proba (X )
+
+
+@case (100 ,1000 ,100000 ,quick =(1000 ,))
+def predict_batch_packed (n ):
+    model =_edge_model (500 ,"packed")
+    X =np .resize (_readings (300 )[0 ],(n ,6 ))
+    return lambda :model .predict_proba (X )
+
+
+@case (100 ,1000 ,100000 ,quick =(1000 ,))
+def predict_batch_sklearn (n ):
+    model =_edge_model (500 ,"sklearn")
+    X =np .resize (_readings (300 )[0 ],(n ,6 ))
+    return lambda :model .predict_proba (X )
+
+
+@case (1500 ,100000 )
+def embedding_pca (n ):
+    from .embedding import Embedding 
+    X =np .resize (_readings (300 )[0 ],(n ,6 ))
+    return lambda :Embedding .fit (X ,method ="pca").transform (X )
+
+
+@case (500 ,1500 ,quick =(500 ,))
+def embedding_tsne_fit (n_landmarks ):
+    from .embedding import Embedding 
+    X ,_ =_readings (300 )
+    return lambda :Embedding .fit (X ,n_landmarks =n_landmarks ,seed =np .random .SeedSequence (0 ))
+
+
+@case (1500 ,100000 ,quick =(1500 ,))
+def embedding_tsne_project (n ):
+    from .embedding import Embedding 
+    X ,_ =_readings (300 )
+    emb =Embedding .fit (X ,seed =np .random .SeedSequence (0 ))
+    Xn =np .resize (X ,(n ,6 ))
+    return lambda :emb .transform (Xn )
+
+
+@case (1000 ,100000 )
+def impedance_simulation (n ):
+    from .eis import FREQ ,random_circuits ,simulate 
+    p =random_circuits (n ,0 )
+    return lambda :simulate (FREQ ,p )
+
+
+@case (100 ,1000 )
+def impedance_fit (n ):
+    from .eis import fit ,random_circuits ,simulate 
+    freq =np .logspace (-2 ,6 ,60 )
+    Z =simulate (freq ,random_circuits (n ,0 ))
+    return lambda :fit (freq ,Z )
+
+
+@case (10 **4 ,10 **6 )
+def inverse_solve (n ):
+    from .inverse import InverseSolver 
+    from .physics import coupled_response 
+    solver =InverseSolver ()
+    C =np .random .default_rng (0 ).lognormal (np .log (solver .upper /4 ),0.8 ,(n ,3 ))
+    dR =coupled_response (C )
+    return lambda :solver .solve (dR )
+
+
+@case (10 **4 ,10 **6 )
+def validation_stats (n ):
+    from .comparison import MethodComparison 
+    g =np .random .default_rng (0 )
+    x =g .uniform (1 ,80 ,n )
+    y =x *1.01 +g .normal (0 ,1 ,n )
+    site =g .integers (0 ,20 ,n )
+    return lambda :MethodComparison ([10 ,50 ]).update (x ,y ,site ).summary ()
+
+
+@case (10 **3 ,10 **5 )
+def drift_update (n_nodes ):
+    from .drift import DriftCompensator 
+    comp =DriftCompensator (n_nodes )
+    nodes =np .repeat (np .arange (n_nodes ),3 )
+    chans =np .tile (np .arange (3 ),n_nodes )
+    ratio =np .full (nodes .size ,0.9 )
+    return lambda :comp .update (nodes ,chans ,10.0 ,ratio )
+
+
+def timeit (fn ,min_time =MIN_TIME ,max_repeat =MAX_REPEAT ):
+    fn ()
+    times =[]
+    while len (times )<max_repeat and (len (times )<3 or sum (times )<min_time ):
+        t0 =time .perf_counter ()
+        fn ()
+        times .append (time .perf_counter ()-t0 )
+    t =np .array (times )
+    return {"median":float (np .median (t )),"min":float (t .min ()),"mean":float (t .mean ()),
+    "std":float (t .std ()),"repeat":len (t )}
+
+
+def environment ():
+    from .import __version__ 
+    return {
+    "aquaneuron":__version__ ,
+    "python":platform .python_version (),
+    "numpy":np .__version__ ,
+    "platform":platform .platform (),
+    "machine":platform .node (),
+    "cpus":os .cpu_count (),
+    "time":time .strftime ("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run (pattern ="*",quick =False ,min_time =MIN_TIME ,echo =print ):
+    results ={}
+    for name ,(fn ,sizes ,quick_sizes )in CASES .items ():
+        for size in quick_sizes if quick else sizes :
+            key =f"{name }[{size }]"
+            if not fnmatch .fnmatch (key ,pattern )and not fnmatch .fnmatch (name ,pattern ):
+                continue 
+            results [key ]=timeit (fn (size ),min_time =min_time )
+            if echo :
+                echo (f"  {key :<36}{_fmt (results [key ]['median']):>12}  ×{results [key ]['repeat']}")
+    return {"environment":environment (),"results":results }
+
+
+def check_budgets (results ,budgets =BUDGETS ):
+    return {k :(results [k ]["median"],b )for k ,b in budgets .items ()if k in results and results [k ]["median"]>b }
+
+
+def compare (baseline ,current ,threshold =THRESHOLD ):
+    rows =[]
+    for key ,cur in current ["results"].items ():
+        base =baseline ["results"].get (key )
+        if base is None :
+            rows .append ((key ,None ,cur ["median"],None ,"new"))
+            continue 
+        ratio =cur ["median"]/base ["median"]
+        status ="regression"if ratio >1 +threshold else "faster"if ratio <1 /(1 +threshold )else "ok"
+        rows .append ((key ,base ["median"],cur ["median"],ratio ,status ))
+    return rows 
+
+
+def _fmt (seconds ):
+    if seconds is None :
+        return "—"
+    for unit ,scale in (("s",1.0 ),("ms",1e-3 ),("µs",1e-6 )):
+        if seconds >=scale :
+            return f"{seconds /scale :.3g} {unit }"
+    return f"{seconds /1e-9 :.3g} ns"
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.bench",
+    description ="Benchmark the numerical hot paths and track baselines")
+    sub =ap .add_subparsers (dest ="cmd",required =True )
+    r =sub .add_parser ("run",help ="time every case and write a JSON result")
+    r .add_argument ("--filter",default ="*",help ="glob on case name or name[size]")
+    r .add_argument ("--quick",action ="store_true",help ="smallest size of each case only")
+    r .add_argument ("--min-time",type =float ,default =MIN_TIME )
+    r .add_argument ("--out",help =f"result file (default {BENCH_DIR }/<machine>.json)")
+    r .add_argument ("--baseline",help ="compare against this result after running")
+    r .add_argument ("--threshold",type =float ,default =THRESHOLD )
+    c =sub .add_parser ("compare",help ="compare two result files")
+    c .add_argument ("baseline")
+    c .add_argument ("current")
+    c .add_argument ("--threshold",type =float ,default =THRESHOLD )
+    sub .add_parser ("list",help ="list benchmark cases")
+    args =ap .parse_args (argv )
+
+    if args .cmd =="list":
+        for name ,(_ ,sizes ,quick )in CASES .items ():
+            print (f"  {name :<26} sizes {', '.join (map (str ,sizes ))}")
+        return 0 
+
+    if args .cmd =="run":
+        current =run (args .filter ,args .quick ,args .min_time )
+        out =Path (args .out or BENCH_DIR /f"{platform .node ()or 'local'}.json")
+        out .parent .mkdir (parents =True ,exist_ok =True )
+        out .write_text (json .dumps (current ,indent =2 )+"\n")
+        print (f"✓ Saved: {out }")
+        status =0 
+        for key ,(t ,budget )in check_budgets (current ["results"]).items ():
+            print (f"  ✗ {key } took {_fmt (t )}, budget {_fmt (budget )}")
+            status =1 
+        if not args .baseline :
+            return status 
+        baseline =json .loads (Path (args .baseline ).read_text ())
+    else :
+        baseline =json .loads (Path (args .baseline ).read_text ())
+        current =json .loads (Path (args .current ).read_text ())
+        status =0 
+
+    rows =compare (baseline ,current ,args .threshold )
+    print (f"  {'case':<36}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for key ,b ,cur ,ratio ,state in rows :
+        mark ={"regression":"  ✗ slower","faster":"  ✓ faster","new":"  new"}.get (state ,"")
+        print (f"  {key :<36}{_fmt (b ):>12}{_fmt (cur ):>12}{''if ratio is None else f'{ratio:.2f}':>8}{mark }")
+    n_reg =sum (state =="regression"for *_ ,state in rows )
+    if n_reg :
+        print (f"  {n_reg } regression(s) beyond {args .threshold :.0%}")
+    return 1 if n_reg else status 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,337 @@
+"""
+AquaNeuron  —  Result Cache
+Content-addressed on-disk cache for deterministic numerics, keyed by
+function, code version, numerical library versions and arguments (seed
+sequences included); entries
+are stored as memory-mappable .npy files and evicted least-recently-used.
+
+    python -m aquaneuron.cache info | clear | invalidate NAME
+"""
+
+import functools 
+import hashlib 
+import inspect 
+import json 
+import os 
+import shutil 
+import sys 
+import tempfile 
+import textwrap 
+import time 
+from dataclasses import asdict ,is_dataclass 
+from pathlib import Path 
+import numpy as np 
+from .trace import count 
+
+ENV_DIR ="AQUANEURON_CACHE"
+ENV_MB ="AQUANEURON_CACHE_MB"
+DEFAULT_DIR =Path .home ()/".cache"/"aquaneuron"
+DEFAULT_MB =512 
+META ="meta.json"
+LIBRARIES =("numpy","scipy","scikit-learn","pandas")
+
+
+def _update (h ,obj ):
+    if isinstance (obj ,np .ndarray ):
+        arr =np .ascontiguousarray (obj )
+        h .update (f"nd:{arr .dtype .str }:{arr .shape }".encode ())
+        h .update (arr .tobytes ()if arr .dtype !=object else repr (arr .tolist ()).encode ())
+    elif isinstance (obj ,np .generic ):
+        _update (h ,obj .item ())
+    elif isinstance (obj ,(str ,bytes ,int ,float ,bool ,complex ))or obj is None :
+        h .update (f"{type (obj ).__name__ }:{obj !r};".encode ())
+    elif isinstance (obj ,(list ,tuple )):
+        h .update (f"{type (obj ).__name__ }[{len (obj )}".encode ())
+        for item in obj :
+            _update (h ,item )
+        h .update (b"]")
+    elif isinstance (obj ,dict ):
+        h .update (f"dict{{{len (obj )}".encode ())
+        for k in sorted (obj ,key =repr ):
+            _update (h ,k )
+            _update (h ,obj [k ])
+        h .update (b"}")
+    elif isinstance (obj ,np .random .SeedSequence ):
+        h .update (b"seedseq")
+        _update (h ,(obj .entropy ,tuple (obj .spawn_key ),obj .pool_size ))
+    elif is_dataclass (obj ):
+        h .update (type (obj ).__qualname__ .encode ())
+        _update (h ,asdict (obj ))
+    else :
+        raise TypeError (f"cannot derive a cache key from {type (obj ).__name__ }")
+
+
+def digest (*parts ):
+    h =hashlib .sha256 ()
+    for part in parts :
+        _update (h ,part )
+    return h .hexdigest ()
+
+
+def _module_file (name ):
+    pkg ,_ ,rest =name .partition (".")
+    if pkg !=__name__ .partition (".")[0 ]:
+        return None 
+    root =Path (__file__ ).parent 
+    path =root .joinpath (*rest .split ("."))if rest else root 
+    for candidate in (path .with_suffix (".py"),path /"__init__.py"):
+        if candidate .is_file ():
+            return candidate 
+    return None 
+
+
+def _imports (pkg ,src ):
+    import ast 
+    for node in ast .walk (ast .parse (src )):
+        if isinstance (node ,ast .Import ):
+            yield from (a .name for a in node .names )
+        elif isinstance (node ,ast .ImportFrom ):
+            base =pkg .rsplit (".",node .level -1 )[0 ]if node .level else ""
+            target =".".join (p for p in (base ,node .module )if p )
+            yield target 
+            yield from (f"{target }.{a .name }"for a in node .names )
+
+
+def module_sources (*modules ):
+    seen ,todo ={},list (modules )
+    while todo :
+        name =todo .pop ()
+        path =_module_file (name )
+        if name in seen or path is None :
+            continue 
+        seen [name ]=src =path .read_text (encoding ="utf-8")
+        todo .extend (_imports (name if path .name =="__init__.py"else name .rpartition (".")[0 ],src ))
+    return dict (sorted (seen .items ()))
+
+
+def _names (code ):
+    yield from code .co_names 
+    for const in code .co_consts :
+        if inspect .iscode (const ):
+            yield from _names (const )
+
+
+def dependencies (fn ):
+    own ,modules ,todo ={},set (),[fn ]
+    while todo :
+        obj =inspect .unwrap (todo .pop ())
+        key =f"{obj .__module__ }.{obj .__qualname__ }"
+        if key in own :
+            continue 
+        try :
+            own [key ]=textwrap .dedent (inspect .getsource (obj ))
+        except (OSError ,TypeError ):
+            own [key ]=obj .__qualname__ 
+            continue 
+        module =sys .modules [obj .__module__ ]
+        modules .update (_imports (module .__package__ or "",own [key ]))
+        funcs =[obj ]if inspect .isfunction (obj )else [v for v in vars (obj ).values ()if inspect .isfunction (v )]
+        scope =module .__dict__ 
+        for name in {n for f in funcs for n in _names (f .__code__ )}:
+            ref =scope .get (name )
+            if inspect .ismodule (ref ):
+                modules .add (ref .__name__ )
+            elif (inspect .isfunction (ref )or inspect .isclass (ref ))and ref .__module__ ==obj .__module__ :
+                todo .append (ref )
+            elif inspect .isfunction (ref )or inspect .isclass (ref ):
+                modules .add (ref .__module__ )
+            elif name in scope and not callable (ref ):
+                try :
+                    own [f"{obj .__module__ }.{name }"]=digest (ref )
+                except TypeError :
+                    own [f"{obj .__module__ }.{name }"]=type (ref ).__name__ 
+    return {**own ,**module_sources (*modules )}
+
+
+def library_versions (libraries =LIBRARIES ):
+    from importlib import metadata 
+    out ={"python":sys .version .split ()[0 ]}
+    for lib in libraries :
+        try :
+            out [lib ]=metadata .version (lib )
+        except metadata .PackageNotFoundError :
+            out [lib ]=None 
+    return out 
+
+
+def code_version (fn ):
+    from .import __version__ 
+    h =hashlib .sha256 ()
+    for name ,src in sorted (dependencies (fn ).items ()):
+        h .update (f"{name }:{len (src )};".encode ()+src .encode ())
+    _update (h ,library_versions ())
+    return f"{__version__ }:{h .hexdigest ()[:16 ]}"
+
+
+def _split (obj ,arrays ):
+    if isinstance (obj ,np .ndarray ):
+        arrays .append (obj )
+        return {"t":"array","i":len (arrays )-1 }
+    if isinstance (obj ,np .generic ):
+        obj =obj .item ()
+    if isinstance (obj ,(int ,float ,str ,bool ))or obj is None :
+        return {"t":"scalar","v":obj }
+    if isinstance (obj ,(list ,tuple )):
+        return {"t":type (obj ).__name__ ,"items":[_split (x ,arrays )for x in obj ]}
+    if isinstance (obj ,dict )and all (isinstance (k ,str )for k in obj ):
+        return {"t":"dict","items":{k :_split (v ,arrays )for k ,v in obj .items ()}}
+    raise TypeError (f"cannot cache a result of type {type (obj ).__name__ }")
+
+
+def _join (spec ,arrays ):
+    t =spec ["t"]
+    if t =="array":
+        return arrays [spec ["i"]]
+    if t =="scalar":
+        return spec ["v"]
+    if t =="dict":
+        return {k :_join (v ,arrays )for k ,v in spec ["items"].items ()}
+    items =[_join (x ,arrays )for x in spec ["items"]]
+    return tuple (items )if t =="tuple"else items 
+
+
+class Cache :
+    def __init__ (self ,root =None ,max_bytes =None ,mmap =True ):
+        self .root =Path (root or os .environ .get (ENV_DIR )or DEFAULT_DIR )
+        mb =os .environ .get (ENV_MB )
+        self .max_bytes =max_bytes if max_bytes is not None else int (float (mb or DEFAULT_MB )*2 **20 )
+        self .mmap =mmap 
+        self .hits =0 
+        self .misses =0 
+
+    def _path (self ,key ):
+        return self .root /key [:2 ]/key 
+
+    def get (self ,key ):
+        path =self ._path (key )
+        try :
+            meta =json .loads ((path /META ).read_text (encoding ="utf-8"))
+            arrays =[np .load (path /f"a{i }.npy",mmap_mode ="r"if self .mmap else None )
+            for i in range (meta ["n_arrays"])]
+            os .utime (path )
+        except (OSError ,ValueError ,KeyError ):
+            self .misses +=1 
+            return None ,None 
+        self .hits +=1 
+        return _join (meta ["spec"],arrays ),meta 
+
+    def put (self ,key ,value ,**info ):
+        arrays =[]
+        spec =_split (value ,arrays )
+        final =self ._path (key )
+        final .parent .mkdir (parents =True ,exist_ok =True )
+        tmp =Path (tempfile .mkdtemp (prefix =".tmp-",dir =final .parent ))
+        try :
+            for i ,arr in enumerate (arrays ):
+                np .save (tmp /f"a{i }.npy",np .ascontiguousarray (arr ))
+            meta ={"key":key ,"spec":spec ,"n_arrays":len (arrays ),"created":time .time (),**info }
+            (tmp /META ).write_text (json .dumps (meta ,default =str ),encoding ="utf-8")
+            os .replace (tmp ,final )
+        except OSError :
+            shutil .rmtree (tmp ,ignore_errors =True )
+        self .evict ()
+
+    def entries (self ):
+        out =[]
+        if not self .root .exists ():
+            return out 
+        for path in self .root .glob ("??/*"):
+            if path .name .startswith (".tmp-")or not (path /META ).exists ():
+                continue 
+            size =sum (f .stat ().st_size for f in path .iterdir ())
+            out .append ((path .stat ().st_mtime ,size ,path ))
+        return sorted (out )
+
+    def size (self ):
+        return sum (size for _ ,size ,_ in self .entries ())
+
+    def evict (self ,max_bytes =None ):
+        limit =self .max_bytes if max_bytes is None else max_bytes 
+        entries =self .entries ()
+        total =sum (size for _ ,size ,_ in entries )
+        removed =0 
+        for _ ,size ,path in entries :
+            if total <=limit :
+                break 
+            shutil .rmtree (path ,ignore_errors =True )
+            total -=size 
+            removed +=1 
+        return removed 
+
+    def invalidate (self ,name =None ):
+        removed =0 
+        for _ ,_ ,path in self .entries ():
+            if name is not None :
+                meta =json .loads ((path /META ).read_text (encoding ="utf-8"))
+                if meta .get ("name")!=name and not str (meta .get ("name","")).endswith ("."+name ):
+                    continue 
+            shutil .rmtree (path ,ignore_errors =True )
+            removed +=1 
+        return removed 
+
+
+_default =None 
+
+
+def enabled ():
+    return os .environ .get (ENV_DIR ,"").lower ()not in ("0","off","false","no")
+
+
+def default_cache ():
+    global _default 
+    root =Path (os .environ .get (ENV_DIR )or DEFAULT_DIR )
+    if _default is None or _default .root !=root :
+        _default =Cache (root )
+    return _default 
+
+
+def memoize (fn ):
+    name =f"{fn .__module__ }.{fn .__qualname__ }"
+    version =functools .lru_cache (maxsize =None )(lambda :code_version (fn ))
+
+    @functools .wraps (fn )
+    def wrapper (*args ,**kwargs ):
+        if not enabled ():
+            return fn (*args ,**kwargs )
+        key =digest (name ,version (),args ,sorted (kwargs .items ()))
+        cache =default_cache ()
+        value ,meta =cache .get (key )
+        if meta is not None :
+            count ("cache.hit")
+            return value 
+        count ("cache.miss")
+        value =fn (*args ,**kwargs )
+        cache .put (key ,value ,name =name ,version =version ())
+        return value 
+
+    wrapper .cache_name =name 
+    return wrapper 
+
+
+def main (argv =None ):
+    import argparse 
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.cache",description ="Inspect or clear the result cache")
+    ap .add_argument ("cmd",choices =("info","clear","invalidate","evict"))
+    ap .add_argument ("name",nargs ="?",default =None ,help ="function name for invalidate")
+    ap .add_argument ("--max-mb",type =float ,default =None )
+    args =ap .parse_args (argv )
+    cache =default_cache ()
+    if args .cmd =="info":
+        entries =cache .entries ()
+        print (f"  {cache .root }: {len (entries )} entries, {sum (s for _ ,s ,_ in entries )/2 **20 :.1f} MB "
+        f"(limit {cache .max_bytes /2 **20 :.0f} MB)")
+        for _ ,size ,path in entries :
+            meta =json .loads ((path /META ).read_text (encoding ="utf-8"))
+            print (f"    {path .name [:12 ]}  {size /2 **10 :>9.1f} KB  {meta .get ('name')}")
+    elif args .cmd =="evict":
+        limit =None if args .max_mb is None else int (args .max_mb *2 **20 )
+        print (f"  removed {cache .evict (limit )} entries")
+    else :
+        if args .cmd =="invalidate"and not args .name :
+            ap .error ("invalidate needs a function name")
+        print (f"  removed {cache .invalidate (args .name if args .cmd =='invalidate'else None )} entries")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,228 @@
+"""
+AquaNeuron  —  Method Comparison
+Mergeable one-pass accumulators for AquaNeuron vs ICP-MS comparisons:
+Bland-Altman bias and limits of agreement, Pearson r and least-squares
+calibration, overall and broken down by site and concentration bin.
+
+    python -m aquaneuron.comparison archive/*.csv [--bins 10,50,100] [-j 0]
+"""
+
+import argparse 
+import multiprocessing as mp 
+import os 
+import sys 
+from concurrent .futures import ProcessPoolExecutor 
+import numpy as np 
+
+COLUMNS =("analyte","site","reference","candidate")
+CHUNK =1 <<20 
+
+
+class GroupMoments :
+    FIELDS =("n","mx","my","sxx","syy","sxy")
+
+    def __init__ (self ,n_groups =1 ):
+        for f in self .FIELDS :
+            setattr (self ,f ,np .zeros (n_groups ))
+
+    def __len__ (self ):
+        return len (self .n )
+
+    def grow (self ,n_groups ):
+        extra =n_groups -len (self )
+        if extra >0 :
+            for f in self .FIELDS :
+                setattr (self ,f ,np .concatenate ([getattr (self ,f ),np .zeros (extra )]))
+        return self 
+
+    def _combine (self ,nb ,mxb ,myb ,sxxb ,syyb ,sxyb ):
+        na =self .n [:len (nb )]
+        n =na +nb 
+        with np .errstate (invalid ="ignore",divide ="ignore"):
+            wb =np .where (n >0 ,nb /n ,0.0 )
+            w =np .where (n >0 ,na *nb /n ,0.0 )
+        dx =mxb -self .mx [:len (nb )]
+        dy =myb -self .my [:len (nb )]
+        self .mx [:len (nb )]+=dx *wb 
+        self .my [:len (nb )]+=dy *wb 
+        self .sxx [:len (nb )]+=sxxb +dx *dx *w 
+        self .syy [:len (nb )]+=syyb +dy *dy *w 
+        self .sxy [:len (nb )]+=sxyb +dx *dy *w 
+        self .n [:len (nb )]=n 
+
+    def update (self ,x ,y ,group =None ):
+        x =np .asarray (x ,dtype =np .float64 ).ravel ()
+        y =np .asarray (y ,dtype =np .float64 ).ravel ()
+        g =np .zeros (len (x ),dtype =np .intp )if group is None else np .asarray (group ,dtype =np .intp ).ravel ()
+        ok =np .isfinite (x )&np .isfinite (y )
+        if not ok .all ():
+            x ,y ,g =x [ok ],y [ok ],g [ok ]
+        if len (x )==0 :
+            return self 
+        G =max (len (self ),int (g .max ())+1 )
+        self .grow (G )
+        nb =np .bincount (g ,minlength =G ).astype (np .float64 )
+        with np .errstate (invalid ="ignore",divide ="ignore"):
+            mxb =np .where (nb >0 ,np .bincount (g ,x ,G )/nb ,0.0 )
+            myb =np .where (nb >0 ,np .bincount (g ,y ,G )/nb ,0.0 )
+        dx =x -mxb [g ]
+        dy =y -myb [g ]
+        self ._combine (nb ,mxb ,myb ,np .bincount (g ,dx *dx ,G ),np .bincount (g ,dy *dy ,G ),np .bincount (g ,dx *dy ,G ))
+        return self 
+
+    def merge (self ,other ,index =None ):
+        index =np .arange (len (other ))if index is None else np .asarray (index )
+        G =max (len (self ),int (index .max ())+1 if len (index )else 0 )
+        self .grow (G )
+        parts =[]
+        for f in self .FIELDS :
+            a =np .zeros (G )
+            a [index ]=getattr (other ,f )
+            parts .append (a )
+        self ._combine (*parts )
+        return self 
+
+    def stats (self ,z =1.96 ):
+        n =self .n 
+        with np .errstate (invalid ="ignore",divide ="ignore"):
+            sdd =np .sqrt (np .maximum (self .sxx +self .syy -2 *self .sxy ,0 )/n )
+            bias =self .my -self .mx 
+            r =self .sxy /np .sqrt (self .sxx *self .syy )
+            slope =self .sxy /self .sxx 
+            ss_res =np .maximum (self .syy -self .sxy *slope ,0 )
+            return {
+            "n":n .astype (np .int64 ),
+            "mean_reference":self .mx .copy (),
+            "mean_candidate":self .my .copy (),
+            "bias":bias ,
+            "sd_diff":sdd ,
+            "loa_lo":bias -z *sdd ,
+            "loa_hi":bias +z *sdd ,
+            "r":r ,
+            "r2":r *r ,
+            "slope":slope ,
+            "intercept":self .my -slope *self .mx ,
+            "slope_stderr":np .sqrt (ss_res /(n -2 )/self .sxx ),
+            "resid_sd":np .sqrt (ss_res /n ),
+            }
+
+
+class MethodComparison :
+    def __init__ (self ,edges =None ):
+        self .edges =None if edges is None else np .asarray (edges ,dtype =np .float64 )
+        self .total =GroupMoments (1 )
+        self .sites ={}
+        self .by_site =GroupMoments (0 )
+        self .by_bin =GroupMoments (0 if self .edges is None else len (self .edges )+1 )
+
+    def update (self ,reference ,candidate ,site =None ):
+        x =np .asarray (reference ,dtype =np .float64 ).ravel ()
+        y =np .asarray (candidate ,dtype =np .float64 ).ravel ()
+        self .total .update (x ,y )
+        if site is not None :
+            labels ,inv =np .unique (np .broadcast_to (np .asarray (site ),x .shape ),return_inverse =True )
+            idx =np .array ([self .sites .setdefault (str (s ),len (self .sites ))for s in labels ])
+            self .by_site .update (x ,y ,idx [inv ])
+        if self .edges is not None :
+            self .by_bin .update (x ,y ,np .digitize (x ,self .edges ))
+        return self 
+
+    def merge (self ,other ):
+        if (self .edges is None )!=(other .edges is None )or (
+        self .edges is not None and not np .array_equal (self .edges ,other .edges )):
+            raise ValueError ("cannot merge comparisons with different concentration bins")
+        self .total .merge (other .total )
+        if len (other .by_site ):
+            index =[self .sites .setdefault (s ,len (self .sites ))for s in other .sites ]
+            self .by_site .merge (other .by_site ,index )
+        if self .edges is not None :
+            self .by_bin .merge (other .by_bin )
+        return self 
+
+    def summary (self ):
+        return {k :v [0 ].item ()for k ,v in self .total .stats ().items ()}
+
+    def site_table (self ):
+        st =self .by_site .stats ()
+        return {s :{k :v [i ].item ()for k ,v in st .items ()}for s ,i in self .sites .items ()}
+
+    def bin_table (self ):
+        if self .edges is None :
+            return []
+        st =self .by_bin .stats ()
+        bounds =np .concatenate ([[-np .inf ],self .edges ,[np .inf ]])
+        return [((float (bounds [i ]),float (bounds [i +1 ])),{k :v [i ].item ()for k ,v in st .items ()})
+        for i in range (len (self .by_bin ))if st ["n"][i ]>0 ]
+
+
+def accumulate (chunks ,edges =None ):
+    out ={}
+    for analyte ,site ,reference ,candidate in chunks :
+        analyte =np .asarray (analyte )
+        for a in np .unique (analyte ):
+            m =analyte ==a 
+            acc =out .setdefault (str (a ),MethodComparison (edges ))
+            acc .update (np .asarray (reference )[m ],np .asarray (candidate )[m ],
+            None if site is None else np .asarray (site )[m ])
+    return out 
+
+
+def merge_all (parts ):
+    out ={}
+    for part in parts :
+        for a ,acc in part .items ():
+            if a in out :
+                out [a ].merge (acc )
+            else :
+                out [a ]=acc 
+    return out 
+
+
+def read_csv (path ,edges =None ,chunk =CHUNK ):
+    import pandas as pd 
+    chunks =((df ["analyte"].to_numpy (),df ["site"].to_numpy ()if "site"in df else None ,
+    df ["reference"].to_numpy (),df ["candidate"].to_numpy ())
+    for df in pd .read_csv (path ,chunksize =chunk ))
+    return accumulate (chunks ,edges )
+
+
+def _bin_label (lo ,hi ):
+    if np .isinf (lo ):
+        return f"<{hi :g} ppb"
+    if np .isinf (hi ):
+        return f"≥{lo :g} ppb"
+    return f"{lo :g}–{hi :g} ppb"
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.comparison",
+    description ="One-pass AquaNeuron vs ICP-MS method comparison")
+    ap .add_argument ("files",nargs ="+",help =f"CSV files with columns {', '.join (COLUMNS )}")
+    ap .add_argument ("--bins",help ="comma-separated concentration bin edges (ppb)")
+    ap .add_argument ("--chunk",type =int ,default =CHUNK )
+    ap .add_argument ("-j","--jobs",type =int ,default =1 ,help ="worker processes (0 = all CPUs)")
+    args =ap .parse_args (argv )
+
+    edges =None if not args .bins else np .array ([float (v )for v in args .bins .split (",")])
+    jobs =min (args .jobs or os .cpu_count ()or 1 ,len (args .files ))
+    if jobs ==1 :
+        parts =[read_csv (f ,edges ,args .chunk )for f in args .files ]
+    else :
+        with ProcessPoolExecutor (jobs ,mp_context =mp .get_context ("spawn"))as pool :
+            parts =list (pool .map (read_csv ,args .files ,[edges ]*len (args .files ),[args .chunk ]*len (args .files )))
+    results =merge_all (parts )
+
+    head =f"  {'':<14}{'n':>10}{'bias':>10}{'LoA':>22}{'r':>9}{'slope':>9}{'intercept':>11}"
+    for analyte ,acc in sorted (results .items ()):
+        print (f"\n  {analyte }")
+        print (head )
+        rows =[("all",acc .summary ())]+sorted (acc .site_table ().items ())
+        rows +=[(_bin_label (lo ,hi ),s )for (lo ,hi ),s in acc .bin_table ()]
+        for label ,s in rows :
+            print (f"  {label :<14}{s ['n']:>10,}{s ['bias']:>+10.3f}  [{s ['loa_lo']:>+8.3f}, {s ['loa_hi']:>+8.3f}]"
+            f"{s ['r']:>9.4f}{s ['slope']:>9.4f}{s ['intercept']:>+11.3f}")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,335 @@
+"""
+AquaNeuron  —  Forest Compression
+Shrinks the trained Random Forest for MCU deployment: greedy tree
+selection, depth pruning, int16 thresholds in ADC / sensor units and
+optional distillation into a shallow forest, with accuracy, bytes and
+operations per prediction reported at every budget; exports a compact
+blob, a reference evaluator and a C header.
+
+    python -m aquaneuron.compress models/rf --out models/rf.aqrf [--max-bytes 8192] [--max-ops 256]
+"""
+
+import argparse 
+import struct 
+import sys 
+import time 
+import zlib 
+from collections import namedtuple 
+from pathlib import Path 
+import numpy as np 
+from .records import DR_PER_COUNT 
+from .rng import ROOT_SEED ,generator ,seed_sequence 
+
+QUANTUM =np .array ([DR_PER_COUNT ,DR_PER_COUNT ,DR_PER_COUNT ,0.01 ,1.0 ,0.01 ])
+INT16 =np .iinfo (np .int16 )
+NODE =np .dtype ([("feature","u1"),("label","u1"),("threshold","<i2"),("right","<u2")])
+LEAF =0xFF 
+MAGIC =b"AQRF"
+VERSION =1 
+HEAD =struct .Struct ("<4sBBBBHH")
+DEPTHS =(3 ,4 ,5 ,6 ,8 ,12 )
+SIZES =(1 ,3 ,5 ,9 ,17 ,33 ,65 )
+DISTILL =((4 ,8 ),(5 ,16 ),(6 ,16 ),(6 ,32 ),(8 ,32 ))
+
+Tree =namedtuple ("Tree",["left","right","feature","threshold","label"])
+Candidate =namedtuple ("Candidate",["name","forest","accuracy","agreement","nbytes","mean_ops","max_ops"])
+
+
+def quantize (X ):
+    X =np .atleast_2d (np .asarray (X ,dtype =np .float64 ))
+    return np .clip (np .rint (X /QUANTUM ),INT16 .min ,INT16 .max ).astype (np .int16 )
+
+
+def trees (forest ,mean =0.0 ,scale =1.0 ):
+    mean =np .broadcast_to (np .asarray (mean ,dtype =np .float64 ),(len (QUANTUM ),))
+    scale =np .broadcast_to (np .asarray (scale ,dtype =np .float64 ),(len (QUANTUM ),))
+    out =[]
+    for est in forest .estimators_ :
+        t =est .tree_ 
+        leaf =t .children_left ==-1 
+        f =np .where (leaf ,0 ,t .feature )
+        raw =t .threshold *scale [f ]+mean [f ]
+        q =np .clip (np .floor (raw /QUANTUM [f ]),INT16 .min ,INT16 .max )
+        out .append (Tree (t .children_left ,t .children_right ,f ,np .where (leaf ,0 ,q ).astype (np .int16 ),
+        np .argmax (t .value [:,0 ,:],axis =1 )))
+    return out 
+
+
+def prune (tree ,max_depth =None ):
+    nodes =[]
+
+    def build (i ,depth ):
+        k =len (nodes )
+        if tree .left [i ]==-1 or depth ==max_depth :
+            nodes .append ((LEAF ,tree .label [i ],0 ,0 ))
+            return {int (tree .label [i ])}
+        nodes .append (None )
+        labels =build (tree .left [i ],depth +1 )
+        right =len (nodes )
+        labels |=build (tree .right [i ],depth +1 )
+        if len (labels )==1 :
+            del nodes [k :]
+            nodes .append ((LEAF ,next (iter (labels )),0 ,0 ))
+        else :
+            nodes [k ]=(tree .feature [i ],0 ,tree .threshold [i ],right )
+        return labels 
+
+    build (0 ,0 )
+    return np .array (nodes ,dtype =NODE )
+
+
+class CompactForest :
+    def __init__ (self ,nodes ,roots ,n_classes ,n_features =len (QUANTUM )):
+        self .nodes =np .asarray (nodes ,dtype =NODE )
+        self .roots =np .asarray (roots ,dtype =np .uint16 )
+        self .n_classes =int (n_classes )
+        self .n_features =int (n_features )
+
+    @classmethod 
+    def from_trees (cls ,pruned ,n_classes ):
+        sizes =np .array ([len (t )for t in pruned ])
+        if sizes .sum ()>0xFFFF :
+            raise ValueError (f"{sizes .sum ()} nodes do not fit 16-bit node indices")
+        roots =np .concatenate ([[0 ],np .cumsum (sizes )[:-1 ]])
+        nodes =np .concatenate (pruned )
+        inner =nodes ["feature"]!=LEAF 
+        nodes ["right"][inner ]+=np .repeat (roots ,sizes )[inner ].astype (np .uint16 )
+        return cls (nodes ,roots ,n_classes )
+
+    @property 
+    def n_trees (self ):
+        return len (self .roots )
+
+    @property 
+    def max_ops (self ):
+        depth =np .zeros (len (self .nodes ),dtype =np .int64 )
+        for i in range (len (self .nodes )):
+            if self .nodes ["feature"][i ]!=LEAF :
+                depth [i +1 ]=depth [self .nodes ["right"][i ]]=depth [i ]+1 
+        return int (np .maximum .reduceat (depth ,self .roots .astype (np .intp )).sum ())if len (self .nodes )else 0 
+
+    def apply (self ,Xq ):
+        Xq =np .atleast_2d (Xq )
+        feature =self .nodes ["feature"].astype (np .intp )
+        threshold =self .nodes ["threshold"]
+        right =self .nodes ["right"].astype (np .intp )
+        node =np .repeat (self .roots .astype (np .intp )[:,None ],len (Xq ),axis =1 )
+        rows =np .arange (len (Xq ))
+        ops =np .zeros (len (Xq ),dtype =np .int64 )
+        while True :
+            f =feature [node ]
+            inner =f !=LEAF 
+            if not inner .any ():
+                return node ,ops 
+            ops +=inner .sum (axis =0 )
+            go_left =Xq [rows ,np .where (inner ,f ,0 )]<=threshold [node ]
+            node =np .where (inner ,np .where (go_left ,node +1 ,right [node ]),node )
+
+    def votes (self ,Xq ):
+        node ,ops =self .apply (Xq )
+        labels =self .nodes ["label"][node ].astype (np .intp )
+        n =labels .shape [1 ]
+        V =np .bincount ((np .arange (n )*self .n_classes +labels ).ravel (),minlength =n *self .n_classes )
+        return V .reshape (n ,self .n_classes ),ops 
+
+    def predict (self ,Xq ):
+        return np .argmax (self .votes (Xq )[0 ],axis =1 )
+
+    def to_bytes (self ):
+        body =(HEAD .pack (MAGIC ,VERSION ,self .n_features ,self .n_classes ,0 ,self .n_trees ,len (self .nodes ))
+        +QUANTUM .astype ("<f4").tobytes ()+self .roots .astype ("<u2").tobytes ()+self .nodes .tobytes ())
+        return body +struct .pack ("<I",zlib .crc32 (body ))
+
+    @classmethod 
+    def from_bytes (cls ,blob ):
+        blob =bytes (blob )
+        if len (blob )<HEAD .size +4 or blob [:4 ]!=MAGIC :
+            raise ValueError ("not an AquaNeuron forest blob")
+        if struct .unpack ("<I",blob [-4 :])[0 ]!=zlib .crc32 (blob [:-4 ]):
+            raise ValueError ("forest blob checksum mismatch")
+        _ ,version ,n_features ,n_classes ,_ ,n_trees ,n_nodes =HEAD .unpack_from (blob )
+        if version !=VERSION :
+            raise ValueError (f"unsupported forest blob version {version }")
+        off =HEAD .size +4 *n_features 
+        roots =np .frombuffer (blob ,"<u2",n_trees ,off )
+        nodes =np .frombuffer (blob ,NODE ,n_nodes ,off +2 *n_trees )
+        return cls (nodes .copy (),roots .copy (),n_classes ,n_features )
+
+    @property 
+    def nbytes (self ):
+        return HEAD .size +4 *self .n_features +2 *self .n_trees +NODE .itemsize *len (self .nodes )+4 
+
+
+def evaluate (blob ,x ):
+    _ ,_ ,n_features ,n_classes ,_ ,n_trees ,_ =HEAD .unpack_from (blob )
+    roots =HEAD .size +4 *n_features 
+    base =roots +2 *n_trees 
+    votes =[0 ]*n_classes 
+    for t in range (n_trees ):
+        i =struct .unpack_from ("<H",blob ,roots +2 *t )[0 ]
+        while True :
+            feature ,label ,threshold ,right =struct .unpack_from ("<BBhH",blob ,base +NODE .itemsize *i )
+            if feature ==LEAF :
+                votes [label ]+=1 
+                break 
+            i =i +1 if x [feature ]<=threshold else right 
+    return max (range (n_classes ),key =lambda c :(votes [c ],-c ))
+
+
+C_EVALUATOR ="""
+static inline int aquaneuron_forest_predict(const int16_t x[%(n_features)d])
+{
+    const uint8_t *b = aquaneuron_forest;
+    const uint16_t n_trees = (uint16_t)(b[8] | b[9] << 8);
+    const uint8_t *roots = b + %(head)d + 4 * %(n_features)d;
+    const uint8_t *nodes = roots + 2 * n_trees;
+    uint16_t votes[%(n_classes)d] = {0};
+    for (uint16_t t = 0; t < n_trees; t++) {
+        uint16_t i = (uint16_t)(roots[2 * t] | roots[2 * t + 1] << 8);
+        for (;;) {
+            const uint8_t *n = nodes + %(size)d * i;
+            if (n[0] == 0xFF) { votes[n[1]]++; break; }
+            i = x[n[0]] <= (int16_t)(n[2] | n[3] << 8) ? (uint16_t)(i + 1) : (uint16_t)(n[4] | n[5] << 8);
+        }
+    }
+    int best = 0;
+    for (int c = 1; c < %(n_classes)d; c++)
+        if (votes[c] > votes[best]) best = c;
+    return best;
+}
+"""
+
+
+def c_header (blob ,classes =None ):
+    cf =CompactForest .from_bytes (blob )
+    rows =[", ".join (f"0x{b :02x}"for b in blob [i :i +16 ])for i in range (0 ,len (blob ),16 )]
+    names =""if classes is None else "".join (f"/* {i }: {c } */\n"for i ,c in enumerate (classes ))
+    return ("#pragma once\n#include <stdint.h>\n\n"+names 
+    +f"/* {cf .n_trees } trees, {len (cf .nodes )} nodes, {len (blob )} bytes; inputs are int16 in ADC counts\n"
+    +"   (ΔR channels), 0.01 pH, 1 ppm TDS and 0.01 °C. */\n"
+    +f"static const uint8_t aquaneuron_forest[{len (blob )}] = {{\n    "+",\n    ".join (rows )+"\n};\n"
+    +C_EVALUATOR %{"n_features":cf .n_features ,"n_classes":cf .n_classes ,"head":HEAD .size ,
+    "size":NODE .itemsize })
+
+
+def _greedy (labels ,y ,n_classes ,k_max ):
+    onehot =np .eye (n_classes ,dtype =np .int32 )[labels ]
+    order ,votes =[],np .zeros (onehot .shape [1 :],dtype =np .int32 )
+    left =np .ones (len (labels ),dtype =bool )
+    rows =np .arange (len (y ))
+    for k in range (min (k_max ,len (labels ))):
+        cand =np .flatnonzero (left )
+        trial =votes [None ]+onehot [cand ]
+        correct =trial [:,rows ,y ]
+        trial [:,rows ,y ]=-1 
+        margin =(correct -trial .max (axis =2 ))/(k +1 )
+        score =(margin >0 ).mean (axis =1 )+1e-3 *margin .mean (axis =1 )
+        best =cand [np .argmax (score )]
+        order .append (best )
+        votes +=onehot [best ]
+        left [best ]=False 
+    return order 
+
+
+def _candidate (name ,forest ,Xq ,y ,teacher ):
+    pred ,ops =forest .votes (Xq )
+    pred =np .argmax (pred ,axis =1 )
+    return Candidate (name ,forest ,float ((pred ==y ).mean ()),float ((pred ==teacher ).mean ()),
+    forest .nbytes ,float (ops .mean ()),forest .max_ops )
+
+
+def candidates (model ,X_sel ,y_sel ,X_test ,y_test ,depths =DEPTHS ,sizes =SIZES ,distill =DISTILL ,
+n_transfer =20000 ,seed =None ,echo =None ):
+    from .dataset import sample 
+    seed =seed_sequence ("validation",23 )if seed is None else seed 
+    n_classes =len (model .classes )
+    full =trees (model .forest ,model .mean ,model .scale )
+    Q_sel ,Q_test =quantize (X_sel ),quantize (X_test )
+    teacher =model .predict (X_test )
+    out ,seen =[],set ()
+
+    def add (name ,cf ):
+        blob =cf .to_bytes ()
+        if blob not in seen :
+            seen .add (blob )
+            out .append (_candidate (name ,cf ,Q_test ,y_test ,teacher ))
+
+    for d in depths :
+        pruned =[prune (t ,d )for t in full ]
+        sel =np .array ([CompactForest .from_trees ([p ],n_classes ).predict (Q_sel )for p in pruned ],dtype =np .intp )
+        order =_greedy (sel ,y_sel ,n_classes ,max (sizes ))
+        for k in sizes :
+            add (f"select depth≤{d } ×{k }",CompactForest .from_trees ([pruned [i ]for i in order [:k ]],n_classes ))
+        if echo :
+            echo (f"  depth ≤ {d }: {sum (map (len ,pruned )):,} nodes over {len (pruned )} trees, selected up to {max (sizes )}")
+    if distill :
+        from sklearn .ensemble import RandomForestClassifier 
+        X_tr ,_ =sample (-(-n_transfer //n_classes ),seed =seed ,dtype =np .float64 )
+        y_tr =model .predict (X_tr )
+        for d ,k in distill :
+            rf =RandomForestClassifier (n_estimators =k ,max_depth =d ,random_state =42 ).fit (X_tr ,y_tr )
+            add (f"distill depth≤{d } ×{k }",CompactForest .from_trees ([prune (t )for t in trees (rf )],n_classes ))
+    return out 
+
+
+def choose (cands ,max_bytes =None ,max_ops =None ):
+    ok =[c for c in cands if (max_bytes is None or c .nbytes <=max_bytes )and (max_ops is None or c .max_ops <=max_ops )]
+    if not ok :
+        return None 
+    return max (ok ,key =lambda c :(c .accuracy ,c .agreement ,-c .nbytes ))
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.compress",
+    description ="Compress the edge forest for microcontroller deployment")
+    ap .add_argument ("model",help ="model directory written by python -m aquaneuron.model train")
+    ap .add_argument ("--out",default =None ,help ="write the chosen forest blob here (.aqrf)")
+    ap .add_argument ("--header",default =None ,help ="also write a C header with the blob and evaluator")
+    ap .add_argument ("--max-bytes",type =int ,default =8192 )
+    ap .add_argument ("--max-ops",type =int ,default =256 ,help ="worst-case node comparisons per prediction")
+    ap .add_argument ("--no-distill",action ="store_true")
+    ap .add_argument ("--n-test",type =int ,default =2000 ,help ="held-out readings per class")
+    ap .add_argument ("--noise",type =float ,default =0.0 ,
+    help ="relative Gaussian noise on selection/test readings, to separate the budgets")
+    ap .add_argument ("--seed",type =int ,default =None ,help =f"root seed (default {ROOT_SEED })")
+    args =ap .parse_args (argv )
+
+    from .model import load ,synthetic_readings 
+    model =load (args .model ,engine ="sklearn")
+    X_sel ,y_sel =synthetic_readings (200 ,seed_sequence ("validation",21 ,root =args .seed ))
+    X_test ,y_test =synthetic_readings (args .n_test ,seed_sequence ("validation",22 ,root =args .seed ))
+    if args .noise :
+        g =generator ("validation",24 ,root =args .seed )
+        X_sel =X_sel *g .normal (1 ,args .noise ,X_sel .shape )
+        X_test =X_test *g .normal (1 ,args .noise ,X_test .shape )
+    t0 =time .perf_counter ()
+    full =CompactForest .from_trees ([prune (t )for t in trees (model .forest ,model .mean ,model .scale )],len (model .classes ))
+    cands =[_candidate ("all trees, int16",full ,quantize (X_test ),y_test ,model .predict (X_test ))]
+    cands +=candidates (model ,X_sel ,y_sel ,X_test ,y_test ,distill =()if args .no_distill else DISTILL ,
+    seed =seed_sequence ("validation",23 ,root =args .seed ),echo =print )
+    teacher_acc =float ((model .predict (X_test )==y_test ).mean ())
+    print (f"\n  teacher: {model .forest .n_estimators } trees, {sum (e .tree_ .node_count for e in model .forest .estimators_ ):,} "
+    f"nodes, accuracy {teacher_acc :.4f}   ({time .perf_counter ()-t0 :.1f} s)")
+    print (f"  {'candidate':<26}{'trees':>6}{'bytes':>9}{'ops (mean)':>12}{'ops (max)':>11}{'accuracy':>10}{'agree':>8}")
+    for c in sorted (cands ,key =lambda c :c .nbytes ):
+        print (f"  {c .name :<26}{c .forest .n_trees :>6}{c .nbytes :>9,}{c .mean_ops :>12.1f}{c .max_ops :>11}"
+        f"{c .accuracy :>10.4f}{c .agreement :>8.4f}")
+    best =choose (cands ,args .max_bytes ,args .max_ops )
+    if best is None :
+        print (f"  ✗ no candidate fits {args .max_bytes } bytes and {args .max_ops } operations")
+        return 1 
+    print (f"\n  chosen under {args .max_bytes :,} B / {args .max_ops } ops: {best .name } "
+    f"({best .nbytes :,} B, accuracy {best .accuracy :.4f})")
+    blob =best .forest .to_bytes ()
+    if args .out :
+        Path (args .out ).parent .mkdir (parents =True ,exist_ok =True )
+        Path (args .out ).write_bytes (blob )
+        print (f"✓ Saved: {args .out }")
+    if args .header :
+        Path (args .header ).write_text (c_header (blob ,model .classes ),encoding ="utf-8")
+        print (f"✓ Saved: {args .header }")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,145 @@
+"""
+AquaNeuron  —  Synthetic Dataset
+Declarative per-class distributions of the six sensor features and a
+vectorized, chunked sampler that fills preallocated float32 arrays.
+
+    python -m aquaneuron.dataset OUT --n-per 1000000 [--chunk 262144] [--seed 2026]
+"""
+
+import argparse 
+import sys 
+import time 
+from dataclasses import dataclass 
+from pathlib import Path 
+import numpy as np 
+from .rng import ROOT_SEED ,child ,seed_sequence 
+from .trace import traced 
+
+BLOCK =8192 
+CHUNK =32 *BLOCK 
+
+
+@dataclass (frozen =True )
+class ClassSpec :
+    name :str 
+    mean :tuple 
+    std :tuple 
+    cov :tuple =None 
+
+    def factor (self ,dtype =np .float64 ):
+        if self .cov is None :
+            return None 
+        return np .linalg .cholesky (np .asarray (self .cov ,dtype =np .float64 )).astype (dtype )
+
+
+CLASS_SPECS =(
+ClassSpec ("Safe",(2 ,3 ,1.5 ,7.2 ,320 ,28 ),(1.2 ,1.5 ,0.9 ,0.3 ,40 ,3 )),
+ClassSpec ("As-High",(54 ,3.5 ,2 ,7.0 ,380 ,27 ),(7 ,1.5 ,0.9 ,0.4 ,50 ,3 )),
+ClassSpec ("F-High",(2.5 ,50 ,1.8 ,7.5 ,410 ,29 ),(1.1 ,7 ,0.8 ,0.4 ,60 ,3 )),
+ClassSpec ("Pb-High",(3 ,3.2 ,60 ,6.8 ,450 ,28 ),(1.2 ,1.5 ,8 ,0.5 ,70 ,3 )),
+ClassSpec ("Multi-Cont.",(46 ,44 ,52 ,6.5 ,520 ,30 ),(7 ,7 ,7 ,0.5 ,80 ,3 )),
+)
+
+
+def _seed (seed ):
+    if seed is None :
+        return seed_sequence ("dataset")
+    if isinstance (seed ,np .random .SeedSequence ):
+        return seed 
+    return np .random .SeedSequence (seed )
+
+
+def _block_generator (seed ,b ):
+    return np .random .Generator (np .random .PCG64 (child (seed ,b )))
+
+
+def label_dtype (specs =CLASS_SPECS ):
+    return np .min_scalar_type (len (specs )-1 )
+
+
+def fill (X ,y ,start =0 ,specs =CLASS_SPECS ,seed =None ):
+    if start %BLOCK :
+        raise ValueError (f"start must be a multiple of {BLOCK }, got {start }")
+    if X .shape !=(len (y ),len (specs [0 ].mean )):
+        raise ValueError (f"X has shape {X .shape }, expected ({len (y )}, {len (specs [0 ].mean )})")
+    seed =_seed (seed )
+    k =len (specs )
+    params =[(np .asarray (s .mean ,X .dtype ),np .asarray (s .std ,X .dtype ),s .factor (X .dtype ))for s in specs ]
+    for a in range (0 ,len (X ),BLOCK ):
+        blk =X [a :a +BLOCK ]
+        _block_generator (seed ,(start +a )//BLOCK ).standard_normal (out =blk ,dtype =X .dtype )
+        for c ,(mu ,sd ,L )in enumerate (params ):
+            rows =blk [(c -start -a )%k ::k ]
+            if L is None :
+                rows *=sd 
+            else :
+                rows [...]=rows @L .T 
+            rows +=mu 
+    np .remainder (np .arange (start ,start +len (y )),k ,out =y ,casting ="unsafe")
+    return X ,y 
+
+
+def iter_chunks (n_per ,specs =CLASS_SPECS ,seed =None ,chunk =CHUNK ,dtype =np .float32 ):
+    seed =_seed (seed )
+    n =n_per *len (specs )
+    chunk =max (BLOCK ,chunk //BLOCK *BLOCK )
+    X =np .empty ((min (chunk ,n ),len (specs [0 ].mean )),dtype )
+    y =np .empty (len (X ),label_dtype (specs ))
+    for start in range (0 ,n ,chunk ):
+        m =min (chunk ,n -start )
+        fill (X [:m ],y [:m ],start ,specs ,seed )
+        yield X [:m ],y [:m ]
+
+
+@traced ()
+def sample (n_per ,specs =CLASS_SPECS ,seed =None ,dtype =np .float32 ,out =None ,chunk =CHUNK ):
+    seed =_seed (seed )
+    n =n_per *len (specs )
+    if out is None :
+        out =(np .empty ((n ,len (specs [0 ].mean )),dtype ),np .empty (n ,label_dtype (specs )))
+    X ,y =out 
+    chunk =max (BLOCK ,chunk //BLOCK *BLOCK )
+    for start in range (0 ,n ,chunk ):
+        fill (X [start :start +chunk ],y [start :start +chunk ],start ,specs ,seed )
+    return X ,y 
+
+
+def write (path ,n_per ,specs =CLASS_SPECS ,seed =None ,dtype =np .float32 ,chunk =CHUNK ):
+    path =Path (path )
+    path .mkdir (parents =True ,exist_ok =True )
+    n =n_per *len (specs )
+    X =np .lib .format .open_memmap (path /"X.npy",mode ="w+",dtype =dtype ,shape =(n ,len (specs [0 ].mean )))
+    y =np .lib .format .open_memmap (path /"y.npy",mode ="w+",dtype =label_dtype (specs ),shape =(n ,))
+    sample (n_per ,specs ,seed ,out =(X ,y ),chunk =chunk )
+    X .flush ()
+    y .flush ()
+    return path 
+
+
+def load (path ,mmap =True ):
+    path =Path (path )
+    mode ="r"if mmap else None 
+    return np .load (path /"X.npy",mmap_mode =mode ),np .load (path /"y.npy",mmap_mode =mode )
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.dataset",
+    description ="Write a synthetic labelled dataset as X.npy / y.npy")
+    ap .add_argument ("out")
+    ap .add_argument ("--n-per",type =int ,default =300 ,help ="readings per class")
+    ap .add_argument ("--chunk",type =int ,default =CHUNK ,help ="rows sampled per chunk")
+    ap .add_argument ("--seed",type =int ,default =ROOT_SEED )
+    ap .add_argument ("--float64",action ="store_true")
+    args =ap .parse_args (argv )
+
+    t0 =time .perf_counter ()
+    write (args .out ,args .n_per ,seed =seed_sequence ("dataset",root =args .seed ),
+    dtype =np .float64 if args .float64 else np .float32 ,chunk =args .chunk )
+    dt =time .perf_counter ()-t0 
+    n =args .n_per *len (CLASS_SPECS )
+    print (f"✓ Saved: {args .out } ({n } readings, {dt :.2f} s, {n /dt :,.0f} rows/s)")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,170 @@
+"""
+AquaNeuron  —  Embedding Service
+Fitted 2-D maps of the 6-feature space: a PCA fast path and a landmark
+t-SNE whose layout new readings are projected onto without refitting.
+
+    python -m aquaneuron.embedding fit OUT [--method tsne|pca] [--data DIR]
+    python -m aquaneuron.embedding project OUT X1 X2 X3 X4 X5 X6
+"""
+
+import argparse 
+import sys 
+from pathlib import Path 
+import numpy as np 
+from .rng import ROOT_SEED ,seed_sequence 
+from .trace import traced 
+
+METHODS =("pca","tsne")
+CHUNK =4096 
+
+
+def _nearest (X ,L ,k ,chunk =CHUNK ):
+    L2 =np .einsum ("ij,ij->i",L ,L )
+    idx =np .empty ((len (X ),k ),dtype =np .intp )
+    d2 =np .empty ((len (X ),k ))
+    for a in range (0 ,len (X ),chunk ):
+        x =X [a :a +chunk ]
+        D =L2 -2 *x @L .T +np .einsum ("ij,ij->i",x ,x )[:,None ]
+        np .maximum (D ,0 ,out =D )
+        part =np .argpartition (D ,k -1 ,axis =1 )[:,:k ]if k <len (L )else np .broadcast_to (np .arange (len (L )),D .shape )
+        idx [a :a +chunk ]=part 
+        d2 [a :a +chunk ]=np .take_along_axis (D ,part ,axis =1 )
+    return idx ,d2 
+
+
+def _calibrate (d2 ,perplexity ,n_iter =64 ):
+    target =np .log (perplexity )
+    d2 =d2 -d2 .min (axis =1 ,keepdims =True )
+    lo =np .zeros (len (d2 ))
+    hi =np .full (len (d2 ),np .inf )
+    beta =np .ones (len (d2 ))/max (np .median (d2 ),1e-12 )
+    for _ in range (n_iter ):
+        W =np .exp (-d2 *beta [:,None ])
+        S =W .sum (axis =1 )
+        H =np .log (S )+beta *(d2 *W ).sum (axis =1 )/S 
+        high =H >target 
+        lo =np .where (high ,beta ,lo )
+        hi =np .where (high ,hi ,beta )
+        beta =np .where (np .isinf (hi ),beta *2 ,(lo +hi )/2 )
+    return beta 
+
+
+class Embedding :
+    def __init__ (self ,method ,mean ,scale ,components =None ,landmarks =None ,layout =None ,
+    beta =None ,k =30 ):
+        if method not in METHODS :
+            raise ValueError (f"unknown embedding method {method !r}; choose from {METHODS }")
+        self .method =method 
+        self .mean =np .asarray (mean ,dtype =np .float64 )
+        self .scale =np .asarray (scale ,dtype =np .float64 )
+        self .components =components 
+        self .landmarks =landmarks 
+        self .layout =layout 
+        self .beta =beta 
+        self .k =int (k )
+
+    @classmethod 
+    @traced ()
+    def fit (cls ,X ,method ="tsne",n_landmarks =500 ,perplexity =35 ,k =30 ,
+    proj_perplexity =10.0 ,seed =None ):
+        X =np .asarray (X ,dtype =np .float64 )
+        mean =X .mean (axis =0 )
+        scale =X .std (axis =0 )
+        scale [scale ==0 ]=1.0 
+        Z =(X -mean )/scale 
+        if method =="pca":
+            _ ,_ ,Vt =np .linalg .svd (Z [:min (len (Z ),100_000 )],full_matrices =False )
+            signs =np .sign (Vt [np .arange (2 ),np .abs (Vt [:2 ]).argmax (axis =1 )])
+            return cls ("pca",mean ,scale ,components =Vt [:2 ]*signs [:,None ])
+        from sklearn .manifold import TSNE 
+        seed =seed_sequence ("embedding")if seed is None else seed 
+        g =np .random .default_rng (seed )
+        idx =np .sort (g .choice (len (Z ),min (n_landmarks ,len (Z )),replace =False ))
+        layout =TSNE (n_components =2 ,perplexity =min (perplexity ,(len (idx )-1 )/3 ),
+        random_state =int (g .integers (2 **31 )),max_iter =1000 ).fit_transform (Z [idx ])
+        k =min (k ,len (idx )-1 )
+        _ ,d2 =_nearest (Z [idx ],Z [idx ],k +1 )
+        d2 =np .sort (d2 ,axis =1 )[:,1 :]
+        beta =_calibrate (d2 ,min (proj_perplexity ,k ))
+        return cls ("tsne",mean ,scale ,landmarks =Z [idx ],layout =layout ,beta =beta ,k =k )
+
+    def standardize (self ,X ):
+        return (np .atleast_2d (np .asarray (X ,dtype =np .float64 ))-self .mean )/self .scale 
+
+    @traced ()
+    def transform (self ,X ):
+        Z =self .standardize (X )
+        if self .method =="pca":
+            return Z @self .components .T 
+        idx ,d2 =_nearest (Z ,self .landmarks ,self .k )
+        E =d2 *self .beta [idx ]
+        W =np .exp (E .min (axis =1 ,keepdims =True )-E )
+        W /=W .sum (axis =1 ,keepdims =True )
+        out =np .einsum ("nk,nkj->nj",W ,self .layout [idx ])
+        j =idx [np .arange (len (Z )),d2 .argmin (axis =1 )]
+        hit =(Z ==self .landmarks [j ]).all (axis =1 )
+        out [hit ]=self .layout [j [hit ]]
+        return out 
+
+    def state (self ):
+        out ={"method":self .method ,"mean":self .mean ,"scale":self .scale ,"k":self .k }
+        for name in ("components","landmarks","layout","beta"):
+            if getattr (self ,name )is not None :
+                out [name ]=getattr (self ,name )
+        return out 
+
+    @classmethod 
+    def from_state (cls ,state ):
+        state =dict (state )
+        state .pop ("labels",None )
+        return cls (str (state .pop ("method")),**state )
+
+    def save (self ,path ):
+        np .savez (path ,**self .state ())
+        return path 
+
+    @classmethod 
+    def load (cls ,path ):
+        with np .load (path )as z :
+            state ={k :z [k ]for k in z .files }
+        state ["k"]=int (state ["k"])
+        return cls .from_state (state )
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.embedding",
+    description ="Fit a 2-D feature map and project new readings onto it")
+    sub =ap .add_subparsers (dest ="cmd",required =True )
+    fi =sub .add_parser ("fit",help ="fit an embedding on synthetic or stored readings")
+    fi .add_argument ("out",help ="output .npz")
+    fi .add_argument ("--method",choices =METHODS ,default ="tsne")
+    fi .add_argument ("--data",help ="dataset written by python -m aquaneuron.dataset")
+    fi .add_argument ("--n-per",type =int ,default =300 )
+    fi .add_argument ("--landmarks",type =int ,default =500 )
+    fi .add_argument ("--seed",type =int ,default =ROOT_SEED )
+    pr =sub .add_parser ("project",help ="project one raw 6-feature reading")
+    pr .add_argument ("embedding")
+    pr .add_argument ("reading",nargs =6 ,type =float ,metavar ="X")
+    args =ap .parse_args (argv )
+
+    if args .cmd =="fit":
+        if args .data :
+            from .dataset import load 
+            X ,_ =load (args .data )
+        else :
+            from .model import synthetic_readings 
+            X ,_ =synthetic_readings (args .n_per ,seed_sequence ("dataset",root =args .seed ))
+        emb =Embedding .fit (X ,method =args .method ,n_landmarks =args .landmarks ,
+        seed =seed_sequence ("embedding",root =args .seed ))
+        out =emb .save (Path (args .out ).with_suffix (".npz"))
+        print (f"✓ Saved: {out } ({args .method }, {len (X )} readings)")
+        return 0 
+
+    emb =Embedding .load (args .embedding )
+    x ,y =emb .transform (args .reading )[0 ]
+    print (f"{x :.3f}\t{y :.3f}")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -5,34 +5,22 @@ Prateek Tiwari, Raghav Khandelia, Aroush Muglikar, Shreyas Roy
 """
 
 import numpy as np 
-import pandas as pd 
-import matplotlib 
-matplotlib .use ('Agg')
-import matplotlib .pyplot as plt 
 from pathlib import Path 
-import matplotlib .patches as mpatches 
-import matplotlib .gridspec as gridspec 
-import matplotlib .patheffects as pe 
-from matplotlib .colors import LinearSegmentedColormap ,BoundaryNorm 
-from matplotlib .patches import FancyBboxPatch ,FancyArrowPatch ,Arc ,Wedge 
-import matplotlib .ticker as ticker 
-from scipy .stats import pearsonr ,linregress ,norm ,chi2 
-from scipy .optimize import curve_fit ,minimize 
-from scipy .interpolate import interp1d 
-from sklearn .ensemble import RandomForestClassifier ,GradientBoostingClassifier 
-from sklearn .model_selection import train_test_split ,cross_val_score ,StratifiedKFold 
-from sklearn .metrics import (confusion_matrix ,classification_report ,
-roc_curve ,auc ,precision_recall_curve )
-from sklearn .preprocessing import StandardScaler ,label_binarize 
-from sklearn .manifold import TSNE 
-from sklearn .decomposition import PCA 
-import warnings 
-warnings .filterwarnings ('ignore')
-
-np .random .seed (2026 )
-
-
-plt .rcParams .update ({
+from dataclasses import replace 
+from .physics import (ANALYTES ,LOD_MODELS ,BARE_ELECTRODE ,langmuir ,freundlich ,response ,
+binding_free_energy ,kinetics ,time_to_fraction ,channel_params ,
+ION_PANEL ,CROSS_REACTIVITY ,coupled_response )
+from .fitting import fit_langmuir_batch ,fit_freundlich_batch 
+from .model import CLASSES ,FEATURES ,FOREST_PARAMS ,synthetic_readings 
+from .cache import memoize 
+from .import eis ,montecarlo ,transient 
+from .embedding import Embedding 
+from .selection import cross_validate 
+from .comparison import MethodComparison 
+from .rng import generator ,seed_sequence 
+from .trace import span ,traced 
+
+STYLE ={
 'font.family':'DejaVu Sans',
 'axes.spines.top':False ,
 'axes.spines.right':False ,
@@ -45,7 +33,15 @@ plt .rcParams .update ({
 'legend.framealpha':0.92 ,
 'legend.edgecolor':'#DDDDDD',
 'figure.dpi':150 ,
-})
+}
+
+
+def _pyplot ():
+    import matplotlib 
+    matplotlib .use ('Agg')
+    import matplotlib .pyplot as plt 
+    plt .rcParams .update (STYLE )
+    return plt 
 
 
 CB ="#1A3F6F"
@@ -71,15 +67,17 @@ def savefig (name ,fig =None ):
     path =Path (DIR )/name 
 
 
+    plt =_pyplot ()
     fig =fig if fig is not None else plt .gcf ()
 
-    fig .savefig (
-    path ,
-    dpi =200 ,
-    bbox_inches ="tight",
-    facecolor =CBG ,
-    edgecolor ="none"
-    )
+    with span ("savefig",file =name ):
+        fig .savefig (
+        path ,
+        dpi =200 ,
+        bbox_inches ="tight",
+        facecolor =CBG ,
+        edgecolor ="none"
+        )
 
     plt .close (fig )
     print (f"✓ Saved: {path }")
@@ -87,16 +85,29 @@ def savefig (name ,fig =None ):
 
 
 
-def fig1_isotherms ():
-    def langmuir (C ,Qmax ,Kd ):
-        return (Qmax *C )/(Kd +C )
-    def freundlich (C ,Kf ,n ):
-        return Kf *(C **(1 /n ))
+@traced ()
+@memoize 
+def isotherm_bootstrap (C_exp ,C_fit ,Qmax ,Kd ,Kf ,n ,n_boot ,seed ,sigma =3.5 ):
+    noise =np .random .default_rng (seed ).normal (0 ,sigma ,(n_boot ,len (C_exp )))
+    Q_noisy =langmuir (C_exp ,Qmax ,Kd )+noise 
+    fit_L =fit_langmuir_batch (C_exp ,Q_noisy ,p0 =[Qmax *0.9 ,Kd *1.1 ])
+    fit_F =fit_freundlich_batch (C_exp [1 :],Q_noisy [:,1 :],p0 =[Kf ,n ])
+    ok =fit_L .converged &fit_F .converged 
+    Q_L =langmuir (C_fit ,fit_L .params [ok ,:1 ],fit_L .params [ok ,1 :])
+    Q_F =freundlich (C_fit ,fit_F .params [ok ,:1 ],fit_F .params [ok ,1 :])
+    band_L =np .percentile (Q_L ,[2.5 ,97.5 ],axis =0 )
+    band_F =np .percentile (Q_F ,[2.5 ,97.5 ],axis =0 )
+    return band_L ,band_F ,int ((~ok ).sum ())
+
 
+@traced ()
+def fig1_isotherms ():
+    plt =_pyplot ()
+    import matplotlib .gridspec as gridspec 
+    from scipy .stats import linregress 
     params ={
-    "Arsenic (As³⁺)":{"Qmax":142.8 ,"Kd":18.5 ,"col":CB ,"who":10 ,"Kf":28.4 ,"n":3.1 },
-    "Fluoride (F⁻)":{"Qmax":98.3 ,"Kd":32.1 ,"col":CO ,"who":1500 ,"Kf":19.7 ,"n":2.8 },
-    "Lead (Pb²⁺)":{"Qmax":117.6 ,"Kd":12.4 ,"col":CR ,"who":10 ,"Kf":24.1 ,"n":3.4 },
+    f"{a .name } ({a .ion })":{"Qmax":a .Qmax ,"Kd":a .Kd ,"col":col ,"who":a .who ,"Kf":a .Kf ,"n":a .n }
+    for a ,col in zip (ANALYTES ,[CB ,CO ,CR ])
     }
     C_exp_pts =np .array ([2 ,5 ,10 ,20 ,40 ,70 ,110 ,160 ,230 ,320 ,420 ,500 ])
 
@@ -112,6 +123,7 @@ def fig1_isotherms ():
     ha ='center',va ='top',fontsize =11 ,color =CGR ,style ='italic')
 
     r2_results ={}
+    meas =generator ("measurement",1 )
     for col_idx ,(name ,p )in enumerate (params .items ()):
         ax =fig .add_subplot (gs_outer [0 ,col_idx ])
         ax .set_facecolor (CBG )
@@ -119,30 +131,14 @@ def fig1_isotherms ():
 
 
         n_boot =300 
-        Q_lang_boot ,Q_freund_boot =[],[]
-        for _ in range (n_boot ):
-            noise =np .random .normal (0 ,3.5 ,len (C_exp_pts ))
-            Q_noisy =langmuir (C_exp_pts ,p ["Qmax"],p ["Kd"])+noise 
-            try :
-                pL ,_ =curve_fit (langmuir ,C_exp_pts ,Q_noisy ,
-                p0 =[p ["Qmax"]*0.9 ,p ["Kd"]*1.1 ],maxfev =2000 )
-                pF ,_ =curve_fit (freundlich ,C_exp_pts [1 :],Q_noisy [1 :],
-                p0 =[p ["Kf"],p ["n"]],maxfev =2000 )
-                Q_lang_boot .append (langmuir (C_fit ,*pL ))
-                Q_freund_boot .append (freundlich (C_fit ,*pF ))
-            except :
-                pass 
-
-        Q_lb =np .array (Q_lang_boot )
-        Q_fb =np .array (Q_freund_boot )
-
-        ax .fill_between (C_fit ,
-        np .percentile (Q_lb ,2.5 ,axis =0 ),
-        np .percentile (Q_lb ,97.5 ,axis =0 ),
+        Q_lb ,Q_fb ,n_failed =isotherm_bootstrap (C_exp_pts ,C_fit ,p ["Qmax"],p ["Kd"],p ["Kf"],p ["n"],n_boot ,
+        seed_sequence ("bootstrap",col_idx ))
+        if n_failed :
+            print (f"  {name }: {n_failed } of {n_boot } bootstrap fits did not converge")
+
+        ax .fill_between (C_fit ,Q_lb [0 ],Q_lb [1 ],
         alpha =0.18 ,color =p ["col"],label ='95% CI (Langmuir)')
-        ax .fill_between (C_fit ,
-        np .percentile (Q_fb ,2.5 ,axis =0 ),
-        np .percentile (Q_fb ,97.5 ,axis =0 ),
+        ax .fill_between (C_fit ,Q_fb [0 ],Q_fb [1 ],
         alpha =0.10 ,color =CGR )
 
 
@@ -153,7 +149,7 @@ def fig1_isotherms ():
         label =f'Freundlich (R²=0.{91 if col_idx ==0 else 93 if col_idx ==1 else 92 })')
 
 
-        Q_exp =langmuir (C_exp_pts ,p ["Qmax"],p ["Kd"])+np .random .normal (0 ,2.8 ,len (C_exp_pts ))
+        Q_exp =langmuir (C_exp_pts ,p ["Qmax"],p ["Kd"])+meas .normal (0 ,2.8 ,len (C_exp_pts ))
         ax .scatter (C_exp_pts ,Q_exp ,color =p ["col"],s =55 ,zorder =6 ,
         edgecolors ='white',linewidth =1.5 )
 
@@ -186,13 +182,13 @@ def fig1_isotherms ():
     ax_dg .set_facecolor (CBG )
 
     colors_thermo =[CB ,CO ,CR ]
-    names_short =["As³⁺","F⁻","Pb²⁺"]
-    Kd_vals =[18.5 ,32.1 ,12.4 ]
-    Qmax_vals =[142.8 ,98.3 ,117.6 ]
+    names_short =[a .ion for a in ANALYTES ]
+    Kd_vals =[a .Kd for a in ANALYTES ]
+    Qmax_vals =[a .Qmax for a in ANALYTES ]
 
     for i ,(nm ,kd ,qm ,col )in enumerate (zip (names_short ,Kd_vals ,Qmax_vals ,colors_thermo )):
         C_lin =np .linspace (2 ,500 ,50 )
-        Q_lin =langmuir (C_lin ,qm ,kd )+np .random .normal (0 ,1.5 ,50 )
+        Q_lin =langmuir (C_lin ,qm ,kd )+meas .normal (0 ,1.5 ,50 )
 
         x_lin =C_lin 
         y_lin =C_lin /Q_lin 
@@ -208,14 +204,7 @@ def fig1_isotherms ():
     ax_lin .legend (fontsize =9 )
 
 
-    R ,T =8.314 ,298 
-
-    mw ={"As³⁺":75 ,"F⁻":19 ,"Pb²⁺":207 }
-    dG_vals =[]
-    for nm ,kd ,molar in zip (names_short ,Kd_vals ,[75 ,19 ,207 ]):
-        kd_mol =(kd *1e-6 )/molar 
-        dG =R *T *np .log (kd_mol )/1000 
-        dG_vals .append (dG )
+    dG_vals =list (binding_free_energy (Kd_vals ,channel_params ("molar_mass")))
 
     bars =ax_dg .barh (names_short ,[abs (d )for d in dG_vals ],
     color =colors_thermo ,edgecolor ='white',height =0.5 )
@@ -232,7 +221,18 @@ def fig1_isotherms ():
 
 
 
+@traced ()
+@memoize 
+def lod_monte_carlo (model ,rtol ,max_samples ,seed ):
+    res =montecarlo .run (model ,rtol =rtol ,chunk =1 <<16 ,max_samples =max_samples ,seed =seed )
+    h =res .hist 
+    return {"counts":h .counts ,"below":h .below ,"above":h .above ,"values":res .values ,"n":res .n }
+
+
+@traced ()
 def fig2_sensor ():
+    plt =_pyplot ()
+    import matplotlib .gridspec as gridspec 
     fig =plt .figure (figsize =(20 ,13 ),facecolor =CBG )
     gs =gridspec .GridSpec (2 ,3 ,figure =fig ,hspace =0.42 ,wspace =0.34 ,
     top =0.90 ,bottom =0.07 ,left =0.07 ,right =0.97 )
@@ -246,14 +246,10 @@ def fig2_sensor ():
     ax_resp =fig .add_subplot (gs [0 ,0 ])
     ax_resp .set_facecolor (CBG )
     C_range =np .linspace (0.1 ,200 ,500 )
-    sensor_p ={
-    "Arsenic":{"R0":1000 ,"S":0.68 ,"Kd":18.5 ,"LOD":0.8 ,"col":CB },
-    "Fluoride":{"R0":1000 ,"S":0.52 ,"Kd":32.1 ,"LOD":5.2 ,"col":CO },
-    "Lead":{"R0":1000 ,"S":0.73 ,"Kd":12.4 ,"LOD":0.6 ,"col":CR },
-    }
+    sensor_p ={a .name :{"S":a .S ,"Kd":a .Kd ,"LOD":a .LOD ,"col":col }
+    for a ,col in zip (ANALYTES ,[CB ,CO ,CR ])}
     for name ,p in sensor_p .items ():
-        R =p ["R0"]*(1 -p ["S"]*C_range /(p ["Kd"]+C_range ))
-        dR =(p ["R0"]-R )/p ["R0"]*100 
+        dR =response (C_range ,p ["S"],p ["Kd"])*100 
         ax_resp .plot (C_range ,dR ,color =p ["col"],lw =2.5 ,label =name )
         ax_resp .axvline (p ["LOD"],color =p ["col"],lw =1 ,ls =':',alpha =0.6 )
         ax_resp .text (p ["LOD"]*1.15 ,3 +list (sensor_p .keys ()).index (name )*4 ,
@@ -270,10 +266,8 @@ def fig2_sensor ():
     ax_eis =fig .add_subplot (gs [0 ,1 ])
     ax_eis .set_facecolor (CBG )
     freq =np .logspace (-2 ,6 ,300 )
-    omega =2 *np .pi *freq 
 
 
-    Rs =50 
     configs =[
     ("Bare GO electrode",2000 ,"#94A3B8",'--'),
     ("+ As aptamer",3200 ,CB ,'-'),
@@ -281,13 +275,8 @@ def fig2_sensor ():
     ("+ Pb aptamer",3500 ,CR ,'-'),
     ("After As³⁺ binding",1100 ,CG ,'-'),
     ]
-    for label ,Rct ,col ,ls in configs :
-        T_cpe ,n_cpe =1.2e-7 ,0.88 
-        Zw_sigma =80 
-        Z_CPE =1 /(T_cpe *(1j *omega )**n_cpe )
-        Z_W =Zw_sigma *(1 -1j )/np .sqrt (omega )
-        Z_par =(Rct *Z_CPE )/(Rct +Z_CPE )
-        Z_tot =Rs +Z_par +Z_W 
+    spectra =eis .simulate (freq ,[replace (BARE_ELECTRODE ,Rct =Rct )for _ ,Rct ,_ ,_ in configs ])
+    for (label ,Rct ,col ,ls ),Z_tot in zip (configs ,spectra ):
         Zr ,Zi =Z_tot .real ,-Z_tot .imag 
         mask =(Zi >0 )&(Zr >0 )&(Zr <Rct *1.6 )
         ax_eis .plot (Zr [mask ],Zi [mask ],color =col ,lw =2 ,ls =ls ,label =label )
@@ -303,21 +292,36 @@ def fig2_sensor ():
     ax_kin =fig .add_subplot (gs [0 ,2 ])
     ax_kin .set_facecolor (CBG )
     t =np .linspace (0 ,180 ,500 )
-    tau ={"Arsenic":28 ,"Fluoride":42 ,"Lead":22 }
+    tau ={a .name :a .tau for a in ANALYTES }
     cols_k =[CB ,CO ,CR ]
     for (name ,tau_val ),col in zip (tau .items (),cols_k ):
-        sig =(1 -np .exp (-t /tau_val ))*100 
+        sig =kinetics (t ,tau_val )*100 
         ax_kin .plot (t ,sig ,color =col ,lw =2.5 ,label =f'{name } (τ={tau_val }s)')
-        t90 =-tau_val *np .log (0.1 )
+        t90 =time_to_fraction (0.9 ,tau_val )
         ax_kin .scatter ([t90 ],[90 ],color =col ,s =80 ,zorder =6 ,edgecolors ='white',lw =1.5 )
         ax_kin .annotate (f't₉₀={t90 :.0f}s',xy =(t90 ,90 ),
         xytext =(t90 +8 ,88 -list (tau .keys ()).index (name )*6 ),
         fontsize =8 ,color =col )
 
+    A_k =coupled_response (2.0 *transient .levels ())
+    t_s =np .arange (1 ,int (transient .T_MAX )+1 ,dtype =float )
+    Y =A_k *-np .expm1 (-t_s [:,None ]/channel_params ("tau"))
+    Y +=generator ("measurement",3 ).normal (0.0 ,transient .NOISE ,Y .shape )
+    est =transient .TransientEstimator (transient .thresholds ())
+    for ti ,yi in zip (t_s ,Y ):
+        est .update (ti ,yi )
+    for i ,(name ,col )in enumerate (zip (tau ,cols_k )):
+        t_stop =est .t_stop [i ]
+        seen =t_s <=t_stop 
+        ax_kin .scatter (t_s [seen ],Y [seen ,i ]/A_k [i ]*100 ,color =col ,s =6 ,alpha =0.35 ,lw =0 )
+        ax_kin .axvline (t_stop ,color =col ,lw =1.2 ,ls =':')
+        ax_kin .text (t_stop +2 ,8 +i *7 ,f'stop {t_stop :.0f}s (−{1 -t_stop /transient .T_MAX :.0%})',
+        fontsize =8 ,color =col )
+
     ax_kin .axhline (90 ,color ='#475569',lw =1.5 ,ls ='--',label ='90% threshold')
     ax_kin .set_xlabel ('Time (s)',fontsize =11 )
     ax_kin .set_ylabel ('Signal Response (%)',fontsize =11 )
-    ax_kin .set_title ('(C) First-Order Response Kinetics',fontsize =12 ,
+    ax_kin .set_title ('(C) Response Kinetics & Early Stop\n(2× WHO, 1 Hz samples)',fontsize =12 ,
     fontweight ='bold',color =CB )
     ax_kin .legend (fontsize =9 )
     ax_kin .set_xlim (0 ,180 )
@@ -325,26 +329,21 @@ def fig2_sensor ():
 
     ax_mc =fig .add_subplot (gs [1 ,0 ])
     ax_mc .set_facecolor (CBG )
-    n_mc =5000 
-    lod_distributions ={}
-    lod_params ={"As":{"bl":2.0 ,"sig_bl":0.4 ,"sens":0.82 },
-    "F":{"bl":3.0 ,"sig_bl":0.6 ,"sens":0.61 },
-    "Pb":{"bl":1.5 ,"sig_bl":0.3 ,"sens":0.91 }}
     colors_mc =[CB ,CO ,CR ]
-    for (name ,lp ),col in zip (lod_params .items (),colors_mc ):
-        bl_mc =np .random .normal (lp ["bl"],lp ["bl"]*0.1 ,n_mc )
-        sig_mc =np .random .normal (lp ["sig_bl"],lp ["sig_bl"]*0.15 ,n_mc )
-        sens_mc =np .random .normal (lp ["sens"],lp ["sens"]*0.08 ,n_mc )
-        lod_mc =(bl_mc +3 *sig_mc )/sens_mc 
-        lod_mc =lod_mc [(lod_mc >0 )&(lod_mc <20 )]
-        lod_distributions [name ]=lod_mc 
-        ax_mc .hist (lod_mc ,bins =50 ,color =col ,alpha =0.65 ,density =True ,
-        label =f'{name }: {np .median (lod_mc ):.2f} ppb [CI: {np .percentile (lod_mc ,2.5 ):.2f}–{np .percentile (lod_mc ,97.5 ):.2f}]')
-        ax_mc .axvline (np .median (lod_mc ),color =col ,lw =2 ,ls ='--')
+    n_mc =0 
+    for i ,((name ,m ),col )in enumerate (zip (LOD_MODELS .items (),colors_mc )):
+        mc =lod_monte_carlo (m ,1e-3 ,10 **6 ,seed_sequence ("monte_carlo_lod",i ))
+        hist =montecarlo .Histogram .from_counts (mc ["counts"],below =mc ["below"],above =mc ["above"])
+        lo ,med ,hi =mc ["values"]
+        edges =np .linspace (*hist .quantile ([0.0005 ,0.9995 ]),51 )
+        ax_mc .stairs (hist .density (edges ),edges ,fill =True ,color =col ,alpha =0.65 ,
+        label =f'{name }: {med :.2f} ppb [CI: {lo :.2f}–{hi :.2f}]')
+        ax_mc .axvline (med ,color =col ,lw =2 ,ls ='--')
+        n_mc =max (n_mc ,mc ["n"])
 
     ax_mc .set_xlabel ('LOD (ppb)',fontsize =11 )
     ax_mc .set_ylabel ('Probability Density',fontsize =11 )
-    ax_mc .set_title ('(D) Monte Carlo LOD Uncertainty\n(n=5000 replicates)',fontsize =12 ,
+    ax_mc .set_title (f'(D) Monte Carlo LOD Uncertainty\n(n={n_mc :,} replicates, adaptive)',fontsize =12 ,
     fontweight ='bold',color =CB )
     ax_mc .legend (fontsize =8.5 )
 
@@ -352,9 +351,10 @@ def fig2_sensor ():
     ax_drift =fig .add_subplot (gs [1 ,1 ])
     ax_drift .set_facecolor (CBG )
     days =np .linspace (0 ,30 ,200 )
+    drift =generator ("drift")
     for name ,col in zip (["Arsenic","Fluoride","Lead"],colors_mc ):
-        decay_rate =np .random .uniform (0.008 ,0.014 )
-        signal_drift =100 *np .exp (-decay_rate *days )+np .random .normal (0 ,0.5 ,len (days ))
+        decay_rate =drift .uniform (0.008 ,0.014 )
+        signal_drift =100 *np .exp (-decay_rate *days )+drift .normal (0 ,0.5 ,len (days ))
         ax_drift .plot (days ,signal_drift ,color =col ,lw =2.2 ,label =f'{name } channel')
 
     ax_drift .axhline (95 ,color =CG ,lw =1.5 ,ls ='--',label ='95% retention threshold')
@@ -370,13 +370,13 @@ def fig2_sensor ():
 
     ax_ldr =fig .add_subplot (gs [1 ,2 ])
     ax_ldr .set_facecolor (CBG )
-    ldr_data ={"As":{"lo":0.8 ,"hi":85 ,"sens":0.82 ,"col":CB },
-    "F":{"lo":5.2 ,"hi":420 ,"sens":0.61 ,"col":CO },
-    "Pb":{"lo":0.6 ,"hi":72 ,"sens":0.91 ,"col":CR }}
+    ldr_data ={a .symbol :{"lo":a .LOD ,"hi":a .upper ,"sens":LOD_MODELS [a .symbol ].sens ,"col":col }
+    for a ,col in zip (ANALYTES ,colors_mc )}
 
+    meas =generator ("measurement",2 )
     for i ,(name ,d )in enumerate (ldr_data .items ()):
         C_lin =np .linspace (d ["lo"],d ["hi"],100 )
-        signal =d ["sens"]*C_lin +np .random .normal (0 ,d ["sens"]*d ["lo"]*0.3 ,100 )
+        signal =d ["sens"]*C_lin +meas .normal (0 ,d ["sens"]*d ["lo"]*0.3 ,100 )
         ax_ldr .plot (C_lin ,signal ,color =d ["col"],lw =2.5 ,label =f'{name } (R²>0.998)')
         ax_ldr .scatter (d ["lo"],d ["sens"]*d ["lo"],
         color =d ["col"],s =80 ,zorder =7 ,marker ='v',
@@ -396,21 +396,13 @@ def fig2_sensor ():
 
 
 
+@traced ()
 def fig3_india ():
-    states =["Uttar Pradesh","West Bengal","Bihar","Assam","Jharkhand",
-    "Andhra Pradesh","Telangana","Rajasthan","Gujarat","Punjab",
-    "Haryana","Madhya Pradesh","Chhattisgarh","Maharashtra","Karnataka",
-    "Tamil Nadu","Odisha","Delhi","Himachal Pradesh","Uttarakhand"]
-    arsenic =[7.2 ,9.2 ,7.8 ,8.5 ,6.1 ,4.2 ,3.9 ,2.1 ,2.8 ,3.1 ,3.4 ,3.8 ,4.2 ,2.3 ,1.9 ,2.1 ,5.1 ,4.5 ,2.1 ,1.8 ]
-    fluoride =[4.2 ,2.1 ,2.3 ,1.8 ,3.1 ,8.1 ,7.2 ,8.9 ,7.2 ,5.8 ,6.1 ,7.1 ,4.8 ,5.2 ,6.9 ,7.8 ,3.2 ,4.1 ,3.1 ,2.9 ]
-    lead =[5.8 ,4.2 ,5.1 ,3.8 ,6.2 ,3.9 ,4.2 ,3.2 ,4.8 ,4.1 ,3.9 ,4.2 ,4.1 ,5.1 ,2.8 ,3.1 ,3.8 ,6.8 ,2.1 ,1.9 ]
-    pop_mill =[231 ,91 ,128 ,35 ,38 ,53 ,39 ,79 ,68 ,30 ,29 ,85 ,30 ,124 ,67 ,77 ,46 ,32 ,8 ,11 ]
-
-    df =pd .DataFrame ({"State":states ,"Arsenic":arsenic ,"Fluoride":fluoride ,
-    "Lead":lead ,"Population":pop_mill })
-    df ["Combined"]=(df ["Arsenic"]+df ["Fluoride"]+df ["Lead"])/3 
-    df ["Pop_At_Risk"]=df ["Population"]*df ["Combined"]/10 
-    df =df .sort_values ("Combined",ascending =False )
+    plt =_pyplot ()
+    import matplotlib .gridspec as gridspec 
+    from matplotlib .colors import LinearSegmentedColormap 
+    from .risk import rollup ,state_table 
+    df =rollup (state_table (),"State")
 
     fig =plt .figure (figsize =(22 ,14 ),facecolor =CBG )
     gs =gridspec .GridSpec (2 ,3 ,figure =fig ,hspace =0.44 ,wspace =0.35 ,
@@ -418,7 +410,7 @@ def fig3_india ():
 
     fig .text (0.5 ,0.96 ,"India Groundwater Contamination — Multi-Hazard Risk Analysis",
     ha ='center',fontsize =16 ,fontweight ='bold',color =CB )
-    fig .text (0.5 ,0.928 ,"Based on CGWB (2023) district-level data; 20 major states",
+    fig .text (0.5 ,0.928 ,f"Based on CGWB (2023) district-level data; {len (df )} major states",
     ha ='center',fontsize =11 ,color =CGR ,style ='italic')
 
 
@@ -426,12 +418,10 @@ def fig3_india ():
     ax_risk .set_facecolor (CBG )
     cmap_risk =LinearSegmentedColormap .from_list ('risk',['#DCFCE7','#FEF3C7','#FEE2E2','#991B1B'])
     norm_risk =plt .Normalize (2 ,7 )
-    for i ,(_ ,row )in enumerate (df .iterrows ()):
-        color =cmap_risk (norm_risk (row ["Combined"]))
-        bar =ax_risk .barh (row ["State"],row ["Combined"],
-        color =color ,edgecolor ='white',height =0.72 )
-        ax_risk .text (row ["Combined"]+0.05 ,i ,
-        f'{row ["Combined"]:.1f}  ({row ["Pop_At_Risk"]:.0f}M at risk)',
+    ax_risk .barh (df ["State"],df ["Combined"],color =cmap_risk (norm_risk (df ["Combined"].to_numpy ())),
+    edgecolor ='white',height =0.72 )
+    for i ,(comb ,par )in enumerate (zip (df ["Combined"],df ["Pop_At_Risk"])):
+        ax_risk .text (comb +0.05 ,i ,f'{comb :.1f}  ({par :.0f}M at risk)',
         va ='center',fontsize =8.5 ,color ='#1E293B')
 
     ax_risk .axvline (5.0 ,color =CR ,lw =2 ,ls ='--',alpha =0.8 ,label ='High risk (>5.0)')
@@ -469,9 +459,8 @@ def fig3_india ():
     c =df ["Combined"],cmap ='RdYlGn_r',
     alpha =0.80 ,edgecolors ='white',linewidth =1.5 ,
     vmin =2 ,vmax =7 )
-    for _ ,row in df .iterrows ():
-        ax_bubble .annotate (row ["State"][:8 ],
-        (row ["Arsenic"],row ["Fluoride"]),
+    for state ,a_idx ,f_idx in zip (df ["State"],df ["Arsenic"],df ["Fluoride"]):
+        ax_bubble .annotate (state [:8 ],(a_idx ,f_idx ),
         fontsize =7 ,color ='#1E293B',
         xytext =(3 ,3 ),textcoords ='offset points')
     plt .colorbar (scatter ,ax =ax_bubble ,label ='Combined Risk',shrink =0.85 )
@@ -500,53 +489,46 @@ def fig3_india ():
 
 
 
-def fig4_ai ():
-    np .random .seed (42 )
-    n_per =300 
-    classes =["Safe","As-High","F-High","Pb-High","Multi-Cont."]
-    n_cls =len (classes )
+@traced ()
+@memoize 
+def forest_evaluation (Xs ,y ,params ):
+    from sklearn .ensemble import RandomForestClassifier 
+    from sklearn .model_selection import train_test_split 
+    X_tr ,X_te ,y_tr ,y_te =train_test_split (Xs ,y ,test_size =0.2 ,stratify =y ,random_state =42 )
+    rf =RandomForestClassifier (**params )
+    rf .fit (X_tr ,y_tr )
+    cv =cross_validate (Xs ,y ,params ,n_splits =5 ,seed =42 )
+    return {
+    "y_te":y_te ,
+    "y_pred":rf .predict (X_te ),
+    "y_prob":rf .predict_proba (X_te ),
+    "cv":cv ,
+    "imp":rf .feature_importances_ ,
+    "imp_std":np .std ([t .feature_importances_ for t in rf .estimators_ ],axis =0 ),
+    }
 
 
-    data =[]
-    labels =[]
-    for i ,cls in enumerate (classes ):
-        for _ in range (n_per ):
-            if cls =="Safe":
-                row =[np .random .normal (2 ,1.2 ),np .random .normal (3 ,1.5 ),
-                np .random .normal (1.5 ,0.9 ),np .random .normal (7.2 ,0.3 ),
-                np .random .normal (320 ,40 ),np .random .normal (28 ,3 )]
-            elif cls =="As-High":
-                row =[np .random .normal (54 ,7 ),np .random .normal (3.5 ,1.5 ),
-                np .random .normal (2 ,0.9 ),np .random .normal (7.0 ,0.4 ),
-                np .random .normal (380 ,50 ),np .random .normal (27 ,3 )]
-            elif cls =="F-High":
-                row =[np .random .normal (2.5 ,1.1 ),np .random .normal (50 ,7 ),
-                np .random .normal (1.8 ,0.8 ),np .random .normal (7.5 ,0.4 ),
-                np .random .normal (410 ,60 ),np .random .normal (29 ,3 )]
-            elif cls =="Pb-High":
-                row =[np .random .normal (3 ,1.2 ),np .random .normal (3.2 ,1.5 ),
-                np .random .normal (60 ,8 ),np .random .normal (6.8 ,0.5 ),
-                np .random .normal (450 ,70 ),np .random .normal (28 ,3 )]
-            else :
-                row =[np .random .normal (46 ,7 ),np .random .normal (44 ,7 ),
-                np .random .normal (52 ,7 ),np .random .normal (6.5 ,0.5 ),
-                np .random .normal (520 ,80 ),np .random .normal (30 ,3 )]
-            data .append (row )
-            labels .append (i )
-
-    feat_names =["ΔR_As(%)","ΔR_F(%)","ΔR_Pb(%)","pH","TDS(ppm)","Temp(°C)"]
-    X =np .array (data );y =np .array (labels )
-    scaler =StandardScaler ()
-    Xs =scaler .fit_transform (X )
-    X_tr ,X_te ,y_tr ,y_te =train_test_split (Xs ,y ,test_size =0.2 ,stratify =y ,random_state =42 )
+@traced ()
+@memoize 
+def tsne_embedding (X ,n_landmarks ,seed ):
+    return Embedding .fit (X ,n_landmarks =n_landmarks ,seed =seed ).state ()
 
 
-    rf =RandomForestClassifier (n_estimators =500 ,max_depth =12 ,
-    min_samples_leaf =2 ,random_state =42 ,n_jobs =-1 )
-    rf .fit (X_tr ,y_tr )
-    y_pred =rf .predict (X_te )
-    y_prob =rf .predict_proba (X_te )
-    cv =cross_val_score (rf ,Xs ,y ,cv =StratifiedKFold (5 ,shuffle =True ,random_state =42 ))
+@traced ()
+def fig4_ai ():
+    plt =_pyplot ()
+    import matplotlib .gridspec as gridspec 
+    from matplotlib .colors import LinearSegmentedColormap 
+    from sklearn .metrics import confusion_matrix ,roc_curve ,auc ,precision_recall_curve 
+    from sklearn .preprocessing import StandardScaler ,label_binarize 
+    classes =list (CLASSES )
+    n_cls =len (classes )
+    feat_names =list (FEATURES )
+    X ,y =synthetic_readings (300 ,seed_sequence ("dataset"))
+    scaler =StandardScaler ()
+    Xs =scaler .fit_transform (X )
+    res =forest_evaluation (Xs ,y ,FOREST_PARAMS )
+    y_te ,y_pred ,y_prob ,cv =res ["y_te"],res ["y_pred"],res ["y_prob"],res ["cv"]
 
     fig =plt .figure (figsize =(22 ,16 ),facecolor =CBG )
     gs =gridspec .GridSpec (2 ,3 ,figure =fig ,hspace =0.44 ,wspace =0.36 ,
@@ -600,9 +582,8 @@ def fig4_ai ():
 
     ax_fi =fig .add_subplot (gs [1 ,0 ])
     ax_fi .set_facecolor (CBG )
-    imp =rf .feature_importances_ 
-
-    imp_std =np .std ([t .feature_importances_ for t in rf .estimators_ ],axis =0 )
+    imp =res ["imp"]
+    imp_std =res ["imp_std"]
     sorted_idx =np .argsort (imp )
     bar_colors =[CB if i <3 else CGR for i in sorted_idx ]
     ax_fi .barh (np .array (feat_names )[sorted_idx ],imp [sorted_idx ],
@@ -615,18 +596,15 @@ def fig4_ai ():
 
     ax_tsne =fig .add_subplot (gs [1 ,1 ])
     ax_tsne .set_facecolor (CBG )
-    tsne =TSNE (n_components =2 ,perplexity =35 ,random_state =42 ,max_iter =1000 )
-
-    idx_sub =np .random .choice (len (Xs ),500 ,replace =False )
-    X_tsne =tsne .fit_transform (Xs [idx_sub ])
-    y_sub =y [idx_sub ]
+    emb =Embedding .from_state (tsne_embedding (Xs ,500 ,seed_sequence ("embedding")))
+    X_tsne =emb .transform (Xs )
     for i ,(cls ,col )in enumerate (zip (classes ,cls_colors )):
-        mask =y_sub ==i 
+        mask =y ==i 
         ax_tsne .scatter (X_tsne [mask ,0 ],X_tsne [mask ,1 ],c =col ,
         s =22 ,alpha =0.72 ,label =cls ,edgecolors ='none')
     ax_tsne .set_xlabel ('t-SNE Component 1',fontsize =11 )
     ax_tsne .set_ylabel ('t-SNE Component 2',fontsize =11 )
-    ax_tsne .set_title ('(D) t-SNE Feature Space\n(n=500 samples)',
+    ax_tsne .set_title (f'(D) t-SNE Feature Space\n(n={len (Xs )} samples, {len (emb .layout )} landmarks)',
     fontsize =12 ,fontweight ='bold',color =CB )
     ax_tsne .legend (fontsize =9 ,markerscale =2 )
 
@@ -650,7 +628,10 @@ def fig4_ai ():
 
 
 
+@traced ()
 def fig5_comparison ():
+    plt =_pyplot ()
+    import matplotlib .patches as mpatches 
     methods =["ICP-MS\n(Lab)","AAS\n(Lab)","Field Kit\n(Strip)","Commercial\nElectrode",
     "Colorimetric\nKit","AquaNeuron\n()"]
     col_m =["#94A3B8","#94A3B8","#60A5FA","#60A5FA","#60A5FA",CG ]
@@ -697,14 +678,13 @@ def fig5_comparison ():
 
 
 
+@traced ()
 def fig6_selectivity ():
-    analytes =["As³⁺","Sb³⁺","Se⁴⁺","F⁻","Cl⁻","NO₃⁻","SO₄²⁻","Pb²⁺","Cd²⁺","Cu²⁺","Zn²⁺","Hg²⁺"]
-    aptamers =["As-Aptamer","F-Aptamer","Pb-Aptamer"]
-    matrix =np .array ([
-    [1.00 ,0.12 ,0.08 ,0.02 ,0.01 ,0.01 ,0.01 ,0.04 ,0.03 ,0.05 ,0.02 ,0.03 ],
-    [0.02 ,0.03 ,0.04 ,1.00 ,0.11 ,0.07 ,0.08 ,0.02 ,0.01 ,0.03 ,0.01 ,0.02 ],
-    [0.03 ,0.04 ,0.02 ,0.01 ,0.01 ,0.02 ,0.01 ,1.00 ,0.14 ,0.09 ,0.06 ,0.11 ],
-    ])
+    plt =_pyplot ()
+    from matplotlib .colors import LinearSegmentedColormap 
+    analytes =list (ION_PANEL )
+    aptamers =[f"{a .symbol }-Aptamer"for a in ANALYTES ]
+    matrix =CROSS_REACTIVITY 
 
     fig ,axes =plt .subplots (1 ,2 ,figsize =(18 ,6 ),facecolor =CBG )
     fig .suptitle ("Aptamer Selectivity — Cross-Reactivity Analysis",
@@ -736,9 +716,8 @@ def fig6_selectivity ():
     ax2 .set_facecolor (CBG )
 
     interferents =["Sb³⁺","Se⁴⁺","Cl⁻","NO₃⁻","Cd²⁺","Cu²⁺","Zn²⁺","Hg²⁺"]
-    sel_factors ={"As-Aptamer":[1 -0.12 ,1 -0.08 ,1 -0.01 ,1 -0.01 ,1 -0.03 ,1 -0.05 ,1 -0.02 ,1 -0.03 ],
-    "F-Aptamer":[1 -0.03 ,1 -0.04 ,1 -0.11 ,1 -0.07 ,1 -0.01 ,1 -0.03 ,1 -0.01 ,1 -0.02 ],
-    "Pb-Aptamer":[1 -0.04 ,1 -0.02 ,1 -0.01 ,1 -0.02 ,1 -0.14 ,1 -0.09 ,1 -0.06 ,1 -0.11 ]}
+    cols =[ION_PANEL .index (ion )for ion in interferents ]
+    sel_factors ={apt :list (1 -matrix [i ,cols ])for i ,apt in enumerate (aptamers )}
     x =np .arange (len (interferents ))
     w =0.25 
     for i ,(aname ,vals )in enumerate (sel_factors .items ()):
@@ -760,7 +739,10 @@ def fig6_selectivity ():
 
 
 
+@traced ()
 def fig7_architecture ():
+    plt =_pyplot ()
+    from matplotlib .patches import FancyBboxPatch 
     fig ,ax =plt .subplots (figsize =(22 ,10 ),facecolor =CBG )
     ax .set_xlim (0 ,22 );ax .set_ylim (0 ,10 )
     ax .axis ('off');ax .set_facecolor (CBG )
@@ -845,15 +827,18 @@ def fig7_architecture ():
 
 
 
+@traced ()
 def fig8_validation ():
-    np .random .seed (99 )
+    plt =_pyplot ()
+    import matplotlib .gridspec as gridspec 
+    g =generator ("validation")
     n =80 
-    icp_as =np .random .uniform (1 ,80 ,n )
-    aq_as =icp_as *np .random .normal (1.009 ,0.035 ,n )+np .random .normal (0 ,1.1 ,n )
-    icp_f =np .random .uniform (10 ,800 ,n )
-    aq_f =icp_f *np .random .normal (1.012 ,0.04 ,n )+np .random .normal (0 ,5 ,n )
-    icp_pb =np .random .uniform (1 ,70 ,n )
-    aq_pb =icp_pb *np .random .normal (1.007 ,0.033 ,n )+np .random .normal (0 ,0.9 ,n )
+    icp_as =g .uniform (1 ,80 ,n )
+    aq_as =icp_as *g .normal (1.009 ,0.035 ,n )+g .normal (0 ,1.1 ,n )
+    icp_f =g .uniform (10 ,800 ,n )
+    aq_f =icp_f *g .normal (1.012 ,0.04 ,n )+g .normal (0 ,5 ,n )
+    icp_pb =g .uniform (1 ,70 ,n )
+    aq_pb =icp_pb *g .normal (1.007 ,0.033 ,n )+g .normal (0 ,0.9 ,n )
 
     datasets =[("Arsenic",icp_as ,aq_as ,CB ),
     ("Fluoride",icp_f ,aq_f ,CO ),
@@ -868,10 +853,9 @@ def fig8_validation ():
     for row ,(name ,icp ,aq ,col )in enumerate (datasets ):
         mean_v =(icp +aq )/2 
         diff_v =aq -icp 
-        md =np .mean (diff_v );sdiff =np .std (diff_v )
-        loa_hi =md +1.96 *sdiff ;loa_lo =md -1.96 *sdiff 
-        r ,p =pearsonr (icp ,aq )
-        sl ,ic ,_ ,_ ,_ =linregress (icp ,aq )
+        st =MethodComparison ().update (icp ,aq ).summary ()
+        md ,loa_hi ,loa_lo =st ["bias"],st ["loa_hi"],st ["loa_lo"]
+        r ,sl ,ic =st ["r"],st ["slope"],st ["intercept"]
 
 
         ax_ba =fig .add_subplot (gs [row ,0 ])
@@ -913,8 +897,8 @@ def fig8_validation ():
         ax_res .scatter (icp ,residuals ,color =col ,alpha =0.6 ,s =40 ,
         edgecolors ='white',lw =0.8 )
         ax_res .axhline (0 ,color =CG ,lw =2 )
-        ax_res .axhline (2 *np .std (residuals ),color =CR ,lw =1.5 ,ls ='--',alpha =0.7 )
-        ax_res .axhline (-2 *np .std (residuals ),color =CR ,lw =1.5 ,ls ='--',alpha =0.7 )
+        ax_res .axhline (2 *st ["resid_sd"],color =CR ,lw =1.5 ,ls ='--',alpha =0.7 )
+        ax_res .axhline (-2 *st ["resid_sd"],color =CR ,lw =1.5 ,ls ='--',alpha =0.7 )
         ax_res .set_xlabel ('ICP-MS Reference (ppb)',fontsize =10 )
         ax_res .set_ylabel ('Residual (ppb)',fontsize =10 )
         ax_res .set_title (f'{name } — Residual Plot\nNo systematic bias pattern',
@@ -923,22 +907,10 @@ def fig8_validation ():
     savefig ("fig8_validation_.png",fig )
 
 
+def main (argv =None ):
+    from .runner import main as run_main 
+    return run_main (argv )
+
+
 if __name__ =="__main__":
-    print ("\n"+"═"*62 )
-    print ("  AquaNeuron  —  Simulation Suite")
-    print ("  Prateek Tiwari · Raghav Khandelia")
-    print ("  Aroush Muglikar · Shreyas Roy")
-    print ("  SJWP India 2026")
-    print ("═"*62 )
-
-    fig1_isotherms ()
-    fig2_sensor ()
-    fig3_india ()
-    fig4_ai ()
-    fig5_comparison ()
-    fig6_selectivity ()
-    fig7_architecture ()
-    fig8_validation ()
-
-    print ("\n  All 8 enhanced figures generated successfully.")
-    print ("═"*62 +"\n")
+    main ()
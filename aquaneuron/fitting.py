@@ -0,0 +1,132 @@
+"""
+AquaNeuron  —  Batched Least-Squares Fitting
+Stacked Levenberg-Marquardt solves over (replicates × points) arrays.
+"""
+
+from collections import namedtuple 
+import numpy as np 
+from .trace import traced 
+
+
+IsothermFit =namedtuple ("IsothermFit",["params","cost","r2","converged","n_iter","n_failed"])
+
+
+@traced ()
+def levenberg_marquardt_batch (model ,jac ,x ,y ,p0 ,max_iter =100 ,xtol =1e-8 ,ftol =1e-10 ,lam0 =1e-3 ):
+    y =np .atleast_2d (np .asarray (y ,dtype =float ))
+    p =np .array (p0 ,dtype =float ,copy =True )
+    if p .ndim ==1 :
+        p =np .broadcast_to (p ,(y .shape [0 ],p .shape [0 ])).copy ()
+    n_rep ,k =p .shape 
+    x =np .asarray (x ,dtype =float )
+
+    def rows (a ,idx ):
+        return a if a .ndim ==1 else a [idx ]
+
+    r =y -model (x ,p )
+    cost =np .einsum ('rm,rm->r',r ,r )
+    lam =np .full (n_rep ,lam0 )
+    converged =np .zeros (n_rep ,dtype =bool )
+    failed =~np .isfinite (cost )|~np .isfinite (p ).all (axis =1 )
+    n_iter =np .zeros (n_rep ,dtype =int )
+    eye =np .eye (k )
+
+    for _ in range (max_iter ):
+        act =np .flatnonzero (~converged &~failed )
+        if act .size ==0 :
+            break 
+        xa ,pa ,ra =rows (x ,act ),p [act ],r [act ]
+        J =jac (xa ,pa )
+        JtJ =np .einsum ('rmk,rml->rkl',J ,J )
+        g =np .einsum ('rmk,rm->rk',J ,ra )
+        d =np .einsum ('rkk->rk',JtJ )
+        d =np .maximum (d ,1e-12 *d .max (axis =1 ,keepdims =True )+1e-300 )
+        A =JtJ +lam [act ,None ,None ]*d [:,:,None ]*eye 
+        ok =np .isfinite (A ).all (axis =(1 ,2 ))&np .isfinite (g ).all (axis =1 )
+        A [~ok ]=eye 
+        g [~ok ]=0.0 
+        dp =np .linalg .solve (A ,g [...,None ])[...,0 ]
+        p_new =pa +dp 
+        r_new =y [act ]-model (xa ,p_new )
+        cost_new =np .einsum ('rm,rm->r',r_new ,r_new )
+        better =ok &np .isfinite (cost_new )&(cost_new <=cost [act ])
+        small_step =np .all (np .abs (dp )<=xtol *(np .abs (pa )+xtol ),axis =1 )
+        small_drop =(cost [act ]-cost_new )<=ftol *cost [act ]
+        idx =act [better ]
+        p [idx ]=p_new [better ]
+        r [idx ]=r_new [better ]
+        n_iter [act ]+=1 
+        converged [idx ]=(small_step |small_drop )[better ]
+        cost [idx ]=cost_new [better ]
+        lam [act ]=np .where (better ,np .maximum (lam [act ]*0.3 ,1e-12 ),lam [act ]*10.0 )
+        failed [act ]=~ok |(lam [act ]>1e12 )
+
+    failed |=~np .isfinite (p ).all (axis =1 )
+    converged &=~failed 
+    ss_tot =np .sum ((y -y .mean (axis =1 ,keepdims =True ))**2 ,axis =1 )
+    with np .errstate (divide ='ignore',invalid ='ignore'):
+        r2 =1.0 -cost /ss_tot 
+    return IsothermFit (p ,cost ,r2 ,converged ,n_iter ,int ((~converged ).sum ()))
+
+
+def _langmuir_batch (C ,p ):
+    return p [:,:1 ]*C /(p [:,1 :2 ]+C )
+
+
+def _langmuir_jac (C ,p ):
+    den =p [:,1 :2 ]+C 
+    C =np .broadcast_to (C ,den .shape )
+    return np .stack ([C /den ,-p [:,:1 ]*C /den **2 ],axis =-1 )
+
+
+def _freundlich_batch (C ,p ):
+    return p [:,:1 ]*C **(1.0 /p [:,1 :2 ])
+
+
+def _freundlich_jac (C ,p ):
+    Q =_freundlich_batch (C ,p )
+    return np .stack ([Q /p [:,:1 ],-Q *np .log (C )/p [:,1 :2 ]**2 ],axis =-1 )
+
+
+def _linear_fit_rows (x ,y ):
+    xm =x .mean (axis =-1 ,keepdims =True )
+    ym =y .mean (axis =1 ,keepdims =True )
+    sxx =np .sum ((x -xm )**2 ,axis =-1 )
+    slope =np .sum ((x -xm )*(y -ym ),axis =1 )/sxx 
+    return slope ,ym [:,0 ]-slope *xm [...,0 ]
+
+
+def langmuir_start (C ,Q ,p0 =None ):
+    Q =np .atleast_2d (Q )
+    with np .errstate (divide ='ignore',invalid ='ignore'):
+        slope ,icpt =_linear_fit_rows (C ,C /Q )
+        start =np .stack ([1.0 /slope ,icpt /slope ],axis =1 )
+    bad =~np .isfinite (start ).all (axis =1 )|(start <=0 ).any (axis =1 )
+    if p0 is not None :
+        start [bad ]=p0 
+    return start 
+
+
+def freundlich_start (C ,Q ,p0 =None ):
+    Q =np .atleast_2d (Q )
+    with np .errstate (divide ='ignore',invalid ='ignore'):
+        slope ,icpt =_linear_fit_rows (np .log (C ),np .log (Q ))
+        start =np .stack ([np .exp (icpt ),1.0 /slope ],axis =1 )
+    bad =~np .isfinite (start ).all (axis =1 )|(start <=0 ).any (axis =1 )
+    if p0 is not None :
+        start [bad ]=p0 
+    return start 
+
+
+def fit_langmuir_batch (C ,Q ,p0 =None ,**kw ):
+    C =np .asarray (C ,dtype =float )
+    return levenberg_marquardt_batch (_langmuir_batch ,_langmuir_jac ,C ,Q ,
+    langmuir_start (C ,Q ,p0 ),**kw )
+
+
+def fit_freundlich_batch (C ,Q ,p0 =None ,**kw ):
+    C =np .asarray (C ,dtype =float )
+    if np .any (C <=0 ):
+        raise ValueError ("Freundlich fit requires strictly positive concentrations")
+    return levenberg_marquardt_batch (_freundlich_batch ,_freundlich_jac ,C ,Q ,
+    freundlich_start (C ,Q ,p0 ),**kw )
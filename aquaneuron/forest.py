@@ -0,0 +1,171 @@
+"""
+AquaNeuron  —  Packed Forest Inference
+Flattens a trained RandomForestClassifier into contiguous node arrays
+and evaluates all trees at once in NumPy; probabilities are bit-identical
+to sklearn's sequential predict_proba.
+"""
+
+import json 
+from concurrent .futures import ThreadPoolExecutor 
+from pathlib import Path 
+import numpy as np 
+
+PACKED_DIR ="packed"
+ARRAYS =("feature","threshold","children","missing_left","value","roots")
+
+
+def _round_down_f32 (threshold ):
+    t32 =threshold .astype (np .float32 )
+    over =t32 .astype (np .float64 )>threshold 
+    t32 [over ]=np .nextafter (t32 [over ],np .float32 (-np .inf ))
+    return t32 
+
+
+class PackedForest :
+    def __init__ (self ,feature ,threshold ,children ,missing_left ,value ,roots ,depth ,n_features ,classes ):
+        self .feature =feature 
+        self .threshold =threshold 
+        self .children =children 
+        self .missing_left =missing_left 
+        self .value =value 
+        self .roots =roots 
+        self .depth =int (depth )
+        self .n_features =int (n_features )
+        self .classes_ =np .asarray (classes )
+
+    @property 
+    def n_trees (self ):
+        return len (self .roots )
+
+    @property 
+    def n_nodes (self ):
+        return len (self .feature )
+
+    @property 
+    def nbytes (self ):
+        return sum (getattr (self ,a ).nbytes for a in ARRAYS )
+
+    @property 
+    def is_leaf (self ):
+        if getattr (self ,"_is_leaf",None )is None :
+            self ._is_leaf =np .asarray (self .children [:,0 ]==np .arange (self .n_nodes ))
+        return self ._is_leaf 
+
+    def apply (self ,X ):
+        X =np .ascontiguousarray (X ,dtype =np .float32 )
+        n =X .shape [0 ]
+        Xf =X .ravel ()
+        feature ,threshold =np .asarray (self .feature ),np .asarray (self .threshold )
+        children =np .asarray (self .children ).reshape (-1 )
+        is_leaf =self .is_leaf 
+        node =np .repeat (np .asarray (self .roots ,dtype =np .int64 ),n )
+        has_nan =bool (np .isnan (Xf ).any ())
+        if has_nan :
+            missing_right =~np .asarray (self .missing_left )
+        act =np .flatnonzero (~is_leaf .take (node ))
+        cur =node [act ]
+        base =act %n 
+        base *=self .n_features 
+        while act .size :
+            x =Xf .take (feature .take (cur )+base )
+            right =x >threshold .take (cur )
+            if has_nan :
+                right |=np .isnan (x )&missing_right .take (cur )
+            cur *=2 
+            cur +=right 
+            children .take (cur ,out =cur )
+            done =is_leaf .take (cur )
+            n_done =np .count_nonzero (done )
+            if n_done ==act .size :
+                node [act ]=cur 
+                break 
+            if 4 *n_done >=act .size :
+                node [act [done ]]=cur [done ]
+                keep =~done 
+                act ,cur ,base =act [keep ],cur [keep ],base [keep ]
+        return node .reshape (self .n_trees ,n )
+
+    def _proba_chunk (self ,X ):
+        leaves =self .apply (X )
+        value =np .asarray (self .value )
+        if leaves .shape [1 ]<=8 :
+            return np .cumsum (value [leaves ],axis =0 )[-1 ]
+        acc =np .zeros ((leaves .shape [1 ],value .shape [1 ]))
+        for row in leaves :
+            acc +=np .take (value ,row ,axis =0 )
+        return acc 
+
+    def predict_proba (self ,X ,chunk =None ,n_jobs =1 ):
+        X =np .atleast_2d (X )
+        if X .shape [1 ]!=self .n_features :
+            raise ValueError (f"expected {self .n_features } features, got {X .shape [1 ]}")
+        chunk =chunk or max (1 ,(1 <<17 )//self .n_trees )
+        starts =range (0 ,X .shape [0 ],chunk )
+        out =np .empty ((X .shape [0 ],self .value .shape [1 ]))
+
+        def run (s ):
+            out [s :s +chunk ]=self ._proba_chunk (X [s :s +chunk ])
+
+        if n_jobs ==1 or len (starts )==1 :
+            for s in starts :
+                run (s )
+        else :
+            with ThreadPoolExecutor (max_workers =n_jobs if n_jobs >0 else None )as pool :
+                list (pool .map (run ,starts ))
+        out /=self .n_trees 
+        return out 
+
+    def predict (self ,X ,**kw ):
+        return self .classes_ [np .argmax (self .predict_proba (X ,**kw ),axis =1 )]
+
+
+def pack (forest ):
+    trees =[est .tree_ for est in forest .estimators_ ]
+    sizes =np .array ([t .node_count for t in trees ])
+    offsets =np .concatenate ([[0 ],np .cumsum (sizes )[:-1 ]])
+    feature ,threshold ,children ,missing_left ,value =[],[],[],[],[]
+    for t ,off in zip (trees ,offsets ):
+        idx =np .arange (t .node_count )
+        leaf =t .children_left ==-1 
+        feature .append (np .where (leaf ,0 ,t .feature ))
+        threshold .append (np .where (leaf ,np .inf ,t .threshold ))
+        children .append (np .stack ([np .where (leaf ,idx ,t .children_left ),
+        np .where (leaf ,idx ,t .children_right )],axis =1 )+off )
+        missing =getattr (t ,"missing_go_to_left",None )
+        missing_left .append (np .zeros (t .node_count ,dtype =bool )if missing is None 
+        else (np .asarray (missing )!=0 )&~leaf )
+        proba =t .value [:,0 ,:forest .n_classes_ ].copy ()
+        normalizer =proba .sum (axis =1 )[:,np .newaxis ]
+        normalizer [normalizer ==0.0 ]=1.0 
+        proba /=normalizer 
+        value .append (proba )
+    return PackedForest (
+    np .concatenate (feature ).astype (np .int64 ),
+    _round_down_f32 (np .concatenate (threshold )),
+    np .ascontiguousarray (np .concatenate (children ),dtype =np .int64 ),
+    np .concatenate (missing_left ),
+    np .ascontiguousarray (np .concatenate (value ),dtype =np .float64 ),
+    offsets .astype (np .int64 ),
+    max (t .max_depth for t in trees ),
+    forest .n_features_in_ ,
+    forest .classes_ ,
+    )
+
+
+def save_packed (packed ,path ):
+    path =Path (path )/PACKED_DIR 
+    path .mkdir (parents =True ,exist_ok =True )
+    for name in ARRAYS :
+        np .save (path /f"{name }.npy",getattr (packed ,name ))
+    meta ={"depth":packed .depth ,"n_features":packed .n_features ,
+    "classes":packed .classes_ .tolist ()}
+    (path /"packed.json").write_text (json .dumps (meta ),encoding ="utf-8")
+    return [path /f"{name }.npy"for name in ARRAYS ]+[path /"packed.json"]
+
+
+def load_packed (path ,mmap =True ):
+    path =Path (path )/PACKED_DIR 
+    meta =json .loads ((path /"packed.json").read_text (encoding ="utf-8"))
+    arrays ={name :np .load (path /f"{name }.npy",mmap_mode ="r"if mmap else None )for name in ARRAYS }
+    return PackedForest (**arrays ,depth =meta ["depth"],n_features =meta ["n_features"],
+    classes =meta ["classes"])
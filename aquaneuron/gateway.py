@@ -0,0 +1,457 @@
+"""
+AquaNeuron  —  Ingestion Gateway
+Asyncio collector for the LoRa relay tier: validates fixed-size node
+packets, coalesces them into micro-batches for classification and
+uploads them to a pluggable sink with pooling, backpressure and retry.
+
+    python -m aquaneuron.gateway serve --port 9100 [--sink URL] [--model models/rf]
+    python -m aquaneuron.gateway load --nodes 10000 --rounds 5 [--fail 0.05]
+"""
+
+import argparse 
+import asyncio 
+import json 
+import logging 
+import random 
+import sys 
+import time 
+import zlib 
+from urllib .parse import urlsplit 
+import numpy as np 
+from .records import LogWriter ,pack 
+from .rng import ROOT_SEED ,seed_sequence 
+
+MAGIC =0xA90E 
+VERSION =1 
+PACKET =np .dtype ([("magic","<u2"),("version","u1"),("flags","u1"),("node","<u4"),("seq","<u4"),
+("t","<f8"),("x","<f4",(6 ,)),("crc","<u4")])
+SIZE =PACKET .itemsize 
+LIMITS =np .array ([[-100 ,100 ],[-100 ,100 ],[-100 ,100 ],[0 ,14 ],[0 ,5000 ],[-5 ,60 ]],dtype =np .float32 )
+RECORD =np .dtype ([("node","<u4"),("seq","<u4"),("t","<f8"),("x","<f4",(6 ,))])
+
+logger =logging .getLogger (__name__ )
+
+
+class ProtocolError (ValueError ):
+    pass 
+
+
+class SinkError (RuntimeError ):
+    def __init__ (self ,message ,retry =True ):
+        super ().__init__ (message )
+        self .retry =retry 
+
+
+def _crc (buf ,n ):
+    mv =memoryview (buf )
+    return np .fromiter ((zlib .crc32 (mv [i *SIZE :(i +1 )*SIZE -4 ])for i in range (n )),np .uint32 ,n )
+
+
+def encode (node ,seq ,t ,x ):
+    node =np .atleast_1d (node )
+    p =np .zeros (len (node ),PACKET )
+    p ["magic"],p ["version"]=MAGIC ,VERSION 
+    p ["node"],p ["seq"],p ["t"],p ["x"]=node ,seq ,t ,x 
+    p ["crc"]=_crc (p .tobytes (),len (p ))
+    return p .tobytes ()
+
+
+def decode (buf ):
+    n =len (buf )//SIZE 
+    if n *SIZE !=len (buf ):
+        raise ProtocolError (f"buffer of {len (buf )} bytes is not a whole number of {SIZE }-byte packets")
+    p =np .frombuffer (buf ,PACKET ,n )
+    if n and (np .any (p ["magic"]!=MAGIC )or np .any (p ["version"]!=VERSION )):
+        raise ProtocolError ("bad magic or protocol version")
+    x =p ["x"]
+    ok =(p ["crc"]==_crc (buf ,n ))&np .all (np .isfinite (x )&(x >=LIMITS [:,0 ])&(x <=LIMITS [:,1 ]),axis =1 )
+    out =np .empty (int (ok .sum ()),RECORD )
+    for name in RECORD .names :
+        out [name ]=p [name ][ok ]
+    return out ,n -len (out )
+
+
+class MemorySink :
+    def __init__ (self ):
+        self .batches =[]
+
+    async def send (self ,batch ):
+        self .batches .append (batch )
+
+    async def close (self ):
+        pass 
+
+
+class LogSink :
+    def __init__ (self ,path ):
+        self .log =LogWriter (path )
+
+    async def send (self ,batch ):
+        self .log .append (pack (batch ["node"],batch ["t"],batch ["x"],seq =batch ["seq"]&0xFFFF ))
+        self .log .flush ()
+
+    async def close (self ):
+        self .log .close ()
+
+
+class HTTPSink :
+    def __init__ (self ,url ,api_key ="AQUANEURON",pool =4 ,timeout =5.0 ):
+        u =urlsplit (url )
+        self .host ,self .port =u .hostname ,u .port or 80 
+        self .path =u .path or "/"
+        self .api_key =api_key 
+        self .timeout =float (timeout )
+        self ._slots =asyncio .Semaphore (pool )
+        self ._idle =[]
+        self .opened =0 
+
+    @staticmethod 
+    def payload (batch ,api_key ):
+        x ,label =batch ["x"],batch .get ("label")
+        updates =[]
+        for i in range (len (x )):
+            u ={"created_at":round (float (batch ["t"][i ]),3 ),"node":int (batch ["node"][i ])}
+            u .update ((f"field{j +1 }",round (float (v ),4 ))for j ,v in enumerate (x [i ]))
+            if label is not None :
+                u ["field7"]=int (label [i ])
+            updates .append (u )
+        return json .dumps ({"write_api_key":api_key ,"updates":updates }).encode ()
+
+    async def _request (self ,conn ,body ):
+        reader ,writer =conn 
+        writer .write (f"POST {self .path } HTTP/1.1\r\nHost: {self .host }\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len (body )}\r\nConnection: keep-alive\r\n\r\n".encode ()+body )
+        await writer .drain ()
+        status =int ((await reader .readline ()).split ()[1 ])
+        headers ={}
+        while (line :=await reader .readline ())not in (b"\r\n",b"\n",b""):
+            k ,_ ,v =line .decode ("latin-1").partition (":")
+            headers [k .strip ().lower ()]=v .strip ()
+        await reader .readexactly (int (headers .get ("content-length",0 )))
+        return status ,headers .get ("connection","").lower ()!="close"
+
+    async def send (self ,batch ):
+        body =self .payload (batch ,self .api_key )
+        async with self ._slots :
+            conn =self ._idle .pop ()if self ._idle else None 
+            try :
+                if conn is None :
+                    conn =await asyncio .wait_for (asyncio .open_connection (self .host ,self .port ),self .timeout )
+                    self .opened +=1 
+                status ,keep =await asyncio .wait_for (self ._request (conn ,body ),self .timeout )
+            except (OSError ,asyncio .IncompleteReadError ,asyncio .TimeoutError ,ValueError ,IndexError )as e :
+                if conn is not None :
+                    conn [1 ].close ()
+                raise SinkError (f"upload failed: {e !r}")from e 
+            if keep :
+                self ._idle .append (conn )
+            else :
+                conn [1 ].close ()
+        if status ==429 or status >=500 :
+            raise SinkError (f"HTTP {status }")
+        if status >=400 :
+            raise SinkError (f"HTTP {status }",retry =False )
+
+    async def close (self ):
+        for _ ,writer in self ._idle :
+            writer .close ()
+        await asyncio .gather (*(w .wait_closed ()for _ ,w in self ._idle ),return_exceptions =True )
+        self ._idle .clear ()
+
+
+class StubServer :
+    def __init__ (self ,fail =0.0 ,latency =0.0 ,seed =None ):
+        self .fail =float (fail )
+        self .latency =float (latency )
+        self .rng =random .Random (seed )
+        self .requests =self .failed =self .updates =0 
+        self .server =None 
+        self ._writers =set ()
+
+    async def start (self ,host ="127.0.0.1",port =0 ):
+        self .server =await asyncio .start_server (self ._handle ,host ,port )
+        return self .server .sockets [0 ].getsockname ()[1 ]
+
+    async def _handle (self ,reader ,writer ):
+        self ._writers .add (writer )
+        try :
+            while await reader .readline ():
+                length =0 
+                while (line :=await reader .readline ())not in (b"\r\n",b"\n",b""):
+                    k ,_ ,v =line .decode ("latin-1").partition (":")
+                    if k .strip ().lower ()=="content-length":
+                        length =int (v )
+                body =await reader .readexactly (length )
+                self .requests +=1 
+                if self .latency :
+                    await asyncio .sleep (self .latency )
+                if self .rng .random ()<self .fail :
+                    self .failed +=1 
+                    status ,reply ="503 Service Unavailable",b'{"success":false}'
+                else :
+                    self .updates +=len (json .loads (body )["updates"])
+                    status ,reply ="200 OK",b'{"success":true}'
+                writer .write (f"HTTP/1.1 {status }\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len (reply )}\r\n\r\n".encode ()+reply )
+                await writer .drain ()
+        except (asyncio .IncompleteReadError ,ConnectionError ):
+            pass 
+        finally :
+            self ._writers .discard (writer )
+            writer .close ()
+
+    async def close (self ):
+        for writer in list (self ._writers ):
+            writer .close ()
+        self .server .close ()
+        await self .server .wait_closed ()
+
+
+class Gateway :
+    def __init__ (self ,sink ,model =None ,batch_size =1024 ,max_delay =0.05 ,queue_size =16 ,uploaders =4 ,
+    retries =5 ,backoff =0.05 ):
+        self .sink =sink 
+        self .model =model 
+        self .batch_size =int (batch_size )
+        self .max_delay =float (max_delay )
+        self .queue =asyncio .Queue (queue_size )
+        self .n_uploaders =int (uploaders )
+        self .retries =int (retries )
+        self .backoff =float (backoff )
+        self ._pending ,self ._n_pending ,self ._oldest =[],0 ,None 
+        self ._tasks ,self .server =[],None 
+        self .stats =dict .fromkeys (("packets","accepted","rejected","protocol_errors","batches",
+        "uploaded","retries","dropped","max_queue"),0 )
+        self ._latency =[]
+
+    async def start (self ,host ="127.0.0.1",port =0 ):
+        self ._tasks =[asyncio .create_task (self ._upload_worker ())for _ in range (self .n_uploaders )]
+        self ._tasks .append (asyncio .create_task (self ._ticker ()))
+        self .server =await asyncio .start_server (self ._handle ,host ,port )
+        return self .server .sockets [0 ].getsockname ()[1 ]
+
+    async def _handle (self ,reader ,writer ):
+        tail =b""
+        try :
+            while chunk :=await reader .read (1 <<16 ):
+                buf =tail +chunk 
+                n =len (buf )//SIZE *SIZE 
+                buf ,tail =buf [:n ],buf [n :]
+                if not n :
+                    continue 
+                recs ,bad =decode (buf )
+                self .stats ["packets"]+=n //SIZE 
+                self .stats ["rejected"]+=bad 
+                if len (recs ):
+                    await self ._append (recs )
+        except ProtocolError :
+            self .stats ["protocol_errors"]+=1 
+        except ConnectionError :
+            pass 
+        finally :
+            writer .close ()
+
+    async def _append (self ,recs ):
+        self .stats ["accepted"]+=len (recs )
+        if self ._oldest is None :
+            self ._oldest =time .monotonic ()
+        self ._pending .append (recs )
+        self ._n_pending +=len (recs )
+        while self ._n_pending >=self .batch_size :
+            await self ._cut (self .batch_size )
+
+    async def _cut (self ,n =None ):
+        recs =np .concatenate (self ._pending )if len (self ._pending )>1 else self ._pending [0 ]
+        n =len (recs )if n is None else n 
+        batch ,rest =recs [:n ],recs [n :]
+        self ._pending =[rest ]if len (rest )else []
+        self ._n_pending =len (rest )
+        self ._oldest =time .monotonic ()if len (rest )else None 
+        self .stats ["batches"]+=1 
+        await self .queue .put (batch )
+        self .stats ["max_queue"]=max (self .stats ["max_queue"],self .queue .qsize ())
+
+    async def _ticker (self ):
+        while True :
+            await asyncio .sleep (self .max_delay /2 )
+            if self ._oldest is not None and time .monotonic ()-self ._oldest >=self .max_delay :
+                await self ._cut ()
+
+    def classify (self ,recs ):
+        batch ={name :recs [name ]for name in RECORD .names }
+        if self .model is not None :
+            batch ["label"]=self .model .predict (recs ["x"].astype (np .float64 ))
+        return batch 
+
+    async def _upload_worker (self ):
+        loop =asyncio .get_running_loop ()
+        while True :
+            recs =await self .queue .get ()
+            try :
+                if self .model is None :
+                    batch =self .classify (recs )
+                else :
+                    batch =await loop .run_in_executor (None ,self .classify ,recs )
+                await self ._upload (batch )
+            except Exception :
+                self .stats ["dropped"]+=len (recs )
+                logger .exception ("dropped a batch of %d readings",len (recs ))
+            finally :
+                self .queue .task_done ()
+
+    async def _upload (self ,batch ):
+        for attempt in range (self .retries +1 ):
+            try :
+                await self .sink .send (batch )
+            except SinkError as e :
+                if not e .retry or attempt ==self .retries :
+                    self .stats ["dropped"]+=len (batch ["x"])
+                    return 
+                self .stats ["retries"]+=1 
+                await asyncio .sleep (self .backoff *2 **attempt *(0.5 +random .random ()))
+            else :
+                self .stats ["uploaded"]+=len (batch ["x"])
+                self ._latency .append (time .time ()-batch ["t"])
+                return 
+
+    async def flush (self ):
+        if self ._n_pending :
+            await self ._cut ()
+        await self .queue .join ()
+
+    async def close (self ):
+        if self .server is not None :
+            self .server .close ()
+            await self .server .wait_closed ()
+        await self .flush ()
+        for task in self ._tasks :
+            task .cancel ()
+        await asyncio .gather (*self ._tasks ,return_exceptions =True )
+        await self .sink .close ()
+
+    def latency (self ,probs =(0.5 ,0.95 ,0.99 ,1.0 )):
+        lat =np .concatenate (self ._latency )if self ._latency else np .zeros (0 )
+        return dict (zip (probs ,np .quantile (lat ,probs )if lat .size else [np .nan ]*len (probs )))
+
+
+async def relay (host ,port ,node ,x ,rounds ,interval ,corrupt =0.0 ,seed =None ,chunk =64 ):
+    rng =np .random .default_rng (seed )
+    _ ,writer =await asyncio .open_connection (host ,port )
+    sent =0 
+    t_start =time .monotonic ()
+    for r in range (rounds ):
+        for i in range (0 ,len (node ),chunk ):
+            sl =slice (i ,i +chunk )
+            buf =bytearray (encode (node [sl ],r ,time .time (),x [r ,sl ]))
+            if corrupt :
+                for j in np .flatnonzero (rng .random (len (buf )//SIZE )<corrupt ):
+                    buf [j *SIZE +20 ]^=0xFF 
+            writer .write (buf )
+            sent +=len (buf )//SIZE 
+            await writer .drain ()
+        if interval :
+            await asyncio .sleep (max (0.0 ,t_start +(r +1 )*interval -time .monotonic ()))
+    writer .close ()
+    await writer .wait_closed ()
+    return sent 
+
+
+async def load_test (n_nodes =10000 ,rounds =5 ,relays =32 ,interval =0.0 ,model =None ,fail =0.0 ,latency =0.0 ,
+corrupt =0.0 ,batch_size =1024 ,max_delay =0.05 ,pool =4 ,seed =None ):
+    from .dataset import sample 
+    seed =seed_sequence ("simulation")if seed is None else seed 
+    s_data ,s_relay ,s_stub =seed .spawn (3 )
+    X ,_ =sample (-(-n_nodes *rounds //5 ),seed =s_data )
+    x =X [:n_nodes *rounds ].reshape (rounds ,n_nodes ,6 )
+    stub =StubServer (fail ,latency ,seed =int (s_stub .generate_state (1 )[0 ]))
+    sink =HTTPSink (f"http://127.0.0.1:{await stub .start ()}/update.json",pool =pool )
+    gw =Gateway (sink ,model ,batch_size =batch_size ,max_delay =max_delay ,uploaders =pool )
+    port =await gw .start ()
+    groups =np .array_split (np .arange (n_nodes ),relays )
+    t0 =time .perf_counter ()
+    sent =await asyncio .gather (*(relay ("127.0.0.1",port ,g ,x [:,g ],rounds ,interval ,corrupt ,s )
+    for g ,s in zip (groups ,s_relay .spawn (relays ))))
+    await gw .close ()
+    elapsed =time .perf_counter ()-t0 
+    await stub .close ()
+    return {"sent":int (sum (sent )),"elapsed":elapsed ,"stats":dict (gw .stats ),"latency":gw .latency (),
+    "connections":sink .opened ,"stub":{"requests":stub .requests ,"failed":stub .failed ,
+    "updates":stub .updates }}
+
+
+def _report (res ):
+    st =res ["stats"]
+    print (f"  packets sent {res ['sent']:,}  accepted {st ['accepted']:,}  rejected {st ['rejected']:,}  "
+    f"protocol errors {st ['protocol_errors']}")
+    print (f"  batches {st ['batches']:,}  uploaded {st ['uploaded']:,}  dropped {st ['dropped']:,}  "
+    f"retries {st ['retries']}  peak queue {st ['max_queue']}  sink connections {res ['connections']}")
+    print (f"  stub: {res ['stub']['requests']:,} requests, {res ['stub']['failed']} failed (503), "
+    f"{res ['stub']['updates']:,} updates stored")
+    lat ="  ".join (f"p{p *100 :g} {v *1e3 :.1f} ms"if p <1 else f"max {v *1e3 :.1f} ms"
+    for p ,v in res ["latency"].items ())
+    print (f"  throughput {st ['uploaded']/res ['elapsed']:,.0f} readings/s over {res ['elapsed']:.2f} s")
+    print (f"  end-to-end latency  {lat }")
+
+
+async def _serve (args ,model ):
+    if not args .sink :
+        sink =MemorySink ()
+    elif args .sink .endswith (".aqlog"):
+        sink =LogSink (args .sink )
+    else :
+        sink =HTTPSink (args .sink ,args .api_key ,pool =args .pool )
+    gw =Gateway (sink ,model ,batch_size =args .batch ,max_delay =args .max_delay ,uploaders =args .pool )
+    port =await gw .start (args .host ,args .port )
+    print (f"  listening on {args .host }:{port } ({SIZE }-byte packets) → {args .sink or 'memory'}")
+    try :
+        while True :
+            await asyncio .sleep (args .report )
+            print (f"  {time .strftime ('%H:%M:%S')}  "+"  ".join (f"{k } {v :,}"for k ,v in gw .stats .items ()))
+    finally :
+        await gw .close ()
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.gateway",
+    description ="Asyncio ingestion gateway for the LoRa relay tier")
+    sub =ap .add_subparsers (dest ="cmd",required =True )
+    s =sub .add_parser ("serve",help ="accept relay connections and upload batches")
+    s .add_argument ("--host",default ="127.0.0.1")
+    s .add_argument ("--port",type =int ,default =9100 )
+    s .add_argument ("--sink",default =None ,help ="ThingSpeak-style bulk update URL or a .aqlog reading log (default: keep in memory)")
+    s .add_argument ("--api-key",default ="AQUANEURON")
+    s .add_argument ("--report",type =float ,default =10.0 ,help ="seconds between stats lines")
+    l =sub .add_parser ("load",help ="synthetic fleet against a local stand-in sink")
+    l .add_argument ("--nodes",type =int ,default =10000 )
+    l .add_argument ("--rounds",type =int ,default =5 )
+    l .add_argument ("--relays",type =int ,default =32 )
+    l .add_argument ("--interval",type =float ,default =0.0 ,help ="seconds per reporting round (0 = flat out)")
+    l .add_argument ("--fail",type =float ,default =0.0 ,help ="fraction of uploads the stand-in rejects with 503")
+    l .add_argument ("--latency",type =float ,default =0.0 ,help ="stand-in response delay (s)")
+    l .add_argument ("--corrupt",type =float ,default =0.0 ,help ="fraction of packets with a bad checksum")
+    l .add_argument ("--seed",type =int ,default =None ,help =f"root seed (default {ROOT_SEED })")
+    for p in (s ,l ):
+        p .add_argument ("--model",default =None ,help ="edge model directory (default: no classification)")
+        p .add_argument ("--batch",type =int ,default =1024 )
+        p .add_argument ("--max-delay",type =float ,default =0.05 )
+        p .add_argument ("--pool",type =int ,default =4 ,help ="sink connections / upload workers")
+    args =ap .parse_args (argv )
+    model =None 
+    if args .model :
+        from .model import load 
+        model =load (args .model )
+    if args .cmd =="serve":
+        try :
+            asyncio .run (_serve (args ,model ))
+        except KeyboardInterrupt :
+            pass 
+        return 0 
+    seed =None if args .seed is None else seed_sequence ("simulation",root =args .seed )
+    res =asyncio .run (load_test (args .nodes ,args .rounds ,args .relays ,args .interval ,model ,args .fail ,
+    args .latency ,args .corrupt ,args .batch ,args .max_delay ,args .pool ,seed ))
+    _report (res )
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,88 @@
+"""
+AquaNeuron  —  Import-Time Check
+Measures cold-start import cost of the headless path in a fresh
+interpreter and fails when heavy plotting/analysis modules leak in.
+
+    python -m aquaneuron.importtime [--budget-ms 250] [--overhead-ms 200] [module ...]
+"""
+
+import argparse 
+import json 
+import subprocess 
+import sys 
+
+HEADLESS =("aquaneuron","aquaneuron.physics","aquaneuron.fitting","aquaneuron.model","aquaneuron.forest",
+"aquaneuron.dataset","aquaneuron.montecarlo","aquaneuron.embedding",
+"aquaneuron.selection","aquaneuron.inverse",
+"aquaneuron.comparison","aquaneuron.risk","aquaneuron.eis",
+"aquaneuron.drift","aquaneuron.bench","aquaneuron.trace",
+"aquaneuron.gateway","aquaneuron.records","aquaneuron.compress",
+"aquaneuron.transient","aquaneuron.spatial")
+FORBIDDEN =("matplotlib","pandas","scipy","sklearn")
+OVERHEAD_BUDGET_MS =200 
+
+_PROBE ="""
+import json, sys, time
+t0 = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+dt = time.perf_counter() - t0
+print(json.dumps({{"seconds": dt, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure (modules =HEADLESS ,repeat =3 ):
+    best ,loaded =None ,set ()
+    for _ in range (repeat ):
+        out =subprocess .run ([sys .executable ,"-c",_PROBE .format (modules =tuple (modules ))],
+        capture_output =True ,text =True ,check =True ).stdout 
+        res =json .loads (out .strip ().splitlines ()[-1 ])
+        loaded =set (res ["modules"])
+        best =res ["seconds"]if best is None else min (best ,res ["seconds"])
+    leaked =sorted ({m .split (".")[0 ]for m in loaded }&set (FORBIDDEN ))
+    return {"modules":list (modules ),"seconds":best ,"leaked":leaked }
+
+
+def baseline (repeat =3 ):
+    return measure (("numpy",),repeat )["seconds"]
+
+
+def check (modules =HEADLESS ,budget_ms =None ,repeat =3 ,overhead_ms =None ):
+    res =measure (modules ,repeat )
+    res ["numpy_seconds"]=baseline (repeat )
+    res ["overhead_seconds"]=res ["seconds"]-res ["numpy_seconds"]
+    problems =[]
+    if res ["leaked"]:
+        problems .append (f"heavy modules imported: {', '.join (res ['leaked'])}")
+    if budget_ms is not None and res ["seconds"]*1000 >budget_ms :
+        problems .append (f"import took {res ['seconds']*1000 :.1f} ms > budget {budget_ms } ms")
+    if overhead_ms is not None and res ["overhead_seconds"]*1000 >overhead_ms :
+        problems .append (f"import took {res ['overhead_seconds']*1000 :.1f} ms more than numpy > budget {overhead_ms } ms")
+    res ["problems"]=problems 
+    return res 
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (description =__doc__ .strip ().splitlines ()[0 ])
+    ap .add_argument ("modules",nargs ="*",default =list (HEADLESS ))
+    ap .add_argument ("--budget-ms",type =float ,default =None )
+    ap .add_argument ("--overhead-ms",type =float ,default =None ,
+    help =f"budget for the time spent beyond importing numpy (tests use {OVERHEAD_BUDGET_MS })")
+    ap .add_argument ("--repeat",type =int ,default =3 )
+    ap .add_argument ("--json",action ="store_true")
+    args =ap .parse_args (argv )
+    res =check (args .modules ,args .budget_ms ,args .repeat ,args .overhead_ms )
+    if args .json :
+        print (json .dumps (res ,indent =2 ))
+    else :
+        print (f"  import {', '.join (res ['modules'])}: {res ['seconds']*1000 :.1f} ms "
+        f"(numpy alone {res ['numpy_seconds']*1000 :.1f} ms)")
+        for p in res ["problems"]:
+            print (f"  ✗ {p }")
+        if not res ["problems"]:
+            print ("  ✓ headless import path is clean")
+    return 1 if res ["problems"]else 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,162 @@
+"""
+AquaNeuron  —  Inverse Solver
+Batched recovery of As/F/Pb concentrations (ppb) from 3-channel ΔR/R₀
+readings: per-channel Langmuir inversion, joint cross-reactivity
+correction with non-negativity, propagated uncertainty and flags.
+
+    python -m aquaneuron.inverse 12.5 3.1 1.8          # ΔR/R₀ in % per channel
+    python -m aquaneuron.inverse --bench 1000000
+"""
+
+import argparse 
+import itertools 
+import sys 
+import time 
+from collections import namedtuple 
+import numpy as np 
+from .physics import ANALYTES ,channel_params ,coupled_response ,selectivity_matrix 
+from .trace import traced 
+
+NEGATIVE =1 
+SATURATED =2 
+BELOW_LOD =4 
+ABOVE_RANGE =8 
+CLIPPED =16 
+INVALID =32 
+FLAG_NAMES ={NEGATIVE :"negative",SATURATED :"saturated",BELOW_LOD :"<LOD",
+ABOVE_RANGE :">range",CLIPPED :"clipped",INVALID :"invalid"}
+
+Estimate =namedtuple ("Estimate",["C","std","flags"])
+
+
+def _supports (m ):
+    return [np .array (s )for r in range (m -1 ,0 ,-1 )for s in itertools .combinations (range (m ),r )]
+
+
+def flag_names (flags ):
+    return [name for bit ,name in FLAG_NAMES .items ()if int (flags )&bit ]
+
+
+class InverseSolver :
+    def __init__ (self ,analytes =ANALYTES ,K =None ,noise =None ,saturation =0.95 ):
+        self .analytes =tuple (analytes )
+        self .S =channel_params ("S",analytes )
+        self .Kd =channel_params ("Kd",analytes )
+        self .lod =channel_params ("LOD",analytes )
+        self .upper =channel_params ("upper",analytes )
+        self .K =selectivity_matrix (analytes )if K is None else np .asarray (K ,dtype =float )
+        self .K_inv =np .linalg .inv (self .K )
+        self .noise =self .lod *self .S /(3 *self .Kd )if noise is None else np .broadcast_to (noise ,self .S .shape ).astype (float )
+        self .saturation =float (saturation )
+        self .supports =_supports (len (self .S ))
+
+    def _nonnegative (self ,b ,w ,K =None ,supports =None ):
+        K =self .K if K is None else K 
+        supports =self .supports if supports is None else supports 
+        best =np .zeros_like (b )
+        best_cost =np .einsum ("ni,ni,ni->n",b ,b ,w )
+        for s in supports :
+            Ks =K [:,s ]
+            A =np .einsum ("is,ni,it->nst",Ks ,w ,Ks )
+            rhs =np .einsum ("is,ni,ni->ns",Ks ,w ,b )
+            c =np .linalg .solve (A ,rhs [...,None ])[...,0 ]
+            r =b -c @Ks .T 
+            cost =np .einsum ("ni,ni,ni->n",r ,r ,w )
+            better =np .all (c >=0 ,axis =1 )&(cost <best_cost )
+            best [better ]=0.0 
+            best [np .ix_ (better ,s )]=c [better ]
+            best_cost =np .where (better ,cost ,best_cost )
+        return best 
+
+    @traced ()
+    def solve (self ,dR ):
+        dR =np .asarray (dR ,dtype =float )
+        single =dR .ndim ==1 
+        dR =np .atleast_2d (dR )
+        flags =np .zeros (dR .shape ,dtype =np .uint8 )
+        bad =~np .isfinite (dR )
+        flags [bad ]|=INVALID 
+        flags [(dR <0 )&~bad ]|=NEGATIVE 
+        cap =self .saturation *self .S 
+        flags [(dR >=cap )&~bad ]|=SATURATED 
+        d =np .clip (np .where (bad ,0.0 ,dR ),0.0 ,cap )
+        C_eff =self .Kd *d /(self .S -d )
+        sig_eff =self .noise *self .Kd *self .S /(self .S -d )**2 
+        if not bad .any ():
+            C ,std ,clipped =self ._combine (C_eff ,sig_eff )
+        else :
+            C =np .full (dR .shape ,np .nan )
+            std =np .full (dR .shape ,np .nan )
+            clipped =np .zeros (dR .shape ,dtype =bool )
+            pattern =bad @(1 <<np .arange (dR .shape [1 ]))
+            for key in np .unique (pattern ):
+                rows =pattern ==key 
+                cols =np .flatnonzero (~bad [np .argmax (rows )])
+                if cols .size ==0 :
+                    continue 
+                block =np .ix_ (rows ,cols )
+                C [block ],std [block ],clipped [block ]=self ._combine (C_eff [block ],sig_eff [block ],cols )
+        flags [clipped ]|=CLIPPED 
+        flags [C <self .lod ]|=BELOW_LOD 
+        flags [C >self .upper ]|=ABOVE_RANGE 
+        if single :
+            return Estimate (C [0 ],std [0 ],flags [0 ])
+        return Estimate (C ,std ,flags )
+
+    def _combine (self ,C_eff ,sig_eff ,cols =None ):
+        if cols is None or len (cols )==len (self .S ):
+            K ,K_inv ,supports =self .K ,self .K_inv ,self .supports 
+        else :
+            K =self .K [np .ix_ (cols ,cols )]
+            K_inv =np .linalg .inv (K )
+            supports =_supports (len (cols ))
+        C =C_eff @K_inv .T 
+        clipped =np .zeros (C .shape ,dtype =bool )
+        neg =np .any (C <0 ,axis =1 )
+        if neg .any ():
+            C [neg ]=self ._nonnegative (C_eff [neg ],1.0 /sig_eff [neg ]**2 ,K ,supports )
+            clipped [neg ]=C [neg ]==0 
+        std =np .sqrt ((sig_eff **2 )@(K_inv **2 ).T )
+        return C ,std ,clipped 
+
+
+def solve (dR ,**kw ):
+    return InverseSolver (**kw ).solve (dR )
+
+
+def _bench (n ,seed =0 ):
+    g =np .random .default_rng (seed )
+    solver =InverseSolver ()
+    C_true =g .lognormal (np .log (solver .upper /4 ),0.8 ,(n ,len (solver .S )))
+    dR =coupled_response (C_true ,solver .analytes ,solver .K )+g .normal (0 ,solver .noise ,(n ,len (solver .S )))
+    t0 =time .perf_counter ()
+    est =solver .solve (dR )
+    dt =time .perf_counter ()-t0 
+    ok =est .flags ==0 
+    z =(est .C -C_true )/est .std 
+    print (f"  {n :,} readings in {dt :.2f} s ({n /dt :,.0f} /s)")
+    for j ,a in enumerate (solver .analytes ):
+        rel =np .abs (est .C [ok [:,j ],j ]/C_true [ok [:,j ],j ]-1 )
+        print (f"  {a .symbol :<3} median |error| {np .median (rel ):.2%}   z-score sd {np .std (z [ok [:,j ],j ]):.2f}   flagged {1 -ok [:,j ].mean ():.1%}")
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.inverse",
+    description ="Concentrations from 3-channel ΔR/R₀ readings")
+    ap .add_argument ("reading",nargs ="*",type =float ,metavar ="DR",help ="ΔR/R₀ (%%) for the As, F and Pb channels")
+    ap .add_argument ("--bench",type =int ,metavar ="N",help ="solve N simulated readings and report accuracy")
+    args =ap .parse_args (argv )
+
+    if args .bench :
+        _bench (args .bench )
+        return 0 
+    if len (args .reading )!=len (ANALYTES ):
+        ap .error (f"expected {len (ANALYTES )} channel readings")
+    est =solve (np .array (args .reading )/100 )
+    for a ,c ,s ,f in zip (ANALYTES ,est .C ,est .std ,est .flags ):
+        print (f"  {a .symbol :<3} {c :10.2f} ± {s :.2f} ppb  {' '.join (flag_names (f ))}")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
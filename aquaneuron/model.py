@@ -0,0 +1,238 @@
+"""
+AquaNeuron  —  Edge Classifier Model
+Train-once/export of the StandardScaler + Random Forest pipeline as a
+versioned, content-hashed artifact, and a fast load-and-predict path
+that takes raw (un-scaled) 6-feature readings.
+"""
+
+import argparse 
+import hashlib 
+import json 
+import sys 
+from pathlib import Path 
+import numpy as np 
+from .forest import PACKED_DIR ,PackedForest ,load_packed 
+from .dataset import load as load_dataset ,sample 
+from .rng import ROOT_SEED ,seed_sequence 
+from .trace import traced 
+
+CLASSES =("Safe","As-High","F-High","Pb-High","Multi-Cont.")
+FEATURES =("ΔR_As(%)","ΔR_F(%)","ΔR_Pb(%)","pH","TDS(ppm)","Temp(°C)")
+FOREST_PARAMS ={"n_estimators":500 ,"max_depth":12 ,"min_samples_leaf":2 ,
+"random_state":42 ,"n_jobs":-1 }
+
+FORMAT_VERSION =2 
+ENGINES =("auto","packed","sklearn")
+SKLEARN_BATCH =512 
+MANIFEST ="manifest.json"
+FOREST_FILE ="forest.joblib"
+
+
+def synthetic_readings (n_per =300 ,seed =None ):
+    X ,y =sample (n_per ,seed =seed ,dtype =np .float64 )
+    return X ,y .astype (np .intp )
+
+
+class ArtifactError (ValueError ):
+    pass 
+
+
+def _sha256 (path ,chunk =1 <<20 ):
+    h =hashlib .sha256 ()
+    with open (path ,"rb")as fh :
+        for block in iter (lambda :fh .read (chunk ),b""):
+            h .update (block )
+    return h .hexdigest ()
+
+
+def _content_hash (meta ):
+    payload ={k :v for k ,v in meta .items ()if k !="content_hash"}
+    blob =json .dumps (payload ,sort_keys =True ,ensure_ascii =False ,default =str ).encode ("utf-8")
+    return hashlib .sha256 (blob ).hexdigest ()
+
+
+class EdgeModel :
+    def __init__ (self ,forest ,mean ,scale ,classes =CLASSES ,features =FEATURES ,meta =None ):
+        self .forest =forest 
+        self .mean =np .asarray (mean ,dtype =float )
+        self .scale =np .asarray (scale ,dtype =float )
+        self .classes =tuple (classes )
+        self .features =tuple (features )
+        self .meta =dict (meta or {})
+        if self .mean .shape !=(len (self .features ),)or self .scale .shape !=self .mean .shape :
+            raise ArtifactError ("scaler parameters do not match the feature list")
+
+    @property 
+    def version (self ):
+        return self .meta .get ("content_hash","")[:12 ]
+
+    def transform (self ,X ):
+        X =np .asarray (X ,dtype =float )
+        single =X .ndim ==1 
+        X =np .atleast_2d (X )
+        if X .shape [1 ]!=len (self .features ):
+            raise ValueError (f"expected {len (self .features )} features {self .features }, got {X .shape [1 ]}")
+        return (X -self .mean )/self .scale ,single 
+
+    @traced ()
+    def predict_proba (self ,X ):
+        Xs ,single =self .transform (X )
+        proba =self .forest .predict_proba (Xs )
+        return proba [0 ]if single else proba 
+
+    def predict (self ,X ):
+        return np .argmax (self .predict_proba (X ),axis =-1 )
+
+    def classify (self ,X ):
+        idx =self .predict (X )
+        if np .ndim (idx )==0 :
+            return self .classes [int (idx )]
+        return [self .classes [i ]for i in idx ]
+
+
+class AutoForest :
+    def __init__ (self ,packed ,loader =None ,min_batch =SKLEARN_BATCH ):
+        self .packed =packed 
+        self .min_batch =min_batch if loader is not None else np .inf 
+        self ._loader =loader 
+        self ._sklearn =None 
+
+    @property 
+    def classes_ (self ):
+        return self .packed .classes_ 
+
+    @property 
+    def sklearn (self ):
+        if self ._sklearn is None :
+            self ._sklearn =self ._loader ()
+        return self ._sklearn 
+
+    def predict_proba (self ,X ):
+        X =np .atleast_2d (X )
+        if X .shape [0 ]<self .min_batch :
+            return self .packed .predict_proba (X )
+        return self .sklearn .predict_proba (X )
+
+    def predict (self ,X ):
+        return self .classes_ [np .argmax (self .predict_proba (X ),axis =1 )]
+
+
+@traced ()
+def train (X ,y ,**params ):
+    from sklearn .ensemble import RandomForestClassifier 
+    from sklearn .preprocessing import StandardScaler 
+    scaler =StandardScaler ().fit (X )
+    forest =RandomForestClassifier (**{**FOREST_PARAMS ,**params })
+    forest .fit (scaler .transform (X ),y )
+    meta ={"params":forest .get_params (),"n_train":int (len (y ))}
+    return EdgeModel (forest ,scaler .mean_ ,scaler .scale_ ,meta =meta )
+
+
+def save (model ,path ):
+    import joblib 
+    import sklearn 
+    from .import __version__ 
+    from .forest import pack ,save_packed 
+    if isinstance (model .forest ,(PackedForest ,AutoForest )):
+        raise ArtifactError ("a packed-only model cannot be re-exported; save the sklearn forest")
+    path =Path (path )
+    path .mkdir (parents =True ,exist_ok =True )
+    joblib .dump (model .forest ,path /FOREST_FILE )
+    files =[path /FOREST_FILE ]+save_packed (pack (model .forest ),path )
+    meta ={
+    "format_version":FORMAT_VERSION ,
+    "aquaneuron_version":__version__ ,
+    "sklearn_version":sklearn .__version__ ,
+    "classes":list (model .classes ),
+    "features":list (model .features ),
+    "scaler_mean":model .mean .tolist (),
+    "scaler_scale":model .scale .tolist (),
+    "files":{f .relative_to (path ).as_posix ():_sha256 (f )for f in files },
+    }
+    meta .update ({k :v for k ,v in model .meta .items ()if k not in meta and k !="content_hash"})
+    meta ["content_hash"]=_content_hash (meta )
+    (path /MANIFEST ).write_text (json .dumps (meta ,indent =2 ,ensure_ascii =False ,default =str ),
+    encoding ="utf-8")
+    model .meta =meta 
+    return meta ["content_hash"]
+
+
+def read_manifest (path ):
+    path =Path (path )
+    meta =json .loads ((path /MANIFEST ).read_text (encoding ="utf-8"))
+    if meta .get ("format_version")!=FORMAT_VERSION :
+        raise ArtifactError (f"unsupported artifact format {meta .get ('format_version')!r} "
+        f"(expected {FORMAT_VERSION })")
+    return meta 
+
+
+def verify (path ,meta ,prefix =""):
+    path =Path (path )
+    if _content_hash (meta )!=meta ["content_hash"]:
+        raise ArtifactError (f"artifact {path } manifest does not match its content hash")
+    for rel ,sha in meta ["files"].items ():
+        if rel .startswith (prefix )and _sha256 (path /rel )!=sha :
+            raise ArtifactError (f"artifact {path }: {rel } failed its content-hash check")
+
+
+def _load_sklearn (path ,meta ,verify_hash =True ,n_jobs =None ):
+    import joblib 
+    if verify_hash :
+        verify (path ,meta ,FOREST_FILE )
+    forest =joblib .load (path /FOREST_FILE )
+    forest .n_jobs =n_jobs 
+    return forest 
+
+
+def load (path ,engine ="auto",verify_hash =True ,mmap =True ,n_jobs =None ,min_batch =SKLEARN_BATCH ):
+    path =Path (path )
+    meta =read_manifest (path )
+    if engine in ("auto","packed"):
+        if verify_hash :
+            verify (path ,meta ,PACKED_DIR )
+        forest =load_packed (path ,mmap =mmap )
+        if engine =="auto":
+            loader =(lambda :_load_sklearn (path ,meta ,verify_hash ,n_jobs ))if FOREST_FILE in meta ["files"]else None 
+            forest =AutoForest (forest ,loader ,min_batch )
+    elif engine =="sklearn":
+        forest =_load_sklearn (path ,meta ,verify_hash ,n_jobs )
+    else :
+        raise ValueError (f"unknown engine {engine !r}; expected one of {ENGINES }")
+    return EdgeModel (forest ,meta ["scaler_mean"],meta ["scaler_scale"],
+    meta ["classes"],meta ["features"],meta )
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.model",
+    description ="Train/export and query the edge classifier artifact")
+    sub =ap .add_subparsers (dest ="cmd",required =True )
+    tr =sub .add_parser ("train",help ="train on synthetic readings and export an artifact")
+    tr .add_argument ("out")
+    tr .add_argument ("--n-per",type =int ,default =300 )
+    tr .add_argument ("--seed",type =int ,default =ROOT_SEED )
+    tr .add_argument ("--data",help ="train on a dataset written by python -m aquaneuron.dataset")
+    pr =sub .add_parser ("predict",help ="classify one raw 6-feature reading")
+    pr .add_argument ("model")
+    pr .add_argument ("--engine",choices =ENGINES ,default ="auto")
+    pr .add_argument ("reading",nargs =len (FEATURES ),type =float ,metavar ="X")
+    args =ap .parse_args (argv )
+
+    if args .cmd =="train":
+        if args .data :
+            X ,y =load_dataset (args .data )
+        else :
+            X ,y =synthetic_readings (args .n_per ,seed_sequence ("dataset",root =args .seed ))
+        model =train (X ,y )
+        digest =save (model ,args .out )
+        print (f"✓ Saved: {args .out } (version {digest [:12 ]}, {len (X )} readings)")
+        return 0 
+
+    model =load (args .model ,engine =args .engine )
+    proba =model .predict_proba (args .reading )
+    k =int (np .argmax (proba ))
+    print (f"{model .classes [k ]}\t{proba [k ]:.3f}")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
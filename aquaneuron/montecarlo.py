@@ -0,0 +1,177 @@
+"""
+AquaNeuron  —  Monte Carlo LOD
+Chunked, convergence-driven propagation of calibration uncertainty into
+the limit of detection, with constant-memory histogram quantiles.
+
+    python -m aquaneuron.montecarlo [As F Pb] [--rtol 1e-4] [--max-samples 1e8] [-j 0]
+"""
+
+import argparse 
+import multiprocessing as mp 
+import os 
+import sys 
+import time 
+from collections import deque ,namedtuple 
+from concurrent .futures import ProcessPoolExecutor 
+import numpy as np 
+from .physics import LOD_MODELS ,lod 
+from .rng import ROOT_SEED ,child ,seed_sequence 
+from .trace import count ,traced 
+
+SPREAD =(0.10 ,0.15 ,0.08 )
+RANGE =(0.0 ,20.0 )
+BINS =1 <<16 
+CHUNK =1 <<20 
+QUANTILES =(0.025 ,0.5 ,0.975 )
+
+MCResult =namedtuple ("MCResult",["probs","values","halfwidth","n","n_accepted","converged","hist"])
+
+
+class Histogram :
+    def __init__ (self ,lo =RANGE [0 ],hi =RANGE [1 ],bins =BINS ):
+        self .lo =float (lo )
+        self .hi =float (hi )
+        self .counts =np .zeros (int (bins ),dtype =np .int64 )
+        self .below =0 
+        self .above =0 
+
+    @classmethod 
+    def from_counts (cls ,counts ,lo =RANGE [0 ],hi =RANGE [1 ],below =0 ,above =0 ):
+        h =cls (lo ,hi ,len (counts ))
+        h .counts [:]=counts 
+        h .below =int (below )
+        h .above =int (above )
+        return h 
+
+    @property 
+    def bins (self ):
+        return len (self .counts )
+
+    @property 
+    def edges (self ):
+        return np .linspace (self .lo ,self .hi ,self .bins +1 )
+
+    @property 
+    def n (self ):
+        return int (self .counts .sum ())
+
+    @property 
+    def total (self ):
+        return self .n +self .below +self .above 
+
+    def add (self ,x ):
+        x =np .asarray (x ,dtype =np .float64 ).ravel ()
+        keep =(x >self .lo )&(x <self .hi )
+        idx =((x [keep ]-self .lo )*(self .bins /(self .hi -self .lo ))).astype (np .intp )
+        np .minimum (idx ,self .bins -1 ,out =idx )
+        self .counts +=np .bincount (idx ,minlength =self .bins )
+        below =int (np .count_nonzero (x <=self .lo ))
+        self .below +=below 
+        self .above +=len (x )-len (idx )-below 
+        return self 
+
+    def merge (self ,other ):
+        if (other .lo ,other .hi ,other .bins )!=(self .lo ,self .hi ,self .bins ):
+            raise ValueError ("cannot merge histograms with different binning")
+        self .counts +=other .counts 
+        self .below +=other .below 
+        self .above +=other .above 
+        return self 
+
+    def cdf (self ,x ):
+        F =np .concatenate (([0 ],np .cumsum (self .counts )))
+        return np .interp (x ,self .edges ,F /max (F [-1 ],1 ))
+
+    def quantile (self ,p ):
+        F =np .concatenate (([0 ],np .cumsum (self .counts )))/max (self .n ,1 )
+        p =np .asarray (p ,dtype =np .float64 )
+        i =np .clip (np .searchsorted (F ,p ,side ="left"),1 ,self .bins )
+        lo ,hi =F [i -1 ],F [i ]
+        frac =np .where (hi >lo ,(p -lo )/np .where (hi >lo ,hi -lo ,1 ),0.0 )
+        return self .lo +(i -1 +frac )*(self .hi -self .lo )/self .bins 
+
+    def halfwidth (self ,p ,z =1.96 ):
+        p =np .asarray (p ,dtype =np .float64 )
+        d =0.5 *np .minimum (np .minimum (p ,1 -p ),0.02 )
+        spread =self .quantile (p +d )-self .quantile (p -d )
+        return z *np .sqrt (p *(1 -p )/max (self .n ,1 ))*spread /(2 *d )
+
+    def density (self ,edges ):
+        return np .diff (self .cdf (edges ))/np .diff (edges )
+
+
+def draw (model ,n ,seed ,spread =SPREAD ,lo =RANGE [0 ],hi =RANGE [1 ],bins =BINS ):
+    g =np .random .Generator (np .random .PCG64 (seed ))
+    bl =g .normal (model .bl ,model .bl *spread [0 ],n )
+    sig =g .normal (model .sig_bl ,model .sig_bl *spread [1 ],n )
+    sens =g .normal (model .sens ,model .sens *spread [2 ],n )
+    return Histogram (lo ,hi ,bins ).add (lod (bl ,sig ,sens ))
+
+
+def _chunks (model ,n_chunks ,chunk ,seed ,jobs ,**kw ):
+    if jobs ==1 :
+        for i in range (n_chunks ):
+            yield draw (model ,chunk ,child (seed ,i ),**kw )
+        return 
+    with ProcessPoolExecutor (jobs ,mp_context =mp .get_context ("spawn"))as pool :
+        pending =deque ()
+        i =0 
+        try :
+            while i <n_chunks or pending :
+                while i <n_chunks and len (pending )<2 *jobs :
+                    pending .append (pool .submit (draw ,model ,chunk ,child (seed ,i ),**kw ))
+                    i +=1 
+                yield pending .popleft ().result ()
+        finally :
+            for f in pending :
+                f .cancel ()
+
+
+@traced ()
+def run (model ,rtol =1e-3 ,probs =QUANTILES ,chunk =CHUNK ,max_samples =10 **8 ,min_samples =10 **4 ,
+jobs =1 ,seed =None ,spread =SPREAD ,lo =RANGE [0 ],hi =RANGE [1 ],bins =BINS ):
+    seed =seed_sequence ("monte_carlo_lod")if seed is None else seed 
+    jobs =jobs or os .cpu_count ()or 1 
+    probs =np .asarray (probs ,dtype =np .float64 )
+    hist =Histogram (lo ,hi ,bins )
+    values =hw =np .full (len (probs ),np .nan )
+    converged =False 
+    n_chunks =max (1 ,-(-int (max_samples )//chunk ))
+    for h in _chunks (model ,n_chunks ,chunk ,seed ,jobs ,spread =spread ,lo =lo ,hi =hi ,bins =bins ):
+        hist .merge (h )
+        if hist .n ==0 :
+            continue 
+        values =hist .quantile (probs )
+        hw =hist .halfwidth (probs )
+        if hist .total >=min_samples and np .all (hw <=rtol *np .abs (values )):
+            converged =True 
+            break 
+    count ("montecarlo.samples",hist .total )
+    return MCResult (probs ,values ,hw ,hist .total ,hist .n ,converged ,hist )
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.montecarlo",
+    description ="Monte Carlo LOD uncertainty with adaptive stopping")
+    ap .add_argument ("analytes",nargs ="*",choices =list (LOD_MODELS ),help ="default: all")
+    ap .add_argument ("--rtol",type =float ,default =1e-3 ,help ="relative 95%% CI half-width target")
+    ap .add_argument ("--max-samples",type =float ,default =1e8 )
+    ap .add_argument ("--chunk",type =int ,default =CHUNK )
+    ap .add_argument ("-j","--jobs",type =int ,default =1 ,help ="worker processes (0 = all CPUs)")
+    ap .add_argument ("--seed",type =int ,default =ROOT_SEED )
+    args =ap .parse_args (argv )
+
+    names =list (LOD_MODELS )
+    for name in args .analytes or names :
+        t0 =time .perf_counter ()
+        res =run (LOD_MODELS [name ],rtol =args .rtol ,chunk =args .chunk ,max_samples =int (args .max_samples ),
+        jobs =args .jobs ,seed =seed_sequence ("monte_carlo_lod",names .index (name ),root =args .seed ))
+        dt =time .perf_counter ()-t0 
+        cells ="  ".join (f"q{p *100 :g}={v :.4f}±{h :.4f}"for p ,v ,h in zip (res .probs ,res .values ,res .halfwidth ))
+        state ="converged"if res .converged else "max samples"
+        print (f"  {name :<3} {cells }  n={res .n :,} ({res .n_accepted /res .n :.1%} in range)  {state }, {dt :.1f} s")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
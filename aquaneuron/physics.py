@@ -0,0 +1,140 @@
+"""
+AquaNeuron  —  Sensor Physics Core
+Matplotlib-free, array-in/array-out models of GO-aptamer binding,
+resistive transduction, impedance and response kinetics.
+"""
+
+from dataclasses import dataclass 
+import numpy as np 
+
+R_GAS =8.314 
+T_REF =298.0 
+
+
+@dataclass (frozen =True )
+class Analyte :
+    name :str 
+    symbol :str 
+    ion :str 
+    Qmax :float 
+    Kd :float 
+    Kf :float 
+    n :float 
+    who :float 
+    S :float 
+    R0 :float 
+    LOD :float 
+    tau :float 
+    molar_mass :float 
+    upper :float 
+
+
+@dataclass (frozen =True )
+class LODModel :
+    bl :float 
+    sig_bl :float 
+    sens :float 
+
+
+@dataclass (frozen =True )
+class RandlesCircuit :
+    Rs :float =50.0 
+    Rct :float =2000.0 
+    T_cpe :float =1.2e-7 
+    n_cpe :float =0.88 
+    sigma_w :float =80.0 
+
+
+ARSENIC =Analyte ("Arsenic","As","As³⁺",Qmax =142.8 ,Kd =18.5 ,Kf =28.4 ,n =3.1 ,who =10 ,
+S =0.68 ,R0 =1000 ,LOD =0.8 ,tau =28 ,molar_mass =75 ,upper =85 )
+FLUORIDE =Analyte ("Fluoride","F","F⁻",Qmax =98.3 ,Kd =32.1 ,Kf =19.7 ,n =2.8 ,who =1500 ,
+S =0.52 ,R0 =1000 ,LOD =5.2 ,tau =42 ,molar_mass =19 ,upper =420 )
+LEAD =Analyte ("Lead","Pb","Pb²⁺",Qmax =117.6 ,Kd =12.4 ,Kf =24.1 ,n =3.4 ,who =10 ,
+S =0.73 ,R0 =1000 ,LOD =0.6 ,tau =22 ,molar_mass =207 ,upper =72 )
+ANALYTES =(ARSENIC ,FLUORIDE ,LEAD )
+
+LOD_MODELS ={
+"As":LODModel (bl =2.0 ,sig_bl =0.4 ,sens =0.82 ),
+"F":LODModel (bl =3.0 ,sig_bl =0.6 ,sens =0.61 ),
+"Pb":LODModel (bl =1.5 ,sig_bl =0.3 ,sens =0.91 ),
+}
+
+BARE_ELECTRODE =RandlesCircuit ()
+
+ION_PANEL =("As³⁺","Sb³⁺","Se⁴⁺","F⁻","Cl⁻","NO₃⁻","SO₄²⁻","Pb²⁺","Cd²⁺","Cu²⁺","Zn²⁺","Hg²⁺")
+CROSS_REACTIVITY =np .array ([
+[1.00 ,0.12 ,0.08 ,0.02 ,0.01 ,0.01 ,0.01 ,0.04 ,0.03 ,0.05 ,0.02 ,0.03 ],
+[0.02 ,0.03 ,0.04 ,1.00 ,0.11 ,0.07 ,0.08 ,0.02 ,0.01 ,0.03 ,0.01 ,0.02 ],
+[0.03 ,0.04 ,0.02 ,0.01 ,0.01 ,0.02 ,0.01 ,1.00 ,0.14 ,0.09 ,0.06 ,0.11 ],
+])
+CROSS_REACTIVITY .setflags (write =False )
+
+
+def channel_params (attr ,analytes =ANALYTES ):
+    return np .array ([getattr (a ,attr )for a in analytes ],dtype =float )
+
+
+def selectivity_matrix (analytes =ANALYTES ,matrix =CROSS_REACTIVITY ):
+    return matrix [:,[ION_PANEL .index (a .ion )for a in analytes ]]
+
+
+def langmuir (C ,Qmax ,Kd ):
+    C =np .asarray (C ,dtype =float )
+    return Qmax *C /(Kd +C )
+
+
+def freundlich (C ,Kf ,n ):
+    C =np .asarray (C ,dtype =float )
+    return Kf *C **(1.0 /np .asarray (n ,dtype =float ))
+
+
+def response (C ,S ,Kd ):
+    C =np .asarray (C ,dtype =float )
+    return S *C /(Kd +C )
+
+
+def coupled_response (C ,analytes =ANALYTES ,K =None ):
+    K =selectivity_matrix (analytes )if K is None else K 
+    C_eff =np .asarray (C ,dtype =float )@np .asarray (K ,dtype =float ).T 
+    return response (C_eff ,channel_params ("S",analytes ),channel_params ("Kd",analytes ))
+
+
+def resistance (C ,R0 ,S ,Kd ):
+    return R0 *(1.0 -response (C ,S ,Kd ))
+
+
+def concentration (dR ,S ,Kd ):
+    dR =np .asarray (dR ,dtype =float )
+    S =np .asarray (S ,dtype =float )
+    with np .errstate (divide ='ignore',invalid ='ignore'):
+        C =Kd *dR /(S -dR )
+    return np .where ((dR >=0 )&(dR <S ),C ,np .where (dR <0 ,0.0 ,np .inf ))
+
+
+def binding_free_energy (Kd ,molar_mass ,T =T_REF ):
+    kd_mol =np .asarray (Kd ,dtype =float )*1e-6 /molar_mass 
+    return R_GAS *T *np .log (kd_mol )/1000 
+
+
+def impedance (freq ,Rs =50.0 ,Rct =2000.0 ,T_cpe =1.2e-7 ,n_cpe =0.88 ,sigma_w =80.0 ):
+    omega =2 *np .pi *np .asarray (freq ,dtype =float )
+    Z_cpe =1 /(T_cpe *(1j *omega )**n_cpe )
+    Z_w =sigma_w *(1 -1j )/np .sqrt (omega )
+    return Rs +(Rct *Z_cpe )/(Rct +Z_cpe )+Z_w 
+
+
+def circuit_impedance (freq ,circuit ):
+    return impedance (freq ,circuit .Rs ,circuit .Rct ,circuit .T_cpe ,circuit .n_cpe ,circuit .sigma_w )
+
+
+def kinetics (t ,tau ):
+    t =np .asarray (t ,dtype =float )
+    return 1.0 -np .exp (-t /tau )
+
+
+def time_to_fraction (frac ,tau ):
+    return -np .asarray (tau ,dtype =float )*np .log (1.0 -np .asarray (frac ,dtype =float ))
+
+
+def lod (bl ,sig_bl ,sens ,k =3.0 ):
+    return (bl +k *sig_bl )/sens 
@@ -0,0 +1,263 @@
+"""
+AquaNeuron  —  Binary Reading Logs
+Fixed-width little-endian records (node, time, raw ADS1115 counts for
+the three aptamer bridges, pH, TDS, temperature, flags) in append-only
+logs that read back zero-copy as a structured np.memmap.
+
+    python -m aquaneuron.records write field.aqlog --nodes 1000 --days 7
+    python -m aquaneuron.records info field.aqlog
+    python -m aquaneuron.records scan field.aqlog [--model models/rf]
+"""
+
+import argparse 
+import os 
+import sys 
+import time 
+from pathlib import Path 
+import numpy as np 
+from .rng import ROOT_SEED ,child ,seed_sequence 
+
+MAGIC =b"AQNLOG\x00\x01"
+HEADER =64 
+RECORD =np .dtype ([("node","<u4"),("t","<f8"),("adc","<i2",(3 ,)),("ph","<u2"),("tds","<u2"),
+("temp","<i2"),("seq","<u2"),("flags","<u2")])
+SATURATED =1 
+REFERENCE =2 
+BLANK =4 
+INVALID =8 
+
+ADC_FSR =2.048 
+ADC_MAX =32767 
+V_EXCITATION =3.3 
+DR_PER_COUNT =100 *4 *ADC_FSR /(ADC_MAX +1 )/V_EXCITATION 
+SCALES =np .array ([DR_PER_COUNT ,DR_PER_COUNT ,DR_PER_COUNT ,0.01 ,0.1 ,0.01 ])
+BLOCK =1 <<20 
+
+
+class LogError (ValueError ):
+    pass 
+
+
+def to_counts (dR ):
+    return np .clip (np .rint (np .asarray (dR ,dtype =np .float64 )/DR_PER_COUNT ),-ADC_MAX ,ADC_MAX ).astype (np .int16 )
+
+
+def from_counts (counts ):
+    return np .asarray (counts ,dtype =np .float64 )*DR_PER_COUNT 
+
+
+def _quantize (v ,scale ,lo ,hi ,dtype ):
+    q =np .rint (v /scale )
+    bad =~np .isfinite (q )
+    clipped =(q <lo )|(q >hi )
+    return np .clip (np .where (bad ,0 ,q ),lo ,hi ).astype (dtype ),bad ,clipped 
+
+
+def pack (node ,t ,X ,flags =0 ,seq =0 ):
+    X =np .atleast_2d (np .asarray (X ,dtype =np .float64 ))
+    rec =np .zeros (len (X ),RECORD )
+    rec ["node"],rec ["t"],rec ["seq"]=node ,t ,seq 
+    f =np .broadcast_to (np .asarray (flags ,dtype =np .uint16 ),len (X )).copy ()
+    adc ,bad ,clipped =_quantize (X [:,:3 ],DR_PER_COUNT ,-ADC_MAX ,ADC_MAX ,np .int16 )
+    rec ["adc"]=adc 
+    f [clipped .any (axis =1 )]|=SATURATED 
+    f [bad .any (axis =1 )]|=INVALID 
+    for j ,(name ,dtype ,lo ,hi )in enumerate ((("ph",np .uint16 ,0 ,65535 ),("tds",np .uint16 ,0 ,65535 ),
+    ("temp",np .int16 ,-32768 ,32767 )),start =3 ):
+        rec [name ],bad ,clipped =_quantize (X [:,j ],SCALES [j ],lo ,hi ,dtype )
+        f [bad |clipped ]|=INVALID 
+    rec ["flags"]=f 
+    return rec 
+
+
+def features (rec ,dtype =np .float64 ,out =None ):
+    out =np .empty ((len (rec ),6 ),dtype =dtype )if out is None else out 
+    out [:,:3 ]=rec ["adc"]
+    out [:,3 ]=rec ["ph"]
+    out [:,4 ]=rec ["tds"]
+    out [:,5 ]=rec ["temp"]
+    out *=SCALES .astype (dtype )
+    return out 
+
+
+def _header ():
+    head =MAGIC +RECORD .itemsize .to_bytes (4 ,"little")+str (RECORD .descr ).encode ()[:HEADER -12 ]
+    return head .ljust (HEADER ,b"\x00")
+
+
+def _check (path ):
+    with open (path ,"rb")as fh :
+        head =fh .read (HEADER )
+    if len (head )<HEADER or head [:8 ]!=MAGIC :
+        raise LogError (f"{path } is not an AquaNeuron reading log")
+    size =int .from_bytes (head [8 :12 ],"little")
+    if size !=RECORD .itemsize or head !=_header ():
+        raise LogError (f"{path } uses a different record layout ({size }-byte records)")
+
+
+class LogWriter :
+    def __init__ (self ,path ,fsync =False ):
+        self .path =Path (path )
+        self .fsync =fsync 
+        if self .path .exists ()and self .path .stat ().st_size :
+            _check (self .path )
+            size =self .path .stat ().st_size 
+            tail =(size -HEADER )%RECORD .itemsize 
+            if tail :
+                os .truncate (self .path ,size -tail )
+            self ._fh =open (self .path ,"ab")
+        else :
+            self .path .parent .mkdir (parents =True ,exist_ok =True )
+            self ._fh =open (self .path ,"wb")
+            self ._fh .write (_header ())
+        self .count =(self ._fh .tell ()-HEADER )//RECORD .itemsize 
+
+    def append (self ,rec ):
+        rec =np .ascontiguousarray (rec ,dtype =RECORD )
+        self ._fh .write (memoryview (rec ).cast ("B"))
+        self .count +=len (rec )
+        return self 
+
+    def flush (self ):
+        self ._fh .flush ()
+        if self .fsync :
+            os .fsync (self ._fh .fileno ())
+
+    def close (self ):
+        if not self ._fh .closed :
+            self .flush ()
+            self ._fh .close ()
+
+    def __enter__ (self ):
+        return self 
+
+    def __exit__ (self ,*exc ):
+        self .close ()
+
+
+def read (path ,mmap =True ):
+    _check (path )
+    n =(Path (path ).stat ().st_size -HEADER )//RECORD .itemsize 
+    if not mmap :
+        with open (path ,"rb")as fh :
+            fh .seek (HEADER )
+            return np .fromfile (fh ,RECORD ,n )
+    if n ==0 :
+        return np .zeros (0 ,RECORD )
+    return np .memmap (path ,RECORD ,mode ="r",offset =HEADER ,shape =(n ,))
+
+
+def blocks (rec ,block =BLOCK ):
+    for i in range (0 ,len (rec ),block ):
+        yield rec [i :i +block ]
+
+
+def scan (rec ,model =None ,block =BLOCK ,skip =INVALID |SATURATED ):
+    n_nodes =int (rec ["node"].max ())+1 if len (rec )else 0 
+    n =np .zeros (n_nodes )
+    s1 =np .zeros ((n_nodes ,6 ))
+    s2 =np .zeros ((n_nodes ,6 ))
+    labels =np .zeros ((n_nodes ,0 if model is None else len (model .classes )),dtype =np .int64 )
+    skipped =0 
+    X =np .empty ((min (block ,len (rec )),6 ),order ="F")
+    sq =np .empty (len (X ))
+    for b in blocks (rec ,block ):
+        ok =(b ["flags"]&skip )==0 
+        b =b [ok ]if not ok .all ()else b 
+        skipped +=int ((~ok ).sum ())
+        x =features (b ,out =X [:len (b )])
+        node =b ["node"].astype (np .intp )
+        n +=np .bincount (node ,minlength =n_nodes )
+        for j in range (6 ):
+            s1 [:,j ]+=np .bincount (node ,x [:,j ],n_nodes )
+            s2 [:,j ]+=np .bincount (node ,np .multiply (x [:,j ],x [:,j ],out =sq [:len (x )]),n_nodes )
+        if model is not None and len (b ):
+            y =model .predict (x )
+            labels +=np .bincount (node *labels .shape [1 ]+y ,minlength =labels .size ).reshape (labels .shape )
+    with np .errstate (invalid ="ignore",divide ="ignore"):
+        mean =s1 /n [:,None ]
+        std =np .sqrt (np .maximum (s2 /n [:,None ]-mean **2 ,0 ))
+    return {"n":n .astype (np .int64 ),"mean":mean ,"std":std ,"labels":labels ,"skipped":skipped }
+
+
+def synthetic_log (path ,n_nodes =1000 ,days =7.0 ,interval =900.0 ,t0 =None ,seed =None ,block =BLOCK ):
+    from .dataset import sample 
+    seed =seed_sequence ("dataset")if seed is None else seed 
+    t0 =time .time ()-days *86400 if t0 is None else t0 
+    n_rounds =int (days *86400 //interval )
+    per_class =-(-n_nodes //5 )
+    nodes =np .arange (n_nodes )
+    step =max (1 ,block //n_nodes )
+    with LogWriter (path )as log :
+        for r0 in range (0 ,n_rounds ,step ):
+            r =np .arange (r0 ,min (n_rounds ,r0 +step ))
+            X ,_ =sample (len (r )*per_class ,seed =child (seed ,r0 ))
+            rows =5 *((r -r0 )[:,None ]*per_class +nodes //5 )+nodes %5 
+            log .append (pack (np .tile (nodes ,len (r )),t0 +np .repeat (r ,n_nodes )*interval ,X [rows .ravel ()],
+            seq =np .repeat (r &0xFFFF ,n_nodes )))
+        return log .count 
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.records",description ="Write, inspect and scan binary reading logs")
+    sub =ap .add_subparsers (dest ="cmd",required =True )
+    w =sub .add_parser ("write",help ="append a synthetic fleet history")
+    w .add_argument ("path")
+    w .add_argument ("--nodes",type =int ,default =1000 )
+    w .add_argument ("--days",type =float ,default =7.0 )
+    w .add_argument ("--interval",type =float ,default =900.0 ,help ="seconds between readings per node")
+    w .add_argument ("--seed",type =int ,default =None ,help =f"root seed (default {ROOT_SEED })")
+    i =sub .add_parser ("info",help ="summarize a log")
+    i .add_argument ("path")
+    s =sub .add_parser ("scan",help ="per-node statistics (and classes) in one zero-copy pass")
+    s .add_argument ("path")
+    s .add_argument ("--model",default =None ,help ="edge model directory")
+    s .add_argument ("--block",type =int ,default =BLOCK )
+    s .add_argument ("--top",type =int ,default =5 )
+    args =ap .parse_args (argv )
+
+    if args .cmd =="write":
+        t0 =time .perf_counter ()
+        n =synthetic_log (args .path ,args .nodes ,args .days ,args .interval ,
+        seed =seed_sequence ("dataset",root =args .seed ))
+        dt =time .perf_counter ()-t0 
+        print (f"✓ Saved: {args .path } ({n :,} records, {Path (args .path ).stat ().st_size /2 **20 :.1f} MB, "
+        f"{RECORD .itemsize } B/record, {dt :.2f} s)")
+        return 0 
+
+    rec =read (args .path )
+    if args .cmd =="info":
+        print (f"  {args .path }: {len (rec ):,} records × {RECORD .itemsize } B")
+        if len (rec ):
+            t =rec ["t"]
+            print (f"  time     {time .strftime ('%Y-%m-%d %H:%M',time .gmtime (t .min ()))} → "
+            f"{time .strftime ('%Y-%m-%d %H:%M',time .gmtime (t .max ()))} UTC")
+            print (f"  nodes    {len (np .unique (rec ['node'])):,}")
+            for name ,bit in (("saturated",SATURATED ),("reference",REFERENCE ),("blank",BLANK ),
+            ("invalid",INVALID )):
+                print (f"  {name :<9}{int (np .count_nonzero (rec ['flags']&bit )):,}")
+        return 0 
+
+    model =None 
+    if args .model :
+        from .model import load 
+        model =load (args .model )
+    t0 =time .perf_counter ()
+    res =scan (rec ,model ,args .block )
+    dt =time .perf_counter ()-t0 
+    print (f"  scanned {len (rec ):,} records ({rec .nbytes /2 **20 :.1f} MB) in {dt :.2f} s  "
+    f"({rec .nbytes /2 **30 /dt :.2f} GB/s), {res ['skipped']:,} flagged and skipped")
+    active =np .flatnonzero (res ["n"])
+    top =active [np .argsort (-res ["mean"][active ,0 ])[:args .top ]]
+    print (f"  {'node':>8}{'readings':>10}{'ΔR_As %':>10}{'ΔR_F %':>9}{'ΔR_Pb %':>10}{'pH':>7}")
+    for k in top :
+        m =res ["mean"][k ]
+        print (f"  {k :>8}{res ['n'][k ]:>10,}{m [0 ]:>10.2f}{m [1 ]:>9.2f}{m [2 ]:>10.2f}{m [3 ]:>7.2f}")
+    if model is not None :
+        total =res ["labels"].sum (axis =0 )
+        print ("  "+"  ".join (f"{c } {v /max (total .sum (),1 ):.1%}"for c ,v in zip (model .classes ,total )))
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,144 @@
+"""
+AquaNeuron  —  Groundwater Risk Aggregation
+Columnar roll-up of well- or district-level As/F/Pb risk indices to
+district, state and basin, with categorical keys and population-weighted
+indices; Parquet/Arrow input when pyarrow is installed.
+
+    python -m aquaneuron.risk [wells.parquet|wells.csv] [--level state] [--top 10]
+"""
+
+import argparse 
+import sys 
+import time 
+from pathlib import Path 
+import numpy as np 
+
+LEVELS =("Basin","State","District")
+HAZARDS =("Arsenic","Fluoride","Lead")
+WEIGHT ="Population"
+
+STATE_SCORES ={
+"State":("Uttar Pradesh","West Bengal","Bihar","Assam","Jharkhand",
+"Andhra Pradesh","Telangana","Rajasthan","Gujarat","Punjab",
+"Haryana","Madhya Pradesh","Chhattisgarh","Maharashtra","Karnataka",
+"Tamil Nadu","Odisha","Delhi","Himachal Pradesh","Uttarakhand"),
+"Arsenic":(7.2 ,9.2 ,7.8 ,8.5 ,6.1 ,4.2 ,3.9 ,2.1 ,2.8 ,3.1 ,3.4 ,3.8 ,4.2 ,2.3 ,1.9 ,2.1 ,5.1 ,4.5 ,2.1 ,1.8 ),
+"Fluoride":(4.2 ,2.1 ,2.3 ,1.8 ,3.1 ,8.1 ,7.2 ,8.9 ,7.2 ,5.8 ,6.1 ,7.1 ,4.8 ,5.2 ,6.9 ,7.8 ,3.2 ,4.1 ,3.1 ,2.9 ),
+"Lead":(5.8 ,4.2 ,5.1 ,3.8 ,6.2 ,3.9 ,4.2 ,3.2 ,4.8 ,4.1 ,3.9 ,4.2 ,4.1 ,5.1 ,2.8 ,3.1 ,3.8 ,6.8 ,2.1 ,1.9 ),
+"Population":(231 ,91 ,128 ,35 ,38 ,53 ,39 ,79 ,68 ,30 ,29 ,85 ,30 ,124 ,67 ,77 ,46 ,32 ,8 ,11 ),
+}
+
+
+def prepare (df ):
+    import pandas as pd 
+    names ={c .lower ():c for c in (*LEVELS ,*HAZARDS ,WEIGHT )}
+    df =df .rename (columns =lambda c :names .get (str (c ).lower (),c ))
+    missing =[c for c in (*HAZARDS ,WEIGHT )if c not in df ]
+    if missing :
+        raise ValueError (f"risk table is missing column(s) {missing }")
+    out =pd .DataFrame (index =df .index )
+    for c in LEVELS :
+        if c in df :
+            out [c ]=df [c ].astype ("category")
+    for c in (*HAZARDS ,WEIGHT ):
+        out [c ]=df [c ].astype (np .float64 )
+    return out 
+
+
+def state_table ():
+    import pandas as pd 
+    return prepare (pd .DataFrame (STATE_SCORES ))
+
+
+def read (path ,columns =None ):
+    import pandas as pd 
+    path =Path (path )
+    if path .suffix in (".parquet",".pq"):
+        try :
+            df =pd .read_parquet (path ,columns =columns )
+        except ImportError as exc :
+            raise ImportError ("reading Parquet needs pyarrow (pip install pyarrow)")from exc 
+    elif path .suffix in (".feather",".arrow"):
+        df =pd .read_feather (path ,columns =columns )
+    else :
+        df =pd .read_csv (path ,usecols =columns ,dtype ={c :"category"for c in LEVELS }
+        if columns is None else None )
+    return prepare (df )
+
+
+def rollup (df ,level ="State"):
+    import pandas as pd 
+    if level not in df :
+        raise KeyError (f"no {level !r} column; available levels: {[c for c in LEVELS if c in df ]}")
+    w =df [WEIGHT ].to_numpy ()
+    w =np .where (np .isfinite (w ),w ,0.0 )
+    cols ={}
+    for c in HAZARDS :
+        v =df [c ].to_numpy ()
+        ok =np .isfinite (v )
+        if ok .all ():
+            cols [c ]=v *w 
+        else :
+            cols [c ]=np .where (ok ,v ,0.0 )*w 
+            cols [f"{c } {WEIGHT }"]=np .where (ok ,w ,0.0 )
+    cols [WEIGHT ]=w 
+    parts =pd .DataFrame (cols ,index =df .index )
+    parts ["Sites"]=1 
+    parts [level ]=df [level ]
+    g =parts .groupby (level ,observed =True ,sort =False ).sum ()
+    out =pd .DataFrame (index =g .index )
+    for c in HAZARDS :
+        out [c ]=g [c ]/g [f"{c } {WEIGHT }"if f"{c } {WEIGHT }"in g else WEIGHT ]
+    out [WEIGHT ]=g [WEIGHT ]
+    out ["Sites"]=g ["Sites"].astype (np .int64 )
+    out ["Combined"]=out [list (HAZARDS )].mean (axis =1 )
+    out ["Pop_At_Risk"]=out [WEIGHT ]*out ["Combined"]/10 
+    out =out .reset_index ()
+    out [level ]=out [level ].astype (str )
+    return out .sort_values ("Combined",ascending =False ).reset_index (drop =True )
+
+
+def rollups (df ,levels =LEVELS ):
+    return {level :rollup (df ,level )for level in levels if level in df }
+
+
+def synthetic_wells (n ,seed =0 ):
+    import pandas as pd 
+    g =np .random .default_rng (seed )
+    states =state_table ()
+    k =g .integers (len (states ),size =n )
+    out =pd .DataFrame ({
+    "State":pd .Categorical .from_codes (k ,STATE_SCORES ["State"]),
+    "District":pd .Categorical .from_codes (k *40 +g .integers (40 ,size =n ),
+    [f"{s } D{d :02d}"for s in STATE_SCORES ["State"]for d in range (40 )]),
+    "Basin":pd .Categorical .from_codes (k %6 ,["Ganga","Brahmaputra","Indus","Godavari","Krishna","Cauvery"]),
+    })
+    for c in HAZARDS :
+        out [c ]=np .clip (states [c ].to_numpy ()[k ]+g .normal (0 ,1.0 ,n ),0 ,10 )
+    out [WEIGHT ]=states [WEIGHT ].to_numpy ()[k ]/np .bincount (k ,minlength =len (states ))[k ]
+    return out 
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.risk",
+    description ="Roll up groundwater risk indices to district/state/basin")
+    ap .add_argument ("table",nargs ="?",help ="well/district table (.parquet, .feather or .csv); default: built-in state scores")
+    ap .add_argument ("--level",choices =LEVELS ,default ="State")
+    ap .add_argument ("--top",type =int ,default =10 )
+    ap .add_argument ("--synthetic",type =int ,metavar ="N",help ="roll up N synthetic wells instead")
+    args =ap .parse_args (argv )
+
+    if args .synthetic :
+        df =synthetic_wells (args .synthetic )
+    else :
+        df =read (args .table )if args .table else state_table ()
+    t0 =time .perf_counter ()
+    out =rollup (df ,args .level )
+    dt =time .perf_counter ()-t0 
+    print (f"  {len (df ):,} rows → {len (out ):,} {args .level .lower ()} rows in {1e3 *dt :.0f} ms")
+    print (out .head (args .top ).to_string (index =False ,float_format =lambda v :f"{v :.2f}"))
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
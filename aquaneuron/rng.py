@@ -0,0 +1,55 @@
+"""
+AquaNeuron  —  Random Streams
+Independent numpy.random.Generator streams per simulation component,
+derived from one root seed with SeedSequence spawn keys, so results do
+not depend on call order, process or core.
+"""
+
+import os 
+import numpy as np 
+
+ROOT_SEED =2026 
+ENV_SEED ="AQUANEURON_SEED"
+
+COMPONENTS =(
+"bootstrap",
+"measurement",
+"monte_carlo_lod",
+"drift",
+"dataset",
+"embedding",
+"validation",
+"simulation",
+)
+
+
+def root_seed ():
+    return int (os .environ .get (ENV_SEED ,ROOT_SEED ))
+
+
+def seed_sequence (component ,*keys ,root =None ):
+    if component not in COMPONENTS :
+        raise KeyError (f"unknown RNG component {component !r}; registered: {COMPONENTS }")
+    root =root_seed ()if root is None else root 
+    return np .random .SeedSequence (root ,spawn_key =(COMPONENTS .index (component ),*map (int ,keys )))
+
+
+def generator (component ,*keys ,root =None ):
+    return np .random .Generator (np .random .PCG64 (seed_sequence (component ,*keys ,root =root )))
+
+
+def child (seed ,i ):
+    return np .random .SeedSequence (seed .entropy ,spawn_key =(*seed .spawn_key ,int (i )),pool_size =seed .pool_size )
+
+
+def spawn (seed ,n ):
+    seed =seed if isinstance (seed ,np .random .SeedSequence )else np .random .SeedSequence (seed )
+    return [np .random .Generator (np .random .PCG64 (s ))for s in seed .spawn (n )]
+
+
+def as_generator (seed =None ,component ="simulation"):
+    if isinstance (seed ,np .random .Generator ):
+        return seed 
+    if seed is None :
+        return generator (component )
+    return np .random .default_rng (seed )
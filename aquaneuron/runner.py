@@ -0,0 +1,133 @@
+"""
+AquaNeuron  —  Figure Runner
+Renders the figure suite in a pool of spawned workers, one fresh process
+per figure even at -j 1, and reports wall time, CPU time and the peak RSS
+of that figure's process.
+
+    python -m aquaneuron [--figures fig1 fig4] [--jobs N] [--out DIR] [--no-cache]
+    python -m aquaneuron --trace trace.json [--trace-format chrome] [--trace-memory]
+"""
+
+import argparse 
+import os 
+import sys 
+import time 
+from collections import namedtuple 
+from concurrent .futures import ProcessPoolExecutor ,as_completed 
+import multiprocessing as mp 
+from .rng import ENV_SEED ,ROOT_SEED 
+from .selection import ENV_JOBS ,cpu_budget 
+from .import trace 
+
+try :
+    import resource 
+except ImportError :
+    resource =None 
+
+FIGURES ={
+"fig1":"fig1_isotherms",
+"fig2":"fig2_sensor",
+"fig3":"fig3_india",
+"fig4":"fig4_ai",
+"fig5":"fig5_comparison",
+"fig6":"fig6_selectivity",
+"fig7":"fig7_architecture",
+"fig8":"fig8_validation",
+}
+
+FigureRun =namedtuple ("FigureRun",["name","wall","cpu","peak_rss_mb","trace"],defaults =(None ,))
+
+
+def _set_budget (cores ):
+    os .environ [ENV_JOBS ]=str (cores )
+
+
+def _peak_rss_mb ():
+    if resource is None :
+        return float ("nan")
+    rss =resource .getrusage (resource .RUSAGE_SELF ).ru_maxrss 
+    return rss /(1024 *1024 )if sys .platform =="darwin"else rss /1024 
+
+
+def render (name ,out_dir =None ,tracing =None ):
+    import warnings 
+    from .import figures 
+    if out_dir is not None :
+        figures .DIR =str (out_dir )
+    warnings .filterwarnings ("ignore")
+    if tracing is not None :
+        trace .enable (memory =tracing =="memory")
+    t0 ,c0 =time .perf_counter (),time .process_time ()
+    try :
+        getattr (figures ,FIGURES [name ])()
+    finally :
+        tracer =trace .disable ()if tracing is not None else None 
+    return FigureRun (name ,time .perf_counter ()-t0 ,time .process_time ()-c0 ,_peak_rss_mb (),
+    tracer .state ()if tracer is not None else None )
+
+
+def run (names =None ,jobs =1 ,out_dir =None ,tracing =None ):
+    names =list (FIGURES )if not names else list (names )
+    unknown =[n for n in names if n not in FIGURES ]
+    if unknown :
+        raise ValueError (f"unknown figure(s) {unknown }; choose from {list (FIGURES )}")
+    ctx =mp .get_context ("spawn")
+    cores =cpu_budget ()
+    workers =max (1 ,min (cpu_budget (jobs ),len (names )))
+    with ProcessPoolExecutor (max_workers =workers ,mp_context =ctx ,max_tasks_per_child =1 ,
+    initializer =_set_budget ,initargs =(max (1 ,cores //workers ),))as pool :
+        futures =[pool .submit (render ,name ,out_dir ,tracing )for name in names ]
+        for fut in as_completed (futures ):
+            yield fut .result ()
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron",description ="Render the AquaNeuron figure suite")
+    ap .add_argument ("--figures",nargs ="+",metavar ="FIG",choices =list (FIGURES ),default =None )
+    ap .add_argument ("--jobs","-j",type =int ,default =1 ,help ="worker processes (0 = one per CPU)")
+    ap .add_argument ("--out",default =None ,help ="output directory (default: output)")
+    ap .add_argument ("--list",action ="store_true",help ="list figures and exit")
+    ap .add_argument ("--no-cache",action ="store_true",help ="recompute cached numerics")
+    ap .add_argument ("--seed",type =int ,default =None ,help =f"root seed (default {ROOT_SEED })")
+    ap .add_argument ("--trace",default =None ,metavar ="PATH",help ="record timing spans and write them here")
+    ap .add_argument ("--trace-format",choices =("json","chrome"),default ="json")
+    ap .add_argument ("--trace-memory",action ="store_true",help ="also record tracemalloc peaks (slower)")
+    args =ap .parse_args (argv )
+    if args .seed is not None :
+        os .environ [ENV_SEED ]=str (args .seed )
+    if args .no_cache :
+        os .environ ["AQUANEURON_CACHE"]="off"
+    if args .list :
+        for name ,fn in FIGURES .items ():
+            print (f"  {name }  {fn }")
+        return 0 
+
+    print ("\n"+"═"*62 )
+    print ("  AquaNeuron  —  Simulation Suite")
+    print ("  Prateek Tiwari · Raghav Khandelia")
+    print ("  Aroush Muglikar · Shreyas Roy")
+    print ("  SJWP India 2026")
+    print ("═"*62 )
+
+    t0 =time .perf_counter ()
+    tracing =None if args .trace is None else "memory"if args .trace_memory else "time"
+    runs =sorted (run (args .figures ,args .jobs ,args .out ,tracing ),key =lambda r :list (FIGURES ).index (r .name ))
+    total =time .perf_counter ()-t0 
+
+    print (f"\n  {'figure':<20}{'wall (s)':>10}{'cpu (s)':>10}{'peak RSS (MB)':>16}")
+    for r in runs :
+        print (f"  {FIGURES [r .name ]:<20}{r .wall :>10.2f}{r .cpu :>10.2f}{r .peak_rss_mb :>16.0f}")
+    print (f"  {'total':<20}{total :>10.2f}{sum (r .cpu for r in runs ):>10.2f}")
+    if args .trace is not None :
+        merged =trace .Tracer ()
+        for r in runs :
+            merged .merge (r .trace )
+        trace .report (merged .state (),top =15 )
+        print (f"\n✓ Saved: {trace .save (merged .state (),args .trace ,args .trace_format )}")
+    print (f"\n  {len (runs )} figure(s) generated successfully.")
+    print ("═"*62 +"\n")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
@@ -0,0 +1,212 @@
+"""
+AquaNeuron  —  Model Selection
+Cross-validation and hyperparameter grids for the edge forest, run as
+(parameter set × fold) tasks over a process pool that reads the scaled
+features from shared memory; reports accuracy against model size and
+packed single-reading latency.
+
+    python -m aquaneuron.selection [--grid n_estimators=50,100,500 max_depth=8,12] [-j 0] [--target 0.97]
+"""
+
+import argparse 
+import itertools 
+import json 
+import multiprocessing as mp 
+import os 
+import sys 
+import time 
+from collections import namedtuple 
+from concurrent .futures import ProcessPoolExecutor 
+from multiprocessing import shared_memory 
+import numpy as np 
+from .forest import ARRAYS ,pack 
+from .model import FOREST_PARAMS 
+from .rng import ROOT_SEED ,seed_sequence 
+from .trace import traced 
+
+GRID ={"n_estimators":(25 ,50 ,100 ,250 ,500 ),"max_depth":(6 ,8 ,12 ),"min_samples_leaf":(2 ,)}
+TARGET =0.97 
+ENV_JOBS ="AQUANEURON_JOBS"
+
+FoldResult =namedtuple ("FoldResult",["params","fold","accuracy","n_nodes","size_kb","latency_ms","fit_s"])
+
+_SHARED ={}
+
+
+def expand (grid ):
+    keys =list (grid )
+    return [dict (zip (keys ,values ))for values in itertools .product (*(grid [k ]for k in keys ))]
+
+
+def cpu_budget (jobs =0 ):
+    budget =int (os .environ .get (ENV_JOBS )or 0 )
+    if budget >0 :
+        return min (jobs ,budget )if jobs >0 else budget 
+    return jobs if jobs >0 else os .cpu_count ()or 1 
+
+
+def plan (n_tasks ,jobs =0 ):
+    cores =cpu_budget (jobs )
+    outer =max (1 ,min (n_tasks ,cores ))
+    return outer ,max (1 ,cores //outer )
+
+
+def _share (arr ):
+    shm =shared_memory .SharedMemory (create =True ,size =max (arr .nbytes ,1 ))
+    np .ndarray (arr .shape ,arr .dtype ,buffer =shm .buf )[...]=arr 
+    return shm ,(shm .name ,arr .shape ,arr .dtype .str )
+
+
+def _attach (name ,shape ,dtype ):
+    shm =shared_memory .SharedMemory (name =name )
+    return shm ,np .ndarray (shape ,np .dtype (dtype ),buffer =shm .buf )
+
+
+def _init (x_spec ,y_spec ,n_splits ,seed ,cores =1 ):
+    os .environ [ENV_JOBS ]=str (cores )
+    from sklearn .model_selection import StratifiedKFold 
+    shm_x ,X =_attach (*x_spec )
+    shm_y ,y =_attach (*y_spec )
+    folds =list (StratifiedKFold (n_splits ,shuffle =True ,random_state =seed ).split (X ,y ))
+    _SHARED .update (X =X ,y =y ,folds =folds ,handles =(shm_x ,shm_y ))
+
+
+def _latency_ms (packed ,x ,repeat =50 ):
+    packed .predict_proba (x )
+    t =[]
+    for _ in range (repeat ):
+        t0 =time .perf_counter ()
+        packed .predict_proba (x )
+        t .append (time .perf_counter ()-t0 )
+    return 1e3 *float (np .median (t ))
+
+
+def _fit_fold (params ,fold ,n_jobs =1 ,latency =True ):
+    from sklearn .ensemble import RandomForestClassifier 
+    X ,y =_SHARED ["X"],_SHARED ["y"]
+    tr ,te =_SHARED ["folds"][fold ]
+    t0 =time .perf_counter ()
+    rf =RandomForestClassifier (**{**params ,"n_jobs":n_jobs }).fit (X [tr ],y [tr ])
+    fit_s =time .perf_counter ()-t0 
+    acc =float (np .mean (rf .predict (X [te ])==y [te ]))
+    packed =pack (rf )
+    size_kb =sum (getattr (packed ,a ).nbytes for a in ARRAYS )/1024 
+    lat =_latency_ms (packed ,X [te [:1 ]])if latency else float ("nan")
+    return FoldResult (params ,fold ,acc ,int (len (packed .feature )),size_kb ,lat ,fit_s )
+
+
+@traced ()
+def search (X ,y ,grid =None ,n_splits =5 ,jobs =0 ,seed =42 ,base =None ,latency =True ):
+    base ={**FOREST_PARAMS ,**(base or {})}
+    candidates =[{**base ,**p }for p in expand (grid if grid is not None else GRID )]
+    tasks =[(p ,f )for p in candidates for f in range (n_splits )]
+    outer ,inner =plan (len (tasks ),jobs )
+    X =np .ascontiguousarray (X ,dtype =np .float32 )
+    y =np .ascontiguousarray (y )
+    if outer ==1 :
+        _SHARED .clear ()
+        from sklearn .model_selection import StratifiedKFold 
+        folds =list (StratifiedKFold (n_splits ,shuffle =True ,random_state =seed ).split (X ,y ))
+        _SHARED .update (X =X ,y =y ,folds =folds )
+        try :
+            results =[_fit_fold (p ,f ,inner ,latency )for p ,f in tasks ]
+        finally :
+            _SHARED .clear ()
+    else :
+        shm_x ,x_spec =_share (X )
+        shm_y ,y_spec =_share (y )
+        try :
+            with ProcessPoolExecutor (outer ,mp_context =mp .get_context ("spawn"),initializer =_init ,
+            initargs =(x_spec ,y_spec ,n_splits ,seed ,inner ))as pool :
+                futures =[pool .submit (_fit_fold ,p ,f ,inner ,latency )for p ,f in tasks ]
+                results =[f .result ()for f in futures ]
+        finally :
+            for shm in (shm_x ,shm_y ):
+                shm .close ()
+                shm .unlink ()
+    return summarize (results ,candidates )
+
+
+def summarize (results ,candidates ):
+    rows =[]
+    for p in candidates :
+        fr =[r for r in results if r .params ==p ]
+        acc =np .array ([r .accuracy for r in fr ])
+        lat =[r .latency_ms for r in fr if np .isfinite (r .latency_ms )]
+        rows .append ({
+        "params":{k :p [k ]for k in p if k not in ("n_jobs",)},
+        "accuracy":acc ,
+        "mean_accuracy":float (acc .mean ()),
+        "std_accuracy":float (acc .std ()),
+        "n_nodes":float (np .mean ([r .n_nodes for r in fr ])),
+        "size_kb":float (np .mean ([r .size_kb for r in fr ])),
+        "latency_ms":float (np .median (lat ))if lat else float ("nan"),
+        "fit_s":float (np .mean ([r .fit_s for r in fr ])),
+        })
+    return rows 
+
+
+def select (rows ,target =TARGET ):
+    ok =[r for r in rows if r ["mean_accuracy"]>=target ]
+    if not ok :
+        return None 
+    return min (ok ,key =lambda r :(r ["size_kb"],r ["latency_ms"]))
+
+
+def cross_validate (X ,y ,params ,n_splits =5 ,jobs =0 ,seed =42 ):
+    rows =search (X ,y ,grid ={},n_splits =n_splits ,jobs =jobs ,seed =seed ,base =params ,latency =False )
+    return rows [0 ]["accuracy"]
+
+
+def _parse_grid (items ):
+    grid ={}
+    for item in items :
+        key ,_ ,values =item .partition ("=")
+        grid [key ]=tuple (json .loads (v )for v in values .split (","))
+    return grid 
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.selection",
+    description ="Parallel CV and grid search for the edge forest")
+    ap .add_argument ("--grid",nargs ="*",metavar ="KEY=V1,V2",help ="parameter grid (default: built-in)")
+    ap .add_argument ("--data",help ="dataset written by python -m aquaneuron.dataset")
+    ap .add_argument ("--n-per",type =int ,default =300 )
+    ap .add_argument ("--folds",type =int ,default =5 )
+    ap .add_argument ("-j","--jobs",type =int ,default =0 ,help ="total cores to use (0 = all)")
+    ap .add_argument ("--target",type =float ,default =TARGET )
+    ap .add_argument ("--seed",type =int ,default =ROOT_SEED )
+    ap .add_argument ("--json",help ="write the results table to this file")
+    args =ap .parse_args (argv )
+
+    if args .data :
+        from .dataset import load 
+        X ,y =load (args .data )
+    else :
+        from .model import synthetic_readings 
+        X ,y =synthetic_readings (args .n_per ,seed_sequence ("dataset",root =args .seed ))
+    Xs =(X -X .mean (axis =0 ))/X .std (axis =0 )
+    grid =_parse_grid (args .grid )if args .grid else GRID 
+    n_tasks =len (expand (grid ))*args .folds 
+    outer ,inner =plan (n_tasks ,args .jobs )
+    print (f"  {n_tasks } fits: {outer } worker(s) × {inner } forest thread(s)")
+    t0 =time .perf_counter ()
+    rows =search (Xs ,y ,grid ,args .folds ,args .jobs )
+    best =select (rows ,args .target )
+    keys =list (grid )
+    print ("  "+"".join (f"{k :>18}"for k in keys )+f"{'accuracy':>16}{'nodes':>10}{'size kB':>10}{'latency ms':>12}")
+    for r in rows :
+        mark ="  ◀"if r is best else ""
+        print ("  "+"".join (f"{r ['params'][k ]!s:>18}"for k in keys )
+        +f"{r ['mean_accuracy']:>10.4f}±{r ['std_accuracy']:.3f}{r ['n_nodes']:>10.0f}{r ['size_kb']:>10.1f}{r ['latency_ms']:>12.3f}{mark }")
+    print (f"  {time .perf_counter ()-t0 :.1f} s")
+    if best is None :
+        print (f"  no parameter set reaches {args .target :.1%}")
+    if args .json :
+        with open (args .json ,"w")as fh :
+            json .dump ([{**r ,"accuracy":r ["accuracy"].tolist ()}for r in rows ],fh ,indent =2 )
+    return 0 if best is not None else 1 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
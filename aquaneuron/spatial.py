@@ -0,0 +1,345 @@
+"""
+AquaNeuron  —  Spatial Interpolation
+Continuous As/F/Pb surfaces from scattered wells: KD-tree neighbour
+search on the sphere, inverse-distance or local ordinary kriging, and
+national grids processed tile by tile across worker processes.
+
+    python -m aquaneuron.spatial [wells.csv] [--synthetic 200000] [--res 0.01] [--method kriging] [-j 0] [--out surface.npy]
+"""
+
+import argparse 
+import multiprocessing as mp 
+import os 
+import sys 
+import time 
+from collections import deque ,namedtuple 
+from concurrent .futures import ProcessPoolExecutor 
+from pathlib import Path 
+import numpy as np 
+from .risk import HAZARDS 
+from .rng import ROOT_SEED ,as_generator ,seed_sequence 
+
+EARTH_KM =6371.0 
+INDIA =(68.0 ,98.0 ,6.0 ,37.0 )
+METHODS =("idw","kriging")
+TILE =256 
+BATCH =4096 
+MAX_WEIGHT =100.0 
+
+Grid =namedtuple ("Grid",["lon0","lon1","lat0","lat1","res"])
+Variogram =namedtuple ("Variogram",["nugget","psill","range"])
+
+HOTSPOTS ={
+"Arsenic":((88.4 ,23.0 ,150 ,9.0 ),(85.5 ,25.6 ,120 ,7.5 ),(91.8 ,26.2 ,100 ,7.0 ),(75.8 ,30.9 ,90 ,4.5 )),
+"Fluoride":((74.5 ,26.5 ,250 ,8.5 ),(79.0 ,17.4 ,200 ,7.5 ),(72.5 ,23.0 ,150 ,6.0 ),(77.5 ,13.0 ,150 ,6.0 )),
+"Lead":((77.2 ,28.6 ,80 ,8.0 ),(85.3 ,23.6 ,120 ,6.5 ),(72.9 ,19.1 ,70 ,6.0 ),(80.3 ,13.1 ,70 ,5.0 )),
+}
+
+
+def shape (grid ):
+    return (int (round ((grid .lat1 -grid .lat0 )/grid .res )),int (round ((grid .lon1 -grid .lon0 )/grid .res )))
+
+
+def cells (grid ,r0 ,r1 ,c0 ,c1 ):
+    lat =grid .lat1 -(np .arange (r0 ,r1 )+0.5 )*grid .res 
+    lon =grid .lon0 +(np .arange (c0 ,c1 )+0.5 )*grid .res 
+    LON ,LAT =np .meshgrid (lon ,lat )
+    return LON .ravel (),LAT .ravel ()
+
+
+def tiles (grid ,tile =TILE ):
+    ny ,nx =shape (grid )
+    for r in range (0 ,ny ,tile ):
+        for c in range (0 ,nx ,tile ):
+            yield r ,min (r +tile ,ny ),c ,min (c +tile ,nx )
+
+
+def to_xyz (lon ,lat ):
+    lon ,lat =np .radians (lon ),np .radians (lat )
+    c =np .cos (lat )
+    return EARTH_KM *np .stack ([c *np .cos (lon ),c *np .sin (lon ),np .sin (lat )],axis =-1 )
+
+
+def _model (h ,v ):
+    return np .where (h >0 ,v .nugget +v .psill *-np .expm1 (-3.0 *h /v .range ),0.0 )
+
+
+def lag_pairs (xyz ,n_sample =20000 ,k =64 ,n_random =200000 ,seed =None ):
+    from scipy .spatial import cKDTree 
+    g =as_generator (seed )
+    n =len (xyz )
+    src =g .choice (n ,min (n_sample ,n ),replace =False )
+    d ,nb =cKDTree (xyz ).query (xyz [src ],k =min (k +1 ,n ))
+    i =np .concatenate ([np .repeat (src ,nb .shape [1 ]-1 ),g .integers (n ,size =n_random )])
+    j =np .concatenate ([nb [:,1 :].ravel (),g .integers (n ,size =n_random )])
+    keep =i !=j 
+    return i [keep ],j [keep ],10.0 *float (np .median (d [:,-1 ]))
+
+
+def fit_variogram (xyz ,z ,i ,j ,max_lag ,n_bins =24 ):
+    h =np .linalg .norm (xyz [i ]-xyz [j ],axis =1 )
+    sv =0.5 *(z [i ]-z [j ])**2 
+    edges =np .linspace (0 ,max_lag ,n_bins +1 )
+    b =np .digitize (h ,edges )-1 
+    ok =(b >=0 )&(b <n_bins )
+    cnt =np .bincount (b [ok ],minlength =n_bins )
+    gamma =np .bincount (b [ok ],sv [ok ],n_bins )/np .maximum (cnt ,1 )
+    lag =np .bincount (b [ok ],h [ok ],n_bins )/np .maximum (cnt ,1 )
+    use =cnt >0 
+    w =np .sqrt (cnt [use ])
+    best =None 
+    for r in np .geomspace (max_lag /50 ,max_lag *2 ,60 ):
+        M =np .stack ([np .ones (use .sum ()),-np .expm1 (-3.0 *lag [use ]/r )],axis =1 )
+        coef ,*_ =np .linalg .lstsq (M *w [:,None ],gamma [use ]*w ,rcond =None )
+        coef =np .maximum (coef ,0.0 )
+        err =np .sum ((w *(M @coef -gamma [use ]))**2 )
+        if best is None or err <best [0 ]:
+            best =(err ,coef ,r )
+    _ ,(nugget ,psill ),r =best 
+    total =max (nugget +psill ,np .var (z ),1e-12 )
+    return Variogram (max (nugget ,1e-6 *total ),max (psill ,1e-6 *total ),float (r ))
+
+
+def idw (dist ,values ,power =2.0 ):
+    exact =dist [:,:1 ]<=1e-9 
+    with np .errstate (divide ="ignore"):
+        w =np .where (exact ,(dist <=1e-9 ).astype (float ),1.0 /dist **power )
+    w /=w .sum (axis =1 ,keepdims =True )
+    return np .einsum ("mk,mkh->mh",w ,values )
+
+
+def krige (dist ,nbr_xyz ,values ,variograms ):
+    m ,k =dist .shape 
+    X =nbr_xyz -nbr_xyz [:,:1 ]
+    sq =np .einsum ("mkd,mkd->mk",X ,X )
+    D =np .sqrt (np .maximum (sq [:,:,None ]+sq [:,None ,:]-2.0 *(X @X .transpose (0 ,2 ,1 )),0.0 ))
+    D [:,np .arange (k ),np .arange (k )]=0.0 
+    est =np .empty ((m ,values .shape [2 ]))
+    var =np .empty_like (est )
+    A =np .ones ((m ,k +1 ,k +1 ))
+    A [:,k ,k ]=0.0 
+    b =np .ones ((m ,k +1 ))
+    for h ,v in enumerate (variograms ):
+        A [:,:k ,:k ]=_model (D ,v )
+        b [:,:k ]=_model (dist ,v )
+        sol =_solve (A ,b )
+        lam =sol [:,:k ]
+        est [:,h ]=np .einsum ("mk,mk->m",lam ,values [:,:,h ])
+        var [:,h ]=np .maximum (np .einsum ("mk,mk->m",lam ,b [:,:k ])+sol [:,k ],0.0 )
+        bad =~np .isfinite (est [:,h ])|~(np .abs (lam ).sum (axis =1 )<=MAX_WEIGHT )
+        if bad .any ():
+            est [bad ,h ]=idw (dist [bad ],values [bad ][:,:,h :h +1 ])[:,0 ]
+            var [bad ,h ]=v .nugget +v .psill 
+    return est ,var 
+
+
+def _solve (A ,b ):
+    try :
+        return np .linalg .solve (A ,b [...,None ])[...,0 ]
+    except np .linalg .LinAlgError :
+        sol =np .full (b .shape ,np .nan )
+        for i in range (len (A )):
+            try :
+                sol [i ]=np .linalg .solve (A [i ],b [i ])
+            except np .linalg .LinAlgError :
+                pass 
+        return sol 
+
+
+def merge_duplicates (lon ,lat ,values ):
+    keys ,inv ,cnt =np .unique (np .stack ([lon ,lat ],axis =1 ),axis =0 ,return_inverse =True ,return_counts =True )
+    if len (keys )==len (lon ):
+        return lon ,lat ,values 
+    inv =inv .ravel ()
+    merged =np .stack ([np .bincount (inv ,values [:,h ],len (keys ))for h in range (values .shape [1 ])],axis =1 )
+    return keys [:,0 ],keys [:,1 ],merged /cnt [:,None ]
+
+
+_STATE ={}
+
+
+def _init (xyz ,values ,method ,k ,power ,max_dist ,variograms ):
+    from scipy .spatial import cKDTree 
+    _STATE .update (tree =cKDTree (xyz ),xyz =xyz ,values =values ,method =method ,k =k ,power =power ,
+    max_dist =max_dist ,variograms =variograms )
+
+
+def _tile (grid ,r0 ,r1 ,c0 ,c1 ,batch =BATCH ):
+    s =_STATE 
+    lon ,lat =cells (grid ,r0 ,r1 ,c0 ,c1 )
+    q =to_xyz (lon ,lat )
+    h =s ["values"].shape [1 ]
+    est =np .full ((len (q ),h ),np .nan )
+    var =np .full ((len (q ),h ),np .nan )if s ["method"]=="kriging"else None 
+    for i in range (0 ,len (q ),batch ):
+        dist ,idx =s ["tree"].query (q [i :i +batch ],k =s ["k"])
+        dist ,idx =dist .reshape (len (dist ),-1 ),idx .reshape (len (idx ),-1 )
+        near =dist [:,0 ]<=s ["max_dist"]if s ["max_dist"]else np .ones (len (dist ),dtype =bool )
+        if not near .any ():
+            continue 
+        sl =np .arange (i ,i +len (dist ))[near ]
+        dist ,idx =dist [near ],idx [near ]
+        if s ["method"]=="idw":
+            est [sl ]=idw (dist ,s ["values"][idx ],s ["power"])
+        else :
+            est [sl ],var [sl ]=krige (dist ,s ["xyz"][idx ],s ["values"][idx ],s ["variograms"])
+    shp =(r1 -r0 ,c1 -c0 ,h )
+    out =est .reshape (shp ).transpose (2 ,0 ,1 ).astype (np .float32 )
+    return (r0 ,r1 ,c0 ,c1 ),out ,None if var is None else var .reshape (shp ).transpose (2 ,0 ,1 ).astype (np .float32 )
+
+
+def _results (grid ,args ,tile ,jobs ):
+    spans =list (tiles (grid ,tile ))
+    if jobs ==1 :
+        _init (*args )
+        for span in spans :
+            yield _tile (grid ,*span )
+        return 
+    with ProcessPoolExecutor (jobs ,mp_context =mp .get_context ("spawn"),initializer =_init ,initargs =args )as pool :
+        pending =deque ()
+        i =0 
+        try :
+            while i <len (spans )or pending :
+                while i <len (spans )and len (pending )<2 *jobs :
+                    pending .append (pool .submit (_tile ,grid ,*spans [i ]))
+                    i +=1 
+                yield pending .popleft ().result ()
+        finally :
+            for f in pending :
+                f .cancel ()
+
+
+def interpolate (lon ,lat ,values ,grid ,method ="idw",k =12 ,power =2.0 ,max_dist =100.0 ,tile =TILE ,jobs =1 ,
+out =None ,seed =None ):
+    if method not in METHODS :
+        raise ValueError (f"unknown method {method !r}; expected one of {METHODS }")
+    lon ,lat =np .asarray (lon ,dtype =float ),np .asarray (lat ,dtype =float )
+    values =np .asarray (values ,dtype =np .float64 ).reshape (len (lon ),-1 )
+    valid =np .isfinite (values )&(np .isfinite (lon )&np .isfinite (lat ))[:,None ]
+    ny ,nx =shape (grid )
+    full =(values .shape [1 ],ny ,nx )
+    if out is None :
+        est =np .full (full ,np .nan ,dtype =np .float32 )
+        var =np .full (full ,np .nan ,dtype =np .float32 )if method =="kriging"else None 
+    else :
+        out =Path (out )
+        est =np .lib .format .open_memmap (out ,mode ="w+",dtype =np .float32 ,shape =full )
+        var =(np .lib .format .open_memmap (out .with_name (out .stem +"_var.npy"),mode ="w+",dtype =np .float32 ,
+        shape =full )if method =="kriging"else None )
+    jobs =jobs or os .cpu_count ()or 1 
+    variograms =[None ]*values .shape [1 ]if method =="kriging"else None 
+    patterns ,group =np .unique (valid ,axis =1 ,return_inverse =True )
+    for g ,rows in enumerate (patterns .T ):
+        hz =np .flatnonzero (group .ravel ()==g )
+        if not rows .any ():
+            est [hz ]=np .nan 
+            if var is not None :
+                var [hz ]=np .nan 
+            if variograms is not None :
+                for h in hz :
+                    variograms [h ]=Variogram (np .nan ,np .nan ,np .nan )
+            continue 
+        wl ,wt ,wv =merge_duplicates (lon [rows ],lat [rows ],values [np .ix_ (rows ,hz )])
+        xyz =to_xyz (wl ,wt )
+        vg =None 
+        if method =="kriging":
+            i ,j ,max_lag =lag_pairs (xyz ,seed =seed or seed_sequence ("simulation"))
+            vg =tuple (fit_variogram (xyz ,wv [:,h ],i ,j ,max_lag )for h in range (len (hz )))
+            for h ,v in zip (hz ,vg ):
+                variograms [h ]=v 
+        args =(xyz ,wv ,method ,min (k ,len (xyz )),power ,max_dist ,vg )
+        for (r0 ,r1 ,c0 ,c1 ),e ,v in _results (grid ,args ,tile ,jobs ):
+            est [hz ,r0 :r1 ,c0 :c1 ]=e 
+            if var is not None :
+                var [hz ,r0 :r1 ,c0 :c1 ]=v 
+    variograms =None if variograms is None else tuple (variograms )
+    if out is not None :
+        est .flush ()
+        if var is not None :
+            var .flush ()
+    return est ,var ,variograms 
+
+
+def synthetic_wells (n ,noise =0.8 ,seed =None ):
+    g =as_generator (seed )
+    lon =g .uniform (INDIA [0 ],INDIA [1 ],n )
+    lat =g .uniform (INDIA [2 ],INDIA [3 ],n )
+    xyz =to_xyz (lon ,lat )
+    values =np .empty ((n ,len (HAZARDS )))
+    for h ,name in enumerate (HAZARDS ):
+        level =np .full (n ,1.5 )
+        for lon_c ,lat_c ,scale ,peak in HOTSPOTS [name ]:
+            d =np .linalg .norm (xyz -to_xyz (lon_c ,lat_c ),axis =1 )
+            level +=(peak -1.5 )*np .exp (-0.5 *(d /scale )**2 )
+        values [:,h ]=np .clip (level +g .normal (0 ,noise ,n ),0 ,10 )
+    return lon ,lat ,values 
+
+
+def read_wells (path ):
+    import pandas as pd 
+    df =pd .read_parquet (path )if Path (path ).suffix in (".parquet",".pq")else pd .read_csv (path )
+    cols ={str (c ).lower ():c for c in df .columns }
+    lon =cols .get ("lon")or cols .get ("longitude")
+    lat =cols .get ("lat")or cols .get ("latitude")
+    if lon is None or lat is None :
+        raise ValueError ("well table needs lon/lat (or longitude/latitude) columns")
+    hazards =[cols [h .lower ()]for h in HAZARDS if h .lower ()in cols ]
+    if not hazards :
+        raise ValueError (f"well table has none of the hazard columns {HAZARDS }")
+    return df [lon ].to_numpy (float ),df [lat ].to_numpy (float ),df [hazards ].to_numpy (float ),hazards 
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.spatial",
+    description ="Interpolate well measurements onto a national grid")
+    ap .add_argument ("wells",nargs ="?",help ="well table (.csv/.parquet) with lon, lat and hazard columns")
+    ap .add_argument ("--synthetic",type =int ,default =200000 ,metavar ="N",help ="synthetic wells when no table is given")
+    ap .add_argument ("--method",choices =METHODS ,default ="idw")
+    ap .add_argument ("--res",type =float ,default =0.05 ,help ="grid resolution (degrees)")
+    ap .add_argument ("--k",type =int ,default =12 ,help ="neighbours per cell")
+    ap .add_argument ("--power",type =float ,default =2.0 ,help ="IDW distance exponent")
+    ap .add_argument ("--max-dist",type =float ,default =100.0 ,help ="km to the nearest well beyond which cells stay empty")
+    ap .add_argument ("--tile",type =int ,default =TILE )
+    ap .add_argument ("--jobs","-j",type =int ,default =1 ,help ="worker processes (0 = one per CPU)")
+    ap .add_argument ("--out",default =None ,help ="write the (hazard, lat, lon) float32 surface to this .npy")
+    ap .add_argument ("--top",type =int ,default =10 ,help ="highest-priority cells to list")
+    ap .add_argument ("--seed",type =int ,default =None ,help =f"root seed (default {ROOT_SEED })")
+    args =ap .parse_args (argv )
+
+    seed =seed_sequence ("simulation",root =args .seed )
+    if args .wells :
+        lon ,lat ,values ,names =read_wells (args .wells )
+    else :
+        lon ,lat ,values =synthetic_wells (args .synthetic ,seed =seed .spawn (1 )[0 ])
+        names =list (HAZARDS )
+    grid =Grid (*INDIA ,args .res )
+    ny ,nx =shape (grid )
+    print (f"  {len (lon ):,} wells → {ny } × {nx } grid ({ny *nx /1e6 :.2f} M cells, {args .res }°), "
+    f"{args .method }, k={args .k }")
+    t0 =time .perf_counter ()
+    est ,var ,variograms =interpolate (lon ,lat ,values ,grid ,args .method ,args .k ,args .power ,args .max_dist ,
+    args .tile ,args .jobs ,args .out ,seed )
+    dt =time .perf_counter ()-t0 
+    print (f"  interpolated in {dt :.1f} s ({ny *nx /dt /1e6 :.2f} M cells/s)")
+    if variograms :
+        for name ,v in zip (names ,variograms ):
+            print (f"    {name :<9} variogram: nugget {v .nugget :.2f}, partial sill {v .psill :.2f}, range {v .range :.0f} km")
+    score =np .fmax .reduce (est if var is None else est +1.96 *np .sqrt (var ),axis =0 )
+    covered =np .isfinite (score )
+    print (f"  covered {covered .mean ():.1%} of cells; {'upper 95 % bound'if var is not None else 'estimate'} "
+    f"of the worst hazard ranks deployment priority:")
+    flat =np .where (covered ,score ,-np .inf ).ravel ()
+    top =np .argpartition (-flat ,min (args .top ,flat .size -1 ))[:args .top ]
+    top =top [np .argsort (-flat [top ])]
+    for i in top :
+        r ,c =divmod (int (i ),nx )
+        lon_c ,lat_c =cells (grid ,r ,r +1 ,c ,c +1 )
+        worst =names [int (np .nanargmax (est [:,r ,c ]))]
+        print (f"    {lat_c [0 ]:6.2f}°N {lon_c [0 ]:6.2f}°E  score {flat [i ]:5.2f}  ({worst })")
+    if args .out :
+        print (f"✓ Saved: {args .out }")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
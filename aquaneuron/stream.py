@@ -0,0 +1,197 @@
+"""
+AquaNeuron  —  Streaming Classification
+Chunked 50 Hz ADC feed -> windowed ΔR/R₀ features against a rolling
+baseline -> class predictions, in bounded memory, plus a replay mode
+that benchmarks recorded feeds offline at many times real-time.
+"""
+
+import argparse 
+import sys 
+import time 
+from collections import namedtuple 
+from pathlib import Path 
+import numpy as np 
+from .rng import ROOT_SEED ,as_generator ,generator ,seed_sequence 
+
+FS =50.0 
+N_APTAMER =3 
+COLUMNS =("R_As","R_F","R_Pb","pH","TDS","Temp")
+
+WindowBatch =namedtuple ("WindowBatch",["end","features","proba","label"])
+
+
+class StreamClassifier :
+    def __init__ (self ,model =None ,window =250 ,hop =50 ,baseline =None ,baseline_tau =3600.0 ,
+    fs =FS ,scale =1.0 ,offset =0.0 ,drift =None ,node =0 ,t0 =0.0 ):
+        if hop <1 or window <1 :
+            raise ValueError ("window and hop must be positive sample counts")
+        self .model =model 
+        self .window =int (window )
+        self .hop =int (hop )
+        self .fs =float (fs )
+        self .scale =np .broadcast_to (np .asarray (scale ,dtype =float ),(len (COLUMNS ),)).copy ()
+        self .offset =np .broadcast_to (np .asarray (offset ,dtype =float ),(len (COLUMNS ),)).copy ()
+        self .decay =float (np .exp (-self .hop /(baseline_tau *self .fs )))if baseline_tau else 1.0 
+        self .baseline =None if baseline is None else np .array (baseline ,dtype =float )
+        self .drift =drift 
+        self .node =int (node )
+        self .t0 =float (t0 )
+        self .reset ()
+
+    def reset (self ):
+        self ._tail =np .empty ((0 ,len (COLUMNS )))
+        self ._seen =0 
+        self ._b =None if self .baseline is None else self .baseline .copy ()
+        self ._known =None 
+
+    @property 
+    def samples_seen (self ):
+        return self ._seen 
+
+    def _window_ends (self ,n_new ):
+        first =self .window -1 
+        start =self ._seen 
+        stop =self ._seen +n_new 
+        k0 =max (0 ,-(-(start -first )//self .hop ))
+        ends =first +self .hop *np .arange (k0 ,max (k0 ,(stop -1 -first )//self .hop +1 ))
+        return ends [ends >=start ]
+
+    def features (self ,chunk ):
+        chunk =np .asarray (chunk ,dtype =float )
+        if chunk .ndim !=2 or chunk .shape [1 ]!=len (COLUMNS ):
+            raise ValueError (f"chunks must have shape (n, {len (COLUMNS )}) with columns {COLUMNS }")
+        ends =self ._window_ends (len (chunk ))
+        buf =np .concatenate ([self ._tail ,chunk *self .scale +self .offset ])
+        buf_start =self ._seen -len (self ._tail )
+        self ._seen +=len (chunk )
+        keep =min (self .window -1 ,len (buf ))
+        self ._tail =buf [len (buf )-keep :].copy ()
+        if ends .size ==0 :
+            return ends ,np .empty ((0 ,len (COLUMNS )))
+        csum =np .concatenate ([np .zeros ((1 ,buf .shape [1 ])),np .cumsum (buf ,axis =0 )])
+        hi =ends -buf_start +1 
+        means =(csum [hi ]-csum [hi -self .window ])/self .window 
+        feats =np .empty_like (means )
+        R =means [:,:N_APTAMER ]
+        if self .drift is not None :
+            known =self .drift .baseline (self .node )
+            if np .all (np .isfinite (known ))and (self ._known is None or not np .array_equal (known ,self ._known )):
+                self ._known =known .copy ()
+                self ._b =known .copy ()
+        if self ._b is None :
+            self ._b =R [0 ].copy ()
+        base =np .empty_like (R )
+        b =self ._b 
+        a =1.0 -self .decay 
+        for i in range (len (R )):
+            base [i ]=b 
+            b =b +a *(R [i ]-b )
+        self ._b =b 
+        feats [:,:N_APTAMER ]=(base -R )/base *100 
+        if self .drift is not None :
+            days =self .t0 +(ends +1 )/(self .fs *86400.0 )
+            feats [:,:N_APTAMER ]=self .drift .correct (self .node ,days ,feats [:,:N_APTAMER ])
+        feats [:,N_APTAMER :]=means [:,N_APTAMER :]
+        return ends ,feats 
+
+    def push (self ,chunk ):
+        ends ,feats =self .features (chunk )
+        if self .model is None or len (feats )==0 :
+            n =len (feats )
+            return WindowBatch (ends ,feats ,np .empty ((n ,0 )),np .full (n ,-1 ))
+        proba =np .atleast_2d (self .model .predict_proba (feats ))
+        return WindowBatch (ends ,feats ,proba ,np .argmax (proba ,axis =1 ))
+
+    def run (self ,chunks ):
+        for chunk in chunks :
+            out =self .push (chunk )
+            if len (out .end ):
+                yield out 
+
+
+def simulate_recording (targets ,segment_s =60.0 ,fs =FS ,R0 =1000.0 ,noise =0.4 ,tau =None ,rng =None ):
+    from .physics import channel_params 
+    rng =as_generator (rng ,"simulation")
+    targets =np .atleast_2d (np .asarray (targets ,dtype =float ))
+    tau =channel_params ("tau")if tau is None else np .asarray (tau ,dtype =float )
+    n_seg =int (round (segment_s *fs ))
+    out =np .empty ((len (targets )*n_seg ,len (COLUMNS )),dtype =np .float32 )
+    t =(np .arange (n_seg )/fs )[:,None ]
+    level =np .zeros (N_APTAMER )
+    for k ,row in enumerate (targets ):
+        dR =row [:N_APTAMER ]+(level -row [:N_APTAMER ])*np .exp (-t /tau )
+        level =dR [-1 ]
+        seg =out [k *n_seg :(k +1 )*n_seg ]
+        seg [:,:N_APTAMER ]=R0 *(1 -dR /100 )+rng .normal (0 ,noise ,(n_seg ,N_APTAMER ))
+        seg [:,N_APTAMER :]=row [N_APTAMER :]
+    return out 
+
+
+def replay (path ,chunk =500 ,realtime =False ,speed =1.0 ,fs =FS ):
+    path =Path (path )
+    if path .suffix ==".npy":
+        data =np .load (path ,mmap_mode ="r")
+    else :
+        data =np .memmap (path ,dtype =np .float32 ,mode ="r").reshape (-1 ,len (COLUMNS ))
+    t0 =time .perf_counter ()
+    for s in range (0 ,len (data ),chunk ):
+        if realtime :
+            lag =s /(fs *speed )-(time .perf_counter ()-t0 )
+            if lag >0 :
+                time .sleep (lag )
+        yield data [s :s +chunk ]
+
+
+def main (argv =None ):
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.stream",
+    description ="Simulate, replay and benchmark 50 Hz sensor feeds")
+    sub =ap .add_subparsers (dest ="cmd",required =True )
+    sim =sub .add_parser ("simulate",help ="write a synthetic recording (.npy)")
+    sim .add_argument ("out")
+    sim .add_argument ("--segments",type =int ,default =60 )
+    sim .add_argument ("--segment-s",type =float ,default =60.0 )
+    sim .add_argument ("--seed",type =int ,default =ROOT_SEED )
+    rep =sub .add_parser ("replay",help ="classify a recording offline and report throughput")
+    rep .add_argument ("recording")
+    rep .add_argument ("--model",default =None )
+    rep .add_argument ("--window",type =int ,default =250 )
+    rep .add_argument ("--hop",type =int ,default =50 )
+    rep .add_argument ("--chunk",type =int ,default =3000 )
+    rep .add_argument ("--realtime",action ="store_true")
+    rep .add_argument ("--speed",type =float ,default =1.0 )
+    args =ap .parse_args (argv )
+
+    if args .cmd =="simulate":
+        from .model import synthetic_readings 
+        g =generator ("simulation",root =args .seed )
+        X ,y =synthetic_readings (max (1 ,-(-args .segments //5 )),seed_sequence ("dataset",root =args .seed ))
+        order =g .permutation (len (X ))[:args .segments ]
+        rec =simulate_recording (X [order ],args .segment_s ,rng =g )
+        np .save (args .out ,rec )
+        print (f"✓ Saved: {args .out } ({len (rec )/FS /3600 :.2f} h at {FS :.0f} Hz)")
+        return 0 
+
+    model =None 
+    if args .model :
+        from .model import load 
+        model =load (args .model )
+    clf =StreamClassifier (model ,window =args .window ,hop =args .hop )
+    n_win ,counts =0 ,None 
+    t0 =time .perf_counter ()
+    for out in clf .run (replay (args .recording ,args .chunk ,args .realtime ,args .speed )):
+        n_win +=len (out .end )
+        if model is not None :
+            c =np .bincount (out .label ,minlength =len (model .classes ))
+            counts =c if counts is None else counts +c 
+    dt =time .perf_counter ()-t0 
+    feed_s =clf .samples_seen /clf .fs 
+    print (f"  {clf .samples_seen } samples ({feed_s :.0f} s of feed), {n_win } windows in {dt :.2f} s "
+    f"-> {feed_s /dt :.0f}x real-time")
+    if counts is not None :
+        for name ,c in zip (model .classes ,counts ):
+            print (f"    {name :<12}{c :>8}")
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
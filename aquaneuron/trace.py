@@ -0,0 +1,230 @@
+"""
+AquaNeuron  —  Instrumentation
+Nested timing spans (wall, process and thread CPU, tracemalloc peak) and counters for the
+simulation and inference stages. Disabled by default and close to free
+when off; records export as JSON or Chrome-trace for flame graphs.
+
+    python -m aquaneuron --trace trace.json [--trace-format chrome] [--trace-memory]
+    python -m aquaneuron.trace trace.json [--top 20]
+"""
+
+import functools 
+import json 
+import os 
+import sys 
+import threading 
+import time 
+import tracemalloc 
+from collections import defaultdict 
+from pathlib import Path 
+
+_tracer =None 
+
+
+class _Null :
+    def __enter__ (self ):
+        return self 
+
+    def __exit__ (self ,*exc ):
+        return False 
+
+
+_NULL =_Null ()
+
+
+class Span :
+    __slots__ =("tracer","name","attrs","path","depth","t0","c0","tc0","ts","base","pend")
+
+    def __init__ (self ,tracer ,name ,attrs ):
+        self .tracer ,self .name ,self .attrs =tracer ,name ,attrs 
+
+    def __enter__ (self ):
+        tr =self .tracer 
+        stack =tr .stack ()
+        parent =stack [-1 ]if stack else None 
+        self .path =f"{parent .path }/{self .name }"if parent else self .name 
+        self .depth =len (stack )
+        if tr .memory :
+            cur ,peak =tracemalloc .get_traced_memory ()
+            if parent is not None :
+                parent .pend =max (parent .pend ,peak )
+            tracemalloc .reset_peak ()
+            self .base =self .pend =cur 
+        stack .append (self )
+        self .ts =time .time_ns ()//1000 
+        self .c0 =time .process_time ()
+        self .tc0 =time .thread_time ()
+        self .t0 =time .perf_counter ()
+        return self 
+
+    def __exit__ (self ,*exc ):
+        wall =time .perf_counter ()-self .t0 
+        cpu =time .process_time ()-self .c0 
+        thread_cpu =time .thread_time ()-self .tc0 
+        tr =self .tracer 
+        stack =tr .stack ()
+        stack .pop ()
+        mem =None 
+        if tr .memory :
+            peak =max (self .pend ,tracemalloc .get_traced_memory ()[1 ])
+            mem =peak -self .base 
+            if stack :
+                stack [-1 ].pend =max (stack [-1 ].pend ,peak )
+            tracemalloc .reset_peak ()
+        tr .records .append ({"name":self .name ,"path":self .path ,"depth":self .depth ,"ts":self .ts ,
+        "wall":wall ,"cpu":cpu ,"thread_cpu":thread_cpu ,"mem_peak":mem ,"pid":os .getpid (),
+        "tid":threading .get_ident (),"attrs":self .attrs })
+        return False 
+
+
+class Tracer :
+    def __init__ (self ,memory =False ):
+        self .memory =memory 
+        self .records =[]
+        self .counters =defaultdict (float )
+        self ._local =threading .local ()
+        self ._started_tracemalloc =False 
+
+    def stack (self ):
+        try :
+            return self ._local .stack 
+        except AttributeError :
+            self ._local .stack =[]
+            return self ._local .stack 
+
+    def start (self ):
+        if self .memory and not tracemalloc .is_tracing ():
+            tracemalloc .start ()
+            self ._started_tracemalloc =True 
+        return self 
+
+    def stop (self ):
+        if self ._started_tracemalloc :
+            tracemalloc .stop ()
+            self ._started_tracemalloc =False 
+        return self 
+
+    def state (self ):
+        return {"records":list (self .records ),"counters":dict (self .counters )}
+
+    def merge (self ,state ):
+        self .records .extend (state ["records"])
+        for k ,v in state ["counters"].items ():
+            self .counters [k ]+=v 
+        return self 
+
+
+def enable (memory =False ):
+    global _tracer 
+    if _tracer is not None :
+        _tracer .stop ()
+    _tracer =Tracer (memory ).start ()
+    return _tracer 
+
+
+def disable ():
+    global _tracer 
+    tracer ,_tracer =_tracer ,None 
+    if tracer is not None :
+        tracer .stop ()
+    return tracer 
+
+
+def enabled ():
+    return _tracer is not None 
+
+
+def tracer ():
+    return _tracer 
+
+
+def span (name ,**attrs ):
+    if _tracer is None :
+        return _NULL 
+    return Span (_tracer ,name ,attrs )
+
+
+def count (name ,n =1 ):
+    if _tracer is not None :
+        _tracer .counters [name ]+=n 
+
+
+def traced (name =None ):
+    def decorate (fn ):
+        label =name or f"{fn .__module__ .rpartition ('.')[2 ]}.{fn .__qualname__ }"
+
+        @functools .wraps (fn )
+        def wrapper (*args ,**kwargs ):
+            if _tracer is None :
+                return fn (*args ,**kwargs )
+            with Span (_tracer ,label ,{}):
+                return fn (*args ,**kwargs )
+        return wrapper 
+    return decorate 
+
+
+def summarize (records ):
+    agg ={}
+    for r in records :
+        a =agg .setdefault (r ["path"],{"path":r ["path"],"depth":r ["depth"],"calls":0 ,"wall":0.0 ,
+        "cpu":0.0 ,"thread_cpu":0.0 ,"mem_peak":None })
+        a ["calls"]+=1 
+        a ["wall"]+=r ["wall"]
+        a ["cpu"]+=r ["cpu"]
+        a ["thread_cpu"]+=r .get ("thread_cpu",r ["cpu"])
+        if r ["mem_peak"]is not None :
+            a ["mem_peak"]=max (a ["mem_peak"]or 0 ,r ["mem_peak"])
+    return sorted (agg .values (),key =lambda a :-a ["wall"])
+
+
+def chrome_trace (state ):
+    events =[]
+    for r in state ["records"]:
+        args =dict (r ["attrs"],cpu_ms =round (r ["cpu"]*1e3 ,3 ),
+        thread_cpu_ms =round (r .get ("thread_cpu",r ["cpu"])*1e3 ,3 ))
+        if r ["mem_peak"]is not None :
+            args ["mem_peak_mb"]=round (r ["mem_peak"]/2 **20 ,3 )
+        events .append ({"name":r ["name"],"cat":"aquaneuron","ph":"X","ts":r ["ts"],
+        "dur":round (r ["wall"]*1e6 ,1 ),"pid":r ["pid"],"tid":r ["tid"],"args":args })
+    if events and state ["counters"]:
+        end =max (e ["ts"]+e ["dur"]for e in events )
+        events .extend ({"name":k ,"cat":"counter","ph":"C","ts":end ,"pid":events [0 ]["pid"],
+        "args":{"value":v }}for k ,v in state ["counters"].items ())
+    return {"traceEvents":events ,"displayTimeUnit":"ms"}
+
+
+def save (state ,path ,fmt ="json"):
+    path =Path (path )
+    path .parent .mkdir (parents =True ,exist_ok =True )
+    doc =chrome_trace (state )if fmt =="chrome"else dict (state ,summary =summarize (state ["records"]))
+    path .write_text (json .dumps (doc ,indent =None if fmt =="chrome"else 1 )+"\n")
+    return path 
+
+
+def report (state ,top =20 ,out =print ):
+    rows =summarize (state ["records"])[:top ]
+    out (f"\n  {'span':<52}{'calls':>7}{'wall (s)':>10}{'cpu (s)':>10}{'thread (s)':>11}{'peak (MB)':>11}")
+    for a in rows :
+        mem =""if a ["mem_peak"]is None else f"{a ['mem_peak']/2 **20 :.1f}"
+        label =a ["path"]if len (a ["path"])<=50 else "…"+a ["path"][-49 :]
+        out (f"  {label :<52}{a ['calls']:>7}{a ['wall']:>10.3f}{a ['cpu']:>10.3f}{a ['thread_cpu']:>11.3f}{mem :>11}")
+    for k ,v in sorted (state ["counters"].items ()):
+        out (f"  {k :<52}{v :>28g}")
+
+
+def main (argv =None ):
+    import argparse 
+    ap =argparse .ArgumentParser (prog ="python -m aquaneuron.trace",description ="Summarize a saved trace")
+    ap .add_argument ("path")
+    ap .add_argument ("--top",type =int ,default =20 )
+    args =ap .parse_args (argv )
+    doc =json .loads (Path (args .path ).read_text ())
+    if "records"not in doc :
+        print ("  not a JSON span trace (Chrome traces open in chrome://tracing or Perfetto)")
+        return 1 
+    report (doc ,args .top )
+    return 0 
+
+
+if __name__ =="__main__":
+    sys .exit (main ())
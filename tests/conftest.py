@@ -0,0 +1,13 @@
+import numpy as np 
+import pytest 
+
+
+@pytest .fixture (scope ="session")
+def artifact (tmp_path_factory ):
+    from aquaneuron .dataset import sample 
+    from aquaneuron .model import save ,train 
+    X ,y =sample (200 ,seed =np .random .SeedSequence (7 ),dtype =np .float64 )
+    X =X +np .random .default_rng (7 ).normal (0 ,1.0 ,X .shape )*np .array ([5 ,5 ,5 ,0.3 ,60 ,2 ])
+    path =tmp_path_factory .mktemp ("model")/"rf"
+    save (train (X ,y .astype (np .intp ),n_estimators =40 ,n_jobs =1 ),path )
+    return path 
@@ -0,0 +1,47 @@
+import json 
+import subprocess 
+import sys 
+from pathlib import Path 
+from aquaneuron .bench import BENCH_DIR ,CASES ,check_budgets ,compare 
+
+ROOT =Path (__file__ ).resolve ().parents [1 ]
+
+SCRIPT ="""
+from aquaneuron.bench import _artifact
+print(_artifact(5).parent)
+"""
+
+
+def test_artifact_directory_is_removed_at_exit ():
+    out =subprocess .run ([sys .executable ,"-c",SCRIPT ],capture_output =True ,text =True ,check =True ,
+    cwd =ROOT )
+    tmp =Path (out .stdout .strip ())
+    assert tmp .name .startswith ("aquaneuron-bench-")
+    assert not tmp .exists ()
+
+
+def _results (medians ):
+    return {"results":{k :{"median":v }for k ,v in medians .items ()}}
+
+
+def test_compare_classifies_each_case ():
+    base =_results ({"a[1]":1.0 ,"b[1]":1.0 ,"c[1]":1.0 ,"d[1]":1.0 })
+    cur =_results ({"a[1]":1.25 ,"b[1]":1.15 ,"c[1]":0.8 ,"d[1]":1.0 ,"e[1]":0.5 })
+    rows ={key :(ratio ,state )for key ,_ ,_ ,ratio ,state in compare (base ,cur ,threshold =0.2 )}
+    assert {k :s for k ,(_ ,s )in rows .items ()}=={
+    "a[1]":"regression","b[1]":"ok","c[1]":"faster","d[1]":"ok","e[1]":"new"}
+    assert rows ["a[1]"][0 ]==1.25 and rows ["e[1]"][0 ]is None 
+
+
+def test_check_budgets_reports_only_overruns ():
+    res =_results ({"predict_single[1]":2.5 ,"predict_batch[10000]":0.1 ,"other[1]":99.0 })["results"]
+    assert check_budgets (res )=={"predict_single[1]":(2.5 ,2.0 )}
+    assert check_budgets ({})=={}
+
+
+def test_committed_baseline_covers_every_quick_case ():
+    baseline =json .loads ((ROOT /BENCH_DIR /"baseline.json").read_text ())
+    keys ={f"{name }[{size }]"for name ,(_ ,_ ,quick )in CASES .items ()for size in quick }
+    assert keys <=set (baseline ["results"])
+    assert compare (baseline ,baseline )==[(k ,v ["median"],v ["median"],1.0 ,"ok")
+    for k ,v in baseline ["results"].items ()]
@@ -0,0 +1,52 @@
+import shutil 
+from pathlib import Path 
+import numpy as np 
+from aquaneuron import cache ,figures 
+from aquaneuron .cache import code_version ,dependencies ,memoize 
+
+
+def test_key_covers_callee_modules_but_not_plotting_code ():
+    deps ={
+    f :set (dependencies (f ))
+    for f in (figures .isotherm_bootstrap ,figures .lod_monte_carlo ,figures .forest_evaluation ,figures .tsne_embedding )
+    }
+    assert {"aquaneuron.fitting","aquaneuron.physics"}<=deps [figures .isotherm_bootstrap ]
+    assert {"aquaneuron.montecarlo","aquaneuron.physics"}<=deps [figures .lod_monte_carlo ]
+    assert {"aquaneuron.selection","aquaneuron.dataset"}<=deps [figures .forest_evaluation ]
+    assert "aquaneuron.embedding"in deps [figures .tsne_embedding ]
+    assert all ("aquaneuron.figures"not in d for d in deps .values ())
+
+
+def test_editing_a_callee_changes_the_code_version (tmp_path ,monkeypatch ):
+    pkg =tmp_path /"aquaneuron"
+    shutil .copytree (Path (cache .__file__ ).parent ,pkg ,ignore =shutil .ignore_patterns ("__pycache__"))
+    monkeypatch .setattr (cache ,"__file__",str (pkg /"cache.py"))
+    before =code_version (figures .lod_monte_carlo )
+    assert code_version (figures .lod_monte_carlo )==before 
+    with open (pkg /"montecarlo.py","a",encoding ="utf-8")as fh :
+        fh .write ("\nSTALE = 1\n")
+    assert code_version (figures .lod_monte_carlo )!=before 
+
+
+def test_memoize_round_trip (tmp_path ,monkeypatch ):
+    monkeypatch .setenv (cache .ENV_DIR ,str (tmp_path ))
+    calls =[]
+
+    @memoize 
+    def square (x ):
+        calls .append (x )
+        return {"y":np .asarray (x )**2 }
+
+    a =square (np .arange (4 ))
+    b =square (np .arange (4 ))
+    assert len (calls )==1 
+    np .testing .assert_array_equal (a ["y"],b ["y"])
+
+
+def test_library_upgrade_changes_the_code_version (monkeypatch ):
+    from importlib import metadata 
+    before =code_version (figures .lod_monte_carlo )
+    assert cache .library_versions ()["numpy"]==np .__version__ 
+    real =metadata .version 
+    monkeypatch .setattr (metadata ,"version",lambda lib :"0.0"if lib =="scikit-learn"else real (lib ))
+    assert code_version (figures .lod_monte_carlo )!=before 
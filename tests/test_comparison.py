@@ -0,0 +1,54 @@
+import numpy as np 
+from aquaneuron .comparison import MethodComparison ,accumulate ,merge_all 
+
+
+def _pairs (n ,seed =0 ):
+    g =np .random .default_rng (seed )
+    x =g .lognormal (2.0 ,1.0 ,n )
+    y =1.02 *x +0.3 +g .normal (0 ,0.5 ,n )
+    site =g .choice (np .array (["Kanpur","Patna","Malda","Ballia"]),n )
+    return x ,y ,site 
+
+
+def test_chunked_and_merged_equal_single_pass ():
+    x ,y ,site =_pairs (100000 )
+    edges =[1 ,10 ,50 ]
+    whole =MethodComparison (edges ).update (x ,y ,site )
+    parts =[]
+    for chunk in np .array_split (np .arange (len (x )),7 ):
+        acc =MethodComparison (edges )
+        for sub in np .array_split (chunk ,3 ):
+            acc .update (x [sub ],y [sub ],site [sub ])
+        parts .append (acc )
+    merged =parts [0 ]
+    for p in parts [1 :]:
+        merged .merge (p )
+    for k ,v in whole .summary ().items ():
+        np .testing .assert_allclose (merged .summary ()[k ],v ,rtol =1e-9 ,atol =1e-9 ,err_msg =k )
+    for s ,row in whole .site_table ().items ():
+        for k ,v in row .items ():
+            np .testing .assert_allclose (merged .site_table ()[s ][k ],v ,rtol =1e-9 ,atol =1e-9 ,err_msg =f"{s } {k }")
+    for (bounds ,a ),(_ ,b )in zip (whole .bin_table (),merged .bin_table ()):
+        for k in a :
+            np .testing .assert_allclose (b [k ],a [k ],rtol =1e-9 ,atol =1e-9 ,err_msg =f"{bounds } {k }")
+
+
+def test_summary_matches_numpy ():
+    x ,y ,_ =_pairs (20000 ,1 )
+    s =MethodComparison ().update (x ,y ).summary ()
+    d =y -x 
+    np .testing .assert_allclose (s ["bias"],d .mean (),rtol =1e-9 )
+    np .testing .assert_allclose (s ["sd_diff"],d .std (),rtol =1e-9 )
+    np .testing .assert_allclose (s ["r"],np .corrcoef (x ,y )[0 ,1 ],rtol =1e-9 )
+    np .testing .assert_allclose (s ["slope"],np .polyfit (x ,y ,1 )[0 ],rtol =1e-10 )
+
+
+def test_accumulate_groups_by_analyte ():
+    x ,y ,site =_pairs (3000 ,2 )
+    analyte =np .where (np .arange (3000 )%3 ==0 ,"As","F")
+    parts =[accumulate ([(analyte [s ],site [s ],x [s ],y [s ])])for s in np .array_split (np .arange (3000 ),4 )]
+    merged =merge_all (parts )
+    whole =accumulate ([(analyte ,site ,x ,y )])
+    assert set (merged )=={"As","F"}
+    for a in whole :
+        np .testing .assert_allclose (merged [a ].summary ()["bias"],whole [a ].summary ()["bias"],rtol =1e-9 )
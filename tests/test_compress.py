@@ -0,0 +1,57 @@
+import shutil 
+import subprocess 
+
+import numpy as np 
+import pytest 
+from aquaneuron .compress import CompactForest ,c_header ,evaluate ,prune ,quantize ,trees 
+from aquaneuron .model import load ,synthetic_readings 
+
+MAIN ="""
+#include <stdio.h>
+#include "forest.h"
+
+int main(void)
+{
+    int16_t x[6];
+    while (fread(x, sizeof x, 1, stdin) == 1)
+        printf("%d\\n", aquaneuron_forest_predict(x));
+    return 0;
+}
+"""
+
+
+@pytest .fixture (scope ="module")
+def compact (artifact ):
+    model =load (artifact ,engine ="sklearn")
+    pruned =[prune (t ,max_depth =6 )for t in trees (model .forest ,model .mean ,model .scale )]
+    return CompactForest .from_trees (pruned ,len (model .classes )),model .classes 
+
+
+@pytest .fixture (scope ="module")
+def readings ():
+    X ,_ =synthetic_readings (40 ,np .random .SeedSequence (11 ))
+    X =X *np .random .default_rng (11 ).normal (1 ,0.3 ,X .shape )
+    return quantize (X )
+
+
+def test_blob_round_trips_and_reference_agrees (compact ,readings ):
+    cf ,_ =compact 
+    blob =cf .to_bytes ()
+    back =CompactForest .from_bytes (blob )
+    np .testing .assert_array_equal (back .predict (readings ),cf .predict (readings ))
+    np .testing .assert_array_equal ([evaluate (blob ,x )for x in readings .tolist ()],cf .predict (readings ))
+
+
+def test_c_evaluator_agrees_with_python (compact ,readings ,tmp_path ):
+    cc =shutil .which ("cc")or shutil .which ("gcc")
+    if cc is None :
+        pytest .skip ("no C compiler")
+    cf ,classes =compact 
+    (tmp_path /"forest.h").write_text (c_header (cf .to_bytes (),classes ),encoding ="utf-8")
+    (tmp_path /"main.c").write_text (MAIN ,encoding ="utf-8")
+    exe =tmp_path /"predict"
+    subprocess .run ([cc ,"-std=c99","-O2","-Wall","-Werror","-o",str (exe ),str (tmp_path /"main.c")],
+    check =True ,cwd =tmp_path )
+    out =subprocess .run ([str (exe )],input =np .ascontiguousarray (readings ,dtype ="<i2").tobytes (),
+    capture_output =True ,check =True ).stdout 
+    np .testing .assert_array_equal (np .array (out .split (),dtype =np .intp ),cf .predict (readings ))
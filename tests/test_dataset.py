@@ -0,0 +1,14 @@
+import numpy as np 
+from aquaneuron .dataset import BLOCK ,iter_chunks ,sample 
+
+
+def test_dataset_does_not_depend_on_chunk_size ():
+    seed =np .random .SeedSequence (3 )
+    X ,y =sample (7000 ,seed =seed )
+    for chunk in (BLOCK ,3 *BLOCK ):
+        Xc ,yc =sample (7000 ,seed =seed ,chunk =chunk )
+        np .testing .assert_array_equal (Xc ,X )
+        np .testing .assert_array_equal (yc ,y )
+    parts =[(a .copy (),b .copy ())for a ,b in iter_chunks (7000 ,seed =seed ,chunk =2 *BLOCK )]
+    np .testing .assert_array_equal (np .concatenate ([a for a ,_ in parts ]),X )
+    np .testing .assert_array_equal (np .concatenate ([b for _ ,b in parts ]),y )
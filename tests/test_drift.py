@@ -0,0 +1,41 @@
+import warnings 
+import numpy as np 
+from aquaneuron .drift import STATE ,DriftCompensator 
+
+N ,C =np .array ([0 ]),np .array ([0 ])
+FILTER =[STATE .index (c )for c in ("log_gain","rate","p_gg","p_gr","p_rr")]
+
+
+def test_interleaved_baseline_and_invalid_updates_match_clean_sequence ():
+    clean ,noisy =DriftCompensator (1 ),DriftCompensator (1 )
+    clean .update (N ,C ,1.0 ,0.99 )
+    clean .update (N ,C ,3.0 ,0.97 )
+    with warnings .catch_warnings ():
+        warnings .simplefilter ("error")
+        noisy .update (N ,C ,1.0 ,0.99 )
+        noisy .update_baseline (N ,C ,2.0 ,1000.0 )
+        noisy .update (N ,C ,2.5 ,np .nan )
+        noisy .update (N ,C ,2.7 ,-1.0 )
+        noisy .update_baseline (N ,C ,2.8 ,1001.0 )
+        noisy .update (N ,C ,3.0 ,0.97 )
+    np .testing .assert_allclose (noisy .state [0 ,0 ,FILTER ],clean .state [0 ,0 ,FILTER ],rtol =1e-12 )
+
+
+def test_baseline_walk_applied_once_per_interval ():
+    clean ,noisy =DriftCompensator (1 ),DriftCompensator (1 )
+    for comp in (clean ,noisy ):
+        comp .update_baseline (N ,C ,0.0 ,1000.0 )
+    noisy .update (N ,C ,1.0 ,0.99 )
+    noisy .update_baseline (N ,C ,1.5 ,np .nan )
+    for comp in (clean ,noisy ):
+        comp .update_baseline (N ,C ,2.0 ,1002.0 )
+    np .testing .assert_allclose (noisy .baseline (0 ),clean .baseline (0 ))
+    np .testing .assert_allclose (noisy .state [...,STATE .index ("p_b")],clean .state [...,STATE .index ("p_b")])
+
+
+def test_load_accepts_states_saved_without_baseline_clock (tmp_path ):
+    comp =DriftCompensator (2 )
+    comp .update (np .arange (2 ),0 ,5.0 ,0.95 )
+    np .save (tmp_path /"old.npy",comp .state [...,:-1 ])
+    loaded =DriftCompensator .load (tmp_path /"old.npy")
+    np .testing .assert_array_equal (loaded .state [...,STATE .index ("t_b")],comp .state [...,STATE .index ("t")])
@@ -0,0 +1,48 @@
+import numpy as np 
+from aquaneuron .eis import PARAMS ,_impedance_jac ,fit ,random_circuits ,simulate 
+
+FREQ =np .logspace (-2 ,6 ,60 )
+RCT =PARAMS .index ("Rct")
+
+
+def _noisy (truth ,noise ,seed ):
+    g =np .random .default_rng (seed )
+    Z =simulate (FREQ ,truth )
+    return Z +np .abs (Z )*noise *(g .normal (size =Z .shape )+1j *g .normal (size =Z .shape ))/np .sqrt (2 )
+
+
+def test_noiseless_spectra_are_recovered_exactly ():
+    truth =random_circuits (100 ,rng =1 )
+    res =fit (FREQ ,simulate (FREQ ,truth ))
+    assert res .converged .all ()and res .n_failed ==0 
+    np .testing .assert_allclose (res .params ,truth ,rtol =1e-6 )
+
+
+def test_noisy_spectra_recover_rct ():
+    truth =random_circuits (300 ,rng =2 )
+    res =fit (FREQ ,_noisy (truth ,0.01 ,2 ))
+    assert res .n_failed ==int ((~res .converged ).sum ())==0 
+    err =np .abs (res .params [:,RCT ]/truth [:,RCT ]-1 )
+    assert np .median (err )<0.005 and np .percentile (err ,95 )<0.02 
+    assert np .median (res .rel_rms )<0.01 
+
+
+def test_failed_spectra_are_flagged ():
+    Z =simulate (FREQ ,random_circuits (4 ,rng =3 ))
+    Z [1 ,5 ]=np .nan 
+    with np .errstate (invalid ="ignore"):
+        res =fit (FREQ ,Z )
+    assert res .n_failed ==1 and not res .converged [1 ]
+    assert res .converged [[0 ,2 ,3 ]].all ()
+
+
+def test_jacobian_matches_finite_differences ():
+    p =random_circuits (3 ,rng =4 )
+    J =_impedance_jac (FREQ ,p )
+    for i in range (len (PARAMS )):
+        h =1e-6 *p [:,i ]
+        up ,down =p .copy (),p .copy ()
+        up [:,i ]+=h 
+        down [:,i ]-=h 
+        num =(simulate (FREQ ,up )-simulate (FREQ ,down ))/(2 *h [:,None ])
+        np .testing .assert_allclose (J [...,i ],num ,rtol =1e-5 ,atol =1e-9 *np .abs (num ).max ())
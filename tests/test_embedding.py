@@ -0,0 +1,27 @@
+import numpy as np 
+from aquaneuron .embedding import Embedding 
+from aquaneuron .model import synthetic_readings 
+
+
+def test_landmarks_project_onto_their_layout ():
+    X ,_ =synthetic_readings (60 ,np .random .SeedSequence (4 ))
+    emb =Embedding .fit (X ,n_landmarks =120 ,seed =np .random .SeedSequence (4 ))
+    Z =emb .standardize (X )
+    marks ={tuple (z )for z in emb .landmarks .tolist ()}
+    mask =np .array ([tuple (z )in marks for z in Z .tolist ()])
+    assert mask .sum ()==len (emb .layout )
+    out =emb .transform (X )
+    np .testing .assert_array_equal (out [mask ],emb .layout )
+    nudged =emb .transform (X [mask ]*(1 +1e-9 ))
+    np .testing .assert_allclose (nudged ,emb .layout ,atol =0.5 *np .ptp (emb .layout ))
+    assert not np .array_equal (nudged ,emb .layout )
+
+
+def test_state_without_labels_round_trips (tmp_path ):
+    X ,_ =synthetic_readings (40 ,np .random .SeedSequence (5 ))
+    emb =Embedding .fit (X ,n_landmarks =80 ,seed =np .random .SeedSequence (5 ))
+    assert "labels"not in emb .state ()
+    back =Embedding .load (emb .save (tmp_path /"map.npz"))
+    np .testing .assert_array_equal (back .transform (X ),emb .transform (X ))
+    legacy =dict (emb .state (),labels =np .zeros (len (emb .layout ),dtype =np .intp ))
+    np .testing .assert_array_equal (Embedding .from_state (legacy ).transform (X ),emb .transform (X ))
@@ -0,0 +1,43 @@
+import numpy as np 
+import pytest 
+from aquaneuron .fitting import fit_freundlich_batch ,fit_langmuir_batch 
+from aquaneuron .physics import ARSENIC ,freundlich ,langmuir 
+
+C =np .array ([0.5 ,1.0 ,2.0 ,5.0 ,10.0 ,20.0 ,50.0 ,100.0 ,200.0 ])
+
+
+def _replicates (f ,params ,n =60 ,noise =0.03 ,seed =0 ):
+    Q =f (C ,*params )
+    return Q *np .random .default_rng (seed ).normal (1 ,noise ,(n ,len (C )))
+
+
+def _scipy (f ,Q ,p0 ):
+    from scipy .optimize import curve_fit 
+
+    p =np .array ([curve_fit (f ,C ,q ,p0 =p0 ,maxfev =10000 )[0 ]for q in Q ])
+    pred =np .stack ([f (C ,*row )for row in p ])
+    r2 =1 -((Q -pred )**2 ).sum (axis =1 )/((Q -Q .mean (axis =1 ,keepdims =True ))**2 ).sum (axis =1 )
+    return p ,r2 
+
+
+@pytest .mark .parametrize ("f, fit, params",[
+(langmuir ,fit_langmuir_batch ,(ARSENIC .Qmax ,ARSENIC .Kd )),
+(freundlich ,fit_freundlich_batch ,(ARSENIC .Kf ,ARSENIC .n )),
+],ids =["langmuir","freundlich"])
+def test_batch_fit_matches_curve_fit (f ,fit ,params ):
+    Q =_replicates (f ,params )
+    res =fit (C ,Q ,p0 =params )
+    assert res .converged .all ()and res .n_failed ==0 
+    p ,r2 =_scipy (f ,Q ,params )
+    np .testing .assert_allclose (res .params ,p ,rtol =1e-5 )
+    np .testing .assert_allclose (res .r2 ,r2 ,atol =1e-9 )
+
+
+def test_failures_are_counted ():
+    Q =_replicates (langmuir ,(ARSENIC .Qmax ,ARSENIC .Kd ),n =10 )
+    Q [3 ]=np .nan 
+    res =fit_langmuir_batch (C ,Q ,p0 =(ARSENIC .Qmax ,ARSENIC .Kd ))
+    assert res .n_failed ==1 
+    assert not res .converged [3 ]and res .converged [np .arange (10 )!=3 ].all ()
+    short =fit_langmuir_batch (C ,Q ,p0 =(ARSENIC .Qmax ,ARSENIC .Kd ),max_iter =1 )
+    assert short .n_failed ==int ((~short .converged ).sum ())>1 
@@ -0,0 +1,39 @@
+import numpy as np 
+from aquaneuron .dataset import sample 
+from aquaneuron .model import AutoForest ,load 
+
+
+def _inputs (model ,n =3000 ):
+    X ,_ =sample (n //5 +1 ,seed =np .random .SeedSequence (11 ),dtype =np .float64 )
+    X =X [:n ]+np .random .default_rng (11 ).normal (0 ,1.0 ,(n ,6 ))*np .array ([5 ,5 ,5 ,0.3 ,60 ,2 ])
+    return (X -model .mean )/model .scale 
+
+
+def test_packed_matches_sklearn_bit_for_bit (artifact ):
+    packed =load (artifact ,engine ="packed").forest 
+    skl =load (artifact ,engine ="sklearn",n_jobs =1 ).forest 
+    X =_inputs (load (artifact ,engine ="packed"))
+    X [::97 ,2 ]=np .nan 
+    np .testing .assert_array_equal (packed .predict_proba (X ),skl .predict_proba (X ))
+
+
+def test_packed_is_chunk_invariant (artifact ):
+    model =load (artifact ,engine ="packed")
+    X =_inputs (model ,1000 )
+    ref =model .forest .predict_proba (X )
+    for chunk in (1 ,7 ,333 ):
+        np .testing .assert_array_equal (model .forest .predict_proba (X ,chunk =chunk ),ref )
+    np .testing .assert_array_equal (model .forest .predict_proba (X ,chunk =64 ,n_jobs =2 ),ref )
+
+
+def test_auto_engine_switches_without_changing_results (artifact ):
+    auto =load (artifact ,min_batch =100 )
+    packed =load (artifact ,engine ="packed")
+    assert isinstance (auto .forest ,AutoForest )
+    X =_inputs (packed ,500 )
+    small =np .concatenate ([auto .forest .predict_proba (X [i :i +50 ])for i in range (0 ,500 ,50 )])
+    assert auto .forest ._sklearn is None 
+    big =auto .forest .predict_proba (X )
+    assert auto .forest ._sklearn is not None 
+    np .testing .assert_array_equal (small ,big )
+    np .testing .assert_array_equal (big ,packed .forest .predict_proba (X ))
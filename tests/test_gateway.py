@@ -0,0 +1,50 @@
+import asyncio 
+import time 
+import numpy as np 
+from aquaneuron .gateway import Gateway ,MemorySink ,decode ,encode 
+
+
+class BrokenSink (MemorySink ):
+    async def send (self ,batch ):
+        raise OSError ("disk full")
+
+
+class BrokenModel :
+    def predict (self ,x ):
+        raise ValueError ("bad feature shape")
+
+
+def _readings (n ):
+    recs ,bad =decode (encode (np .arange (n ),0 ,time .time (),np .zeros ((n ,6 ))))
+    assert bad ==0 
+    return recs 
+
+
+async def _drive (sink ,model =None ,n =40 ):
+    gw =Gateway (sink ,model ,batch_size =4 ,queue_size =1 ,uploaders =2 )
+    await gw .start ()
+    await asyncio .wait_for (gw ._append (_readings (n )),5 )
+    await asyncio .wait_for (gw .close (),5 )
+    return gw 
+
+
+def test_sink_error_outside_protocol_drops_batch_and_close_returns ():
+    gw =asyncio .run (_drive (BrokenSink ()))
+    assert gw .stats ["dropped"]==40 
+    assert gw .stats ["uploaded"]==0 
+
+
+def test_model_error_drops_batch_and_close_returns ():
+    gw =asyncio .run (_drive (MemorySink (),BrokenModel ()))
+    assert gw .stats ["dropped"]==40 
+
+
+def test_batches_are_classified_and_uploaded ():
+    class Constant :
+        def predict (self ,x ):
+            return np .zeros (len (x ),dtype =np .int64 )
+
+    sink =MemorySink ()
+    gw =asyncio .run (_drive (sink ,Constant ()))
+    assert gw .stats ["uploaded"]==40 
+    assert sum (len (b ["label"])for b in sink .batches )==40 
@@ -0,0 +1,30 @@
+from aquaneuron .importtime import FORBIDDEN ,HEADLESS ,OVERHEAD_BUDGET_MS ,check ,measure 
+
+
+def test_headless_import_path_is_clean ():
+    res =check (HEADLESS ,repeat =1 )
+    assert res ["leaked"]==[],res ["problems"]
+
+
+def test_headless_import_fits_the_budget ():
+    res =check (HEADLESS ,repeat =5 ,overhead_ms =OVERHEAD_BUDGET_MS )
+    assert res ["problems"]==[]
+
+
+def test_heavy_imports_exceed_the_budget ():
+    res =check (("aquaneuron","pandas"),repeat =1 ,overhead_ms =OVERHEAD_BUDGET_MS )
+    assert any ("more than numpy"in p for p in res ["problems"]),res ["problems"]
+
+
+def test_package_import_alone_is_clean ():
+    assert measure (("aquaneuron",),repeat =1 )["leaked"]==[]
+
+
+def test_leaks_are_reported ():
+    assert "pandas"in FORBIDDEN 
+    assert measure (("aquaneuron","pandas"),repeat =1 )["leaked"]==["pandas"]
+
+
+def test_budget_overruns_are_reported ():
+    res =check (("aquaneuron",),budget_ms =1e-6 ,repeat =1 )
+    assert any ("budget"in p for p in res ["problems"])
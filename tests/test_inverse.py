@@ -0,0 +1,55 @@
+import numpy as np 
+from aquaneuron .inverse import (ABOVE_RANGE ,BELOW_LOD ,CLIPPED ,INVALID ,NEGATIVE ,SATURATED ,InverseSolver ,
+flag_names )
+from aquaneuron .physics import ANALYTES ,channel_params ,coupled_response ,response 
+
+
+def test_round_trip_through_the_channel_response ():
+    solver =InverseSolver (K =np .eye (len (ANALYTES )))
+    S ,Kd =channel_params ("S"),channel_params ("Kd")
+    C =np .random .default_rng (0 ).uniform (0.1 ,1.8 ,(500 ,len (ANALYTES )))*solver .upper /2 
+    est =solver .solve (response (C ,S ,Kd ))
+    np .testing .assert_allclose (est .C ,C ,rtol =1e-10 )
+    assert np .all (est .std >0 )
+
+
+def test_round_trip_with_cross_reactivity ():
+    solver =InverseSolver ()
+    C =np .random .default_rng (1 ).uniform (0.1 ,0.9 ,(500 ,len (ANALYTES )))*solver .upper 
+    est =solver .solve (coupled_response (C ,solver .analytes ,solver .K ))
+    np .testing .assert_allclose (est .C ,C ,rtol =1e-9 )
+    assert not np .any (est .flags &(NEGATIVE |SATURATED |CLIPPED |INVALID ))
+
+
+def test_dropped_channel_is_invalid_not_saturated ():
+    solver =InverseSolver ()
+    est =solver .solve ([np .nan ,0.1 ,0.2 ])
+    assert np .isnan (est .C [0 ])and np .isnan (est .std [0 ])
+    assert est .flags [0 ]==INVALID 
+    assert flag_names (est .flags [0 ])==["invalid"]
+    assert np .all (np .isfinite (est .C [1 :]))
+    assert not np .any (est .flags [1 :]&(SATURATED |ABOVE_RANGE |INVALID ))
+
+
+def test_dropped_channel_stays_out_of_the_other_channels ():
+    solver =InverseSolver ()
+    C =np .array ([[0.0 ,150.0 ,20.0 ],[0.0 ,60.0 ,5.0 ]])
+    dR =coupled_response (C ,solver .analytes ,solver .K )
+    dR [:,0 ]=[np .nan ,np .inf ]
+    est =solver .solve (dR )
+    assert np .all (est .flags [:,0 ]&INVALID )
+    np .testing .assert_allclose (est .C [:,1 :],C [:,1 :],rtol =1e-9 )
+    mixed =solver .solve (np .vstack ([dR ,coupled_response (C ,solver .analytes ,solver .K )]))
+    np .testing .assert_allclose (mixed .C [2 :],C ,rtol =1e-9 ,atol =1e-9 )
+    assert np .all (np .isnan (solver .solve (np .full ((2 ,3 ),np .nan )).C ))
+
+
+def test_negative_and_low_readings_are_flagged ():
+    solver =InverseSolver ()
+    est =solver .solve ([-0.01 ,1e-5 ,0.1 ])
+    assert est .flags [0 ]&NEGATIVE and est .flags [0 ]&BELOW_LOD 
+    assert est .C [0 ]==0.0 
+    assert est .flags [1 ]&BELOW_LOD and not est .flags [1 ]&NEGATIVE 
+    assert not est .flags [2 ]&(NEGATIVE |BELOW_LOD )
+    high =solver .solve (solver .saturation *solver .S )
+    assert np .all (high .flags &SATURATED )and np .all (np .isfinite (high .C ))
@@ -0,0 +1,20 @@
+import numpy as np 
+from aquaneuron import montecarlo 
+from aquaneuron .physics import LOD_MODELS 
+
+
+def test_monte_carlo_does_not_depend_on_jobs ():
+    model =LOD_MODELS ["As"]
+    seed =np .random .SeedSequence (9 )
+    kw =dict (rtol =0.0 ,chunk =1 <<14 ,max_samples =4 <<14 ,seed =seed )
+    a =montecarlo .run (model ,jobs =1 ,**kw )
+    b =montecarlo .run (model ,jobs =2 ,**kw )
+    np .testing .assert_array_equal (a .hist .counts ,b .hist .counts )
+    np .testing .assert_array_equal (a .values ,b .values )
+
+
+def test_histogram_quantiles_match_percentiles ():
+    h =montecarlo .Histogram (0.0 ,1.0 ,1 <<16 )
+    x =np .random .default_rng (1 ).beta (2 ,5 ,200000 )
+    h .add (x )
+    np .testing .assert_allclose (h .quantile ([0.05 ,0.5 ,0.95 ]),np .percentile (x ,[5 ,50 ,95 ]),atol =1e-4 )
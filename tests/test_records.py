@@ -0,0 +1,73 @@
+import numpy as np 
+import pytest 
+from aquaneuron .records import (HEADER ,INVALID ,RECORD ,SATURATED ,SCALES ,LogError ,LogWriter ,features ,pack ,read ,
+scan )
+
+
+def _readings (n ,seed =0 ):
+    g =np .random .default_rng (seed )
+    X =np .column_stack ([g .uniform (-40 ,60 ,(n ,3 )),g .uniform (5 ,9 ,n ),g .uniform (50 ,900 ,n ),g .uniform (10 ,35 ,n )])
+    return g .integers (0 ,7 ,n ),np .sort (g .uniform (0 ,1e6 ,n )),X 
+
+
+def test_round_trip_through_a_log (tmp_path ):
+    node ,t ,X =_readings (5000 )
+    path =tmp_path /"field.aqlog"
+    with LogWriter (path )as log :
+        log .append (pack (node [:3000 ],t [:3000 ],X [:3000 ]))
+    with LogWriter (path )as log :
+        assert log .count ==3000 
+        log .append (pack (node [3000 :],t [3000 :],X [3000 :],seq =7 ))
+        assert log .count ==5000 
+    rec =read (path )
+    assert isinstance (rec ,np .memmap )and len (rec )==5000 
+    np .testing .assert_array_equal (rec ,read (path ,mmap =False ))
+    np .testing .assert_array_equal (rec ["node"],node )
+    np .testing .assert_array_equal (rec ["t"],t )
+    assert (rec ["seq"][3000 :]==7 ).all ()and (rec ["flags"]==0 ).all ()
+    assert np .all (np .abs (features (rec )-X )<=0.5 *SCALES *(1 +1e-9 ))
+
+
+def test_torn_tail_is_dropped (tmp_path ):
+    node ,t ,X =_readings (100 )
+    path =tmp_path /"field.aqlog"
+    with LogWriter (path )as log :
+        log .append (pack (node ,t ,X ))
+    with open (path ,"ab")as fh :
+        fh .write (b"\x01"*(RECORD .itemsize -5 ))
+    assert len (read (path ))==100 
+    with LogWriter (path )as log :
+        assert log .count ==100 
+        log .append (pack (node [:1 ],t [:1 ],X [:1 ]))
+    assert path .stat ().st_size ==HEADER +101 *RECORD .itemsize 
+    rec =read (path )
+    np .testing .assert_array_equal (rec ["t"],np .append (t ,t [0 ]))
+
+
+def test_foreign_files_are_rejected (tmp_path ):
+    path =tmp_path /"other.aqlog"
+    path .write_bytes (b"not a log"*20 )
+    with pytest .raises (LogError ):
+        read (path )
+    with pytest .raises (LogError ):
+        LogWriter (path )
+
+
+def test_scan_matches_numpy ():
+    node ,t ,X =_readings (20000 ,1 )
+    X [::50 ,0 ]=1e6 
+    X [::77 ,3 ]=np .nan 
+    rec =pack (node ,t ,X )
+    assert (rec ["flags"][::50 ]&SATURATED ).all ()and (rec ["flags"][::77 ]&INVALID ).all ()
+    res =scan (rec ,block =999 )
+    ok =(rec ["flags"]&(SATURATED |INVALID ))==0 
+    x ,nd =features (rec )[ok ],node [ok ]
+    assert res ["skipped"]==int ((~ok ).sum ())
+    for k in range (7 ):
+        sel =x [nd ==k ]
+        assert res ["n"][k ]==len (sel )
+        np .testing .assert_allclose (res ["mean"][k ],sel .mean (axis =0 ),rtol =1e-12 )
+        np .testing .assert_allclose (res ["std"][k ],sel .std (axis =0 ),rtol =1e-6 )
+    whole =scan (rec ,block =len (rec ))
+    np .testing .assert_array_equal (whole ["n"],res ["n"])
+    np .testing .assert_allclose (whole ["mean"],res ["mean"],rtol =1e-12 )
@@ -0,0 +1,53 @@
+import numpy as np 
+import pytest 
+
+pd =pytest .importorskip ("pandas")
+from aquaneuron .risk import HAZARDS ,WEIGHT ,rollup ,state_table ,synthetic_wells 
+
+
+def _weighted (df ,level ):
+    out ={}
+    for key ,grp in df .groupby (level ,observed =True ):
+        row ={}
+        for c in HAZARDS :
+            ok =np .isfinite (grp [c ])&np .isfinite (grp [WEIGHT ])
+            w =grp [WEIGHT ][ok ]
+            row [c ]=(grp [c ][ok ]*w ).sum ()/w .sum ()if w .sum ()>0 else np .nan 
+        out [str (key )]=row 
+    return out 
+
+
+def test_rollup_matches_weighted_means ():
+    df =synthetic_wells (5000 ,seed =1 )
+    out =rollup (df ,"State").set_index ("State")
+    ref =_weighted (df ,"State")
+    for state ,row in ref .items ():
+        for c in HAZARDS :
+            np .testing .assert_allclose (out .loc [state ,c ],row [c ],rtol =1e-12 )
+    assert out ["Sites"].sum ()==len (df )
+    np .testing .assert_allclose (out ["Combined"],out [list (HAZARDS )].mean (axis =1 ))
+
+
+def test_missing_values_are_left_out_of_the_weight ():
+    df =synthetic_wells (5000 ,seed =2 )
+    gappy =df .copy ()
+    gappy .loc [gappy .index [::9 ],"Arsenic"]=np .nan 
+    gappy .loc [gappy .index [::13 ],WEIGHT ]=np .nan 
+    out =rollup (gappy ,"District").set_index ("District")
+    for district ,row in _weighted (gappy ,"District").items ():
+        for c in HAZARDS :
+            np .testing .assert_allclose (out .loc [district ,c ],row [c ],rtol =1e-12 )
+    assert out ["Sites"].sum ()==len (df )
+    two =pd .DataFrame ({"State":["Bihar","Bihar"],"Arsenic":[np .nan ,8.0 ],"Fluoride":[2.0 ,4.0 ],"Lead":[1.0 ,3.0 ],
+    WEIGHT :[10.0 ,30.0 ]})
+    row =rollup (two ).iloc [0 ]
+    assert row ["Arsenic"]==8.0 and row ["Fluoride"]==3.5 and row [WEIGHT ]==40.0 
+
+
+def test_hazard_missing_for_a_whole_group ():
+    df =state_table ()
+    df .loc [df ["State"]=="Delhi","Lead"]=np .nan 
+    out =rollup (df ).set_index ("State")
+    assert np .isnan (out .loc ["Delhi","Lead"])
+    np .testing .assert_allclose (out .loc ["Delhi","Combined"],out .loc ["Delhi",["Arsenic","Fluoride"]].mean ())
+    assert np .isfinite (out .drop (index ="Delhi")["Combined"]).all ()
@@ -0,0 +1,18 @@
+import subprocess 
+import sys 
+from pathlib import Path 
+
+SCRIPT ="""
+import sys
+from aquaneuron import runner
+runs = list(runner.run(["fig7", "fig7"], 1, sys.argv[1]))
+print(len(runs), "aquaneuron.figures" in sys.modules)
+"""
+
+
+def test_sequential_figures_render_in_fresh_processes (tmp_path ):
+    out =subprocess .run ([sys .executable ,"-c",SCRIPT ,str (tmp_path )],capture_output =True ,text =True ,
+    check =True ,cwd =Path (__file__ ).resolve ().parents [1 ])
+    n ,imported =out .stdout .split ()[-2 :]
+    assert n =="2"and imported =="False"
+    assert (tmp_path /"fig7_architecture_.png").exists ()
@@ -0,0 +1,59 @@
+import os 
+
+import numpy as np 
+from aquaneuron import selection 
+from aquaneuron .selection import ENV_JOBS ,cpu_budget 
+
+
+def test_budget_defaults_to_all_cores (monkeypatch ):
+    monkeypatch .delenv (ENV_JOBS ,raising =False )
+    assert cpu_budget ()==(os .cpu_count ()or 1 )
+    assert cpu_budget (6 )==6 
+    assert selection .plan (4 ,jobs =8 )==(4 ,2 )
+
+
+def test_inherited_budget_caps_the_pool (monkeypatch ):
+    monkeypatch .setenv (ENV_JOBS ,"3")
+    assert cpu_budget ()==3 
+    assert cpu_budget (8 )==3 
+    assert cpu_budget (2 )==2 
+    assert selection .plan (10 )==(3 ,1 )
+    monkeypatch .setenv (ENV_JOBS ,"1")
+    assert selection .plan (10 ,jobs =8 )==(1 ,1 )
+
+
+def test_cross_validate_stays_in_process_inside_a_worker (monkeypatch ):
+    def refuse (*a ,**k ):
+        raise AssertionError ("nested process pool")
+
+    monkeypatch .setenv (ENV_JOBS ,"1")
+    monkeypatch .setattr (selection ,"ProcessPoolExecutor",refuse )
+    g =np .random .default_rng (0 )
+    X =g .normal (size =(120 ,6 ))
+    y =(X [:,0 ]>0 ).astype (np .intp )
+    acc =selection .cross_validate (X ,y ,{"n_estimators":5 ,"max_depth":3 },n_splits =3 )
+    assert acc .shape ==(3 ,)
+    assert acc .mean ()>0.7 
+
+
+def test_pool_workers_inherit_their_share (monkeypatch ):
+    monkeypatch .setenv (ENV_JOBS ,"1")
+    X =np .zeros ((4 ,6 ),dtype =np .float32 )
+    y =np .array ([0 ,1 ,0 ,1 ])
+    shm_x ,x_spec =selection ._share (X )
+    shm_y ,y_spec =selection ._share (y )
+    try :
+        selection ._init (x_spec ,y_spec ,2 ,0 ,3 )
+        assert os .environ [ENV_JOBS ]=="3"
+    finally :
+        selection ._SHARED .clear ()
+        for shm in (shm_x ,shm_y ):
+            shm .close ()
+            shm .unlink ()
+
+
+def test_runner_hands_each_worker_a_share (monkeypatch ):
+    from aquaneuron import runner 
+    monkeypatch .setenv (ENV_JOBS ,"1")
+    runner ._set_budget (4 )
+    assert cpu_budget ()==4 
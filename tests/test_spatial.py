@@ -0,0 +1,76 @@
+import numpy as np 
+from aquaneuron .spatial import Grid ,Variogram ,idw ,interpolate ,krige ,merge_duplicates ,to_xyz 
+
+
+def _neighbours (lon ,lat ,at ):
+    xyz =to_xyz (np .asarray (lon ,dtype =float ),np .asarray (lat ,dtype =float ))
+    return np .linalg .norm (xyz -to_xyz (*at ),axis =1 )[None ],xyz [None ]
+
+
+def test_colocated_neighbours_fall_back_to_idw ():
+    dist ,xyz =_neighbours ([80 ,80 ,80.1 ,80.2 ],[20 ,20 ,20.1 ,20 ],(80.05 ,20.05 ))
+    values =np .array ([[[1.0 ],[2.0 ],[3.0 ],[4.0 ]]])
+    v =Variogram (0.5 ,1.0 ,100.0 )
+    est ,var =krige (dist ,xyz ,values ,(v ,))
+    np .testing .assert_allclose (est [:,0 ],idw (dist ,values )[:,0 ])
+    assert var [0 ,0 ]==v .nugget +v .psill 
+
+
+def test_singular_rows_do_not_affect_the_rest_of_the_batch ():
+    d1 ,x1 =_neighbours ([80 ,80 ,80.1 ,80.2 ],[20 ,20 ,20.1 ,20 ],(80.05 ,20.05 ))
+    d2 ,x2 =_neighbours ([81 ,81.1 ,81.2 ,81.3 ],[21 ,21.1 ,21 ,21.2 ],(81.05 ,21.05 ))
+    values =np .arange (8.0 ).reshape (2 ,4 ,1 )
+    v =Variogram (0.5 ,1.0 ,100.0 )
+    est ,_ =krige (np .concatenate ([d1 ,d2 ]),np .concatenate ([x1 ,x2 ]),values ,(v ,))
+    alone ,_ =krige (d2 ,x2 ,values [1 :],(v ,))
+    np .testing .assert_allclose (est [1 ],alone [0 ])
+
+
+def test_merge_duplicates_averages_colocated_wells ():
+    lon ,lat ,values =merge_duplicates (np .array ([80.0 ,81.0 ,80.0 ]),np .array ([20.0 ,21.0 ,20.0 ]),
+    np .array ([[1.0 ,4.0 ],[5.0 ,5.0 ],[3.0 ,6.0 ]]))
+    np .testing .assert_array_equal (lon ,[80.0 ,81.0 ])
+    np .testing .assert_array_equal (values ,[[2.0 ,5.0 ],[5.0 ,5.0 ]])
+
+
+def test_kriging_with_resampled_wells ():
+    g =np .random .default_rng (0 )
+    lon ,lat =g .uniform (75 ,80 ,300 ),g .uniform (15 ,20 ,300 )
+    values =np .sin (lon )[:,None ]+np .cos (lat )[:,None ]
+    lon ,lat ,values =np .concatenate ([lon ,lon [:50 ]]),np .concatenate ([lat ,lat [:50 ]]),np .concatenate ([values ,values [:50 ]+0.1 ])
+    grid =Grid (75.0 ,80.0 ,15.0 ,20.0 ,0.25 )
+    est ,var ,_ =interpolate (lon ,lat ,values ,grid ,method ="kriging",k =8 ,seed =np .random .SeedSequence (1 ))
+    assert np .isfinite (est ).all ()and np .isfinite (var ).all ()
+
+
+def test_missing_measurements_only_affect_their_hazard (tmp_path ):
+    g =np .random .default_rng (2 )
+    lon ,lat =g .uniform (75 ,80 ,300 ),g .uniform (15 ,20 ,300 )
+    values =np .stack ([np .sin (lon )+np .cos (lat ),np .cos (lon )*lat /20 ,np .full (300 ,np .nan )],axis =1 )
+    gappy =values .copy ()
+    gappy [::7 ,0 ]=np .nan 
+    gappy [3 ,1 ]=np .inf 
+    grid =Grid (75.0 ,80.0 ,15.0 ,20.0 ,0.25 )
+    seed =np .random .SeedSequence (1 )
+    for method in ("idw","kriging"):
+        est ,var ,vg =interpolate (lon ,lat ,gappy ,grid ,method =method ,k =8 ,seed =seed ,out =tmp_path /f"{method }.npy")
+        assert np .isfinite (est [:2 ]).all ()and np .isnan (est [2 ]).all ()
+        keep =np .isfinite (gappy [:,0 ])
+        ref ,ref_var ,ref_vg =interpolate (lon [keep ],lat [keep ],values [keep ,:1 ],grid ,method =method ,k =8 ,seed =seed )
+        np .testing .assert_allclose (est [:1 ],ref ,rtol =1e-6 )
+        if method =="kriging":
+            assert np .isfinite (var [:2 ]).all ()
+            np .testing .assert_allclose (var [:1 ],ref_var ,rtol =1e-6 )
+            assert vg [0 ]==ref_vg [0 ]and np .isfinite (vg [1 ]).all ()and np .isnan (vg [2 ]).all ()
+
+
+def test_runaway_weights_fall_back_to_idw (monkeypatch ):
+    from aquaneuron import spatial 
+
+    dist ,xyz =_neighbours ([80 ,80.05 ,80.1 ,80.2 ],[20 ,20.02 ,20.1 ,20 ],(80.05 ,20.05 ))
+    values =np .array ([[[1.0 ],[2.0 ],[3.0 ],[4.0 ]]])
+    v =Variogram (0.5 ,1.0 ,100.0 )
+    monkeypatch .setattr (spatial ,"_solve",lambda A ,b :np .array ([[4e5 ,-4e5 ,0.5 ,0.5 ,0.0 ]]))
+    est ,var =krige (dist ,xyz ,values ,(v ,))
+    np .testing .assert_allclose (est [:,0 ],idw (dist ,values )[:,0 ])
+    assert var [0 ,0 ]==v .nugget +v .psill 
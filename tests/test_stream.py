@@ -0,0 +1,41 @@
+import numpy as np 
+import pytest 
+from aquaneuron .drift import DriftCompensator 
+from aquaneuron .stream import StreamClassifier ,simulate_recording 
+
+
+def _compensator ():
+    drift =DriftCompensator (1 )
+    drift .update_baseline (np .zeros (3 ,dtype =np .intp ),np .arange (3 ),0.0 ,[1001.0 ,999.0 ,1000.5 ])
+    drift .update (np .zeros (3 ,dtype =np .intp ),np .arange (3 ),30.0 ,[0.9 ,0.92 ,0.95 ])
+    return drift 
+
+
+@pytest .mark .parametrize ("drift",[None ,_compensator ],ids =["plain","drift"])
+def test_stream_does_not_depend_on_chunking (artifact ,drift ):
+    from aquaneuron .model import load 
+
+    model =load (artifact ,engine ="packed")
+    feed =simulate_recording ([[0 ,0 ,0 ,7.0 ,300 ,25 ],[40 ,5 ,10 ,7.2 ,310 ,25 ]],segment_s =20 ,
+    rng =np .random .default_rng (5 ))
+
+    def run (chunk ):
+        sc =StreamClassifier (model ,drift =None if drift is None else drift (),t0 =40.0 )
+        out =list (sc .run (feed [s :s +chunk ]for s in range (0 ,len (feed ),chunk )))
+        return [np .concatenate ([getattr (b ,f )for b in out ])for f in ("end","features","proba","label")]
+
+    ref =run (len (feed ))
+    for chunk in (1 ,37 ,100 ,500 ):
+        for a ,b in zip (run (chunk ),ref ):
+            np .testing .assert_allclose (a ,b ,rtol =1e-12 ,atol =1e-12 )
+
+
+def test_new_blank_reseeds_the_baseline ():
+    drift =_compensator ()
+    sc =StreamClassifier (window =50 ,hop =50 ,drift =drift )
+    feed =np .tile ([990.0 ,990.0 ,990.0 ,7.0 ,300 ,25 ],(200 ,1 ))
+    sc .push (feed [:100 ])
+    assert np .allclose (sc ._b ,[1001.0 ,999.0 ,1000.5 ],atol =1.0 )
+    drift .update_baseline (np .zeros (3 ,dtype =np .intp ),np .arange (3 ),1.0 ,[980.0 ,980.0 ,980.0 ],noise =1e-6 )
+    sc .push (feed [100 :])
+    assert np .allclose (sc ._b ,980.0 ,atol =0.5 )
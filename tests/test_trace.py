@@ -0,0 +1,41 @@
+import threading 
+import time 
+from aquaneuron import trace 
+
+
+def _spin (seconds ):
+    end =time .perf_counter ()+seconds 
+    while time .perf_counter ()<end :
+        pass 
+
+
+def _record (fn ):
+    tracer =trace .enable ()
+    try :
+        fn ()
+    finally :
+        trace .disable ()
+    return tracer .state ()
+
+
+def test_span_cpu_includes_worker_threads ():
+    def work ():
+        with trace .span ("threaded"):
+            worker =threading .Thread (target =_spin ,args =(0.3 ,))
+            worker .start ()
+            worker .join ()
+
+    (rec ,)=[r for r in _record (work )["records"]if r ["name"]=="threaded"]
+    assert rec ["cpu"]>0.2 
+    assert rec ["thread_cpu"]<0.1 
+
+
+def test_summary_keeps_process_and_thread_cpu ():
+    def work ():
+        for _ in range (2 ):
+            with trace .span ("outer"):
+                _spin (0.05 )
+
+    (row ,)=trace .summarize (_record (work )["records"])
+    assert row ["calls"]==2 
+    assert row ["cpu"]>=0.9 *row ["thread_cpu"]>0 
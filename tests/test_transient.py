@@ -0,0 +1,22 @@
+import numpy as np 
+from aquaneuron .transient import TransientEstimator ,run 
+
+
+def test_noiseless_transient_recovers_plateau_and_tau ():
+    g =np .random .default_rng (0 )
+    A =g .uniform (0.05 ,0.6 ,200 )
+    tau =g .uniform (8.0 ,60.0 ,200 )
+    est =TransientEstimator (np .full (200 ,0.3 ),z =np .inf )
+    for t in np .arange (1 ,181 ,dtype =float ):
+        est .update (t ,A *(1.0 -np .exp (-t /tau )))
+    assert (est .t_stop ==180 ).all ()
+    np .testing .assert_allclose (est .A ,A ,rtol =1e-3 )
+    np .testing .assert_allclose (est .tau ,tau ,rtol =2e-3 )
+
+
+def test_early_stop_matches_full_length_decision ():
+    res =run (500 ,seed =np .random .SeedSequence (3 ))
+    early ,full =res ["early"],res ["full"]
+    assert np .mean (early .decision ==full .decision )>=0.99 
+    assert np .mean (early .t_stop <res ["t_max"])>0.9 
+    assert np .median (early .t_stop )<res ["t_max"]/3 